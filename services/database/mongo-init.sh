@@ -11,16 +11,17 @@ db.createUser({
   roles: [{
     role: 'readWrite',
     db: '$DB_DATABASE'
+  }, {
+    // The scratch database of the write benchmarks (src/sinks/benchmark.py)
+    role: 'readWrite',
+    db: '${DB_DATABASE}_benchmark'
   }]
 })
 
-db.getSiblingDB("database").createCollection('swaps');
-db.getSiblingDB("database").getCollection("swaps").createIndex({ "event_id": 1 });
-db.getSiblingDB("database").getCollection("swaps").createIndex({ "block_hash": 1 });
-db.getSiblingDB("database").getCollection("swaps").createIndex({ "block_number": 1 });
-db.getSiblingDB("database").getCollection("swaps").createIndex({ "timestamp": 1 });
-db.getSiblingDB("database").getCollection("swaps").createIndex({ "transaction_hash": 1 });
-db.getSiblingDB("database").getCollection("swaps").createIndex({ "address": 1 });
-db.getSiblingDB("database").getCollection("swaps").createIndex({ "data.symbol_0": 1 });
-db.getSiblingDB("database").getCollection("swaps").createIndex({ "data.symbol_1": 1 });
+// Indexes are managed by the recording service (src/storage/indexes.py),
+// which also creates the event collections in the configured storage layout
+
+db.getSiblingDB("database").createCollection('transaction_gas');
+
+db.getSiblingDB("database").createCollection('swap_candles');
 EOF
@@ -3,9 +3,13 @@ from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from pymongo.errors import PyMongoError
 
 # Code
+from .core.db import MongoDBClient
+from .lib.logger import InterfaceLogger
 from .routers.html import html_router
+from .routers.v1.endpoints.block_times import swaps_block_times
 from .routers.v1 import v1_router
 
 # Load the environment
@@ -25,3 +29,23 @@ app.add_middleware(
 
 app.include_router(html_router)
 app.include_router(v1_router, prefix="/api/v1")
+
+
+@app.on_event("startup")
+async def build_block_times() -> None:
+    """
+    Builds the timestamp to block index of the recorded swaps ahead of the
+    time-range queries, which otherwise build it on their first request.
+    """
+    try:
+        await swaps_block_times.refresh(MongoDBClient())
+    except PyMongoError as e:
+        InterfaceLogger("InterfaceLogger").warning(f"Block times not built: {e}")
+
+
+@app.on_event("shutdown")
+def close_database_client() -> None:
+    """
+    Closes the database client such that its pooled connections are released.
+    """
+    MongoDBClient().close()
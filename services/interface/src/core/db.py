@@ -1,4 +1,5 @@
 # Standard libraries
+from typing import Any
 import os
 
 # 3rd party libraries
@@ -7,6 +8,16 @@ from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 # Code
 from src.lib.patterns import Singleton
 
+# Constants
+# The client's connection pool settings by their optional environment variables
+DB_POOL_ENVIRONMENT = {
+    "maxPoolSize": "DB_MAX_POOL_SIZE",
+    "minPoolSize": "DB_MIN_POOL_SIZE",
+    "maxIdleTimeMS": "DB_MAX_IDLE_TIME_MS",
+}
+# e.g., "zstd,zlib", where "zstd" needs the zstandard package
+DB_COMPRESSORS_ENVIRONMENT = "DB_COMPRESSORS"
+
 
 class MongoDBClient(metaclass=Singleton):
     """
@@ -25,6 +36,12 @@ class MongoDBClient(metaclass=Singleton):
     def __getitem__(self, name: str):
         return self.__db[name]
 
+    def close(self) -> None:
+        """
+        Closes the underlying client, releasing its pooled connections.
+        """
+        self.__db.client.close()
+
     @staticmethod
     def __get_db() -> AsyncIOMotorDatabase:
         """
@@ -50,4 +67,36 @@ class MongoDBClient(metaclass=Singleton):
             )
 
         uri = f"mongodb://{user}:{password}@{host}:{port}"
-        return AsyncIOMotorClient(uri)[database]
+        return AsyncIOMotorClient(uri, **MongoDBClient.__get_pool_options())[database]
+
+    @staticmethod
+    def __get_pool_options() -> dict[str, Any]:
+        """
+        Gets the connection pool settings given in the environment variables,
+        leaving the driver's defaults for the others.
+
+        Raises:
+            ValueError: If any of the pool sizes is not an integer.
+
+        Returns:
+            The keyword arguments of the client.
+        """
+        options: dict[str, Any] = {}
+
+        for option, variable in DB_POOL_ENVIRONMENT.items():
+            value = os.environ.get(variable)
+            if value is None:
+                continue
+
+            if not value.isdigit():
+                raise ValueError(
+                    f'Environment variable "{variable}" must be an integer'
+                )
+
+            options[option] = int(value)
+
+        compressors = os.environ.get(DB_COMPRESSORS_ENVIRONMENT)
+        if compressors:
+            options["compressors"] = compressors
+
+        return options
@@ -1,5 +1,12 @@
 # Standard libraries
-from typing import TypedDict
+from typing import Any, Mapping, TypedDict, Union, cast
+import re
+
+# 3rd party libraries
+from bson.decimal128 import Decimal128
+
+# Constants
+_HEX_PATTERN = re.compile(r"0x(?:[0-9a-fA-F]{2})*")
 
 
 class GasPriceQuote(TypedDict):
@@ -10,6 +17,7 @@ class GasPriceQuote(TypedDict):
 class EventLog(TypedDict):
     event_id: str
     transaction_hash: str
+    log_index: int
     block_number: int
     timestamp: int
     gas_used: str
@@ -19,3 +27,106 @@ class EventLog(TypedDict):
     topics: list[str]
     raw_data: str
     data: dict[str, str]
+
+
+class PricePoint(TypedDict):
+    sequence: int
+    price_0: Decimal128
+    price_1: Decimal128
+
+
+class SwapCandle(TypedDict):
+    address: str
+    granularity: str
+    bucket: int
+    symbol_0: str
+    symbol_1: str
+    open: PricePoint
+    close: PricePoint
+    high_0: Decimal128
+    high_1: Decimal128
+    low_0: Decimal128
+    low_1: Decimal128
+    volume_0: Decimal128
+    volume_1: Decimal128
+    count: int
+
+
+# ---------
+# Decoding of the compact event logs (schema version 2), storing the hashes
+# and raw data as binary, and the integers as int64 or Decimal128 if they fit
+# ---------
+
+
+def decode_value(value: Any) -> str:
+    """
+    Decodes a compactly stored integer or hex field into its string form.
+
+    Args:
+        value: The stored value.
+
+    Returns:
+        The decimal string of integers, or the hex string of binaries.
+    """
+    if isinstance(value, bytes):
+        return f"0x{value.hex()}"
+
+    if isinstance(value, Decimal128):
+        return str(int(value.to_decimal()))
+
+    return str(value)
+
+
+def decode_event_log(document: Mapping[str, Any]) -> EventLog:
+    """
+    Decodes a stored event log into the string form, leaving out the fields
+    it does not have (e.g., when projected). Event logs stored in the string
+    form, i.e., without a "schema_version", are returned as they are.
+
+    Args:
+        document: The stored event log, projected with its "schema_version".
+
+    Returns:
+        The event log in the string form.
+    """
+    if not document.get("schema_version"):
+        return cast(EventLog, document)
+
+    decoded = dict(document)
+    del decoded["schema_version"]
+
+    for field in ("transaction_hash", "gas_used", "gas_price_wei", "raw_data"):
+        if field in decoded:
+            decoded[field] = decode_value(decoded[field])
+
+    if "gas_price_quote" in decoded:
+        decoded["gas_price_quote"] = {
+            key: decode_value(value) if key == "value" else value
+            for key, value in decoded["gas_price_quote"].items()
+        }
+
+    if "topics" in decoded:
+        decoded["topics"] = [decode_value(topic) for topic in decoded["topics"]]
+
+    if "data" in decoded:
+        decoded["data"] = {
+            key: decode_value(value) for key, value in decoded["data"].items()
+        }
+
+    return cast(EventLog, decoded)
+
+
+def match_hex(value: str) -> Union[str, dict[str, list[Any]]]:
+    """
+    Builds the query condition of a hex field in either storage form.
+
+    Args:
+        value: The "0x"-prefixed hex string to match.
+
+    Returns:
+        The condition matching the hex string or its binary.
+    """
+    if not _HEX_PATTERN.fullmatch(value):
+        return value
+
+    return {"$in": [value, bytes.fromhex(value[2:])]}
@@ -0,0 +1,106 @@
+# Standard libraries
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+import time
+
+# Types
+T = TypeVar("T")
+
+
+class TTLCache(Generic[T]):
+    """
+    Bounded in-memory cache whose entries expire after a time-to-live,
+    evicting the least recently used entries when full.
+
+    Each entry has a size (1 by default) such that the cache can be bounded
+    by the number of entries or by the total size of their values.
+    """
+
+    __ttl: float
+    __maxsize: int
+    __size: int
+    __entries: "OrderedDict[Hashable, tuple[float, int, T]]"
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.__ttl = ttl
+        self.__maxsize = maxsize
+        self.__size = 0
+        self.__entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def size(self) -> int:
+        """
+        The total size of the entries.
+        """
+        return self.__size
+
+    def get(self, key: Hashable) -> Optional[T]:
+        """
+        Gets the value of a key if it has not expired.
+
+        Args:
+            key: The key to lookup.
+
+        Returns:
+            The cached value, or None if missing or expired.
+        """
+        entry = self.__entries.get(key)
+
+        if entry is None:
+            return None
+
+        expiry, _size, value = entry
+
+        if expiry <= time.monotonic():
+            self.__remove(key)
+            return None
+
+        self.__entries.move_to_end(key)
+        return value
+
+    def set(
+        self, key: Hashable, value: T, ttl: Optional[float] = None, size: int = 1
+    ) -> None:
+        """
+        Sets the value of a key, evicting the least recently used if full.
+        Values larger than the cache are not cached.
+
+        Args:
+            key: The key to set.
+            value: The value to cache.
+            ttl: The time-to-live of the entry, defaulting to the cache's.
+            size: The size of the entry.
+        """
+        if key in self.__entries:
+            self.__remove(key)
+
+        # Never worth evicting everything else for
+        if size > self.__maxsize:
+            return
+
+        expiry = time.monotonic() + (self.__ttl if ttl is None else ttl)
+        self.__entries[key] = (expiry, size, value)
+        self.__size += size
+
+        while self.__size > self.__maxsize:
+            self.__remove(next(iter(self.__entries)))
+
+    def clear(self) -> None:
+        """
+        Removes all the entries.
+        """
+        self.__entries.clear()
+        self.__size = 0
+
+    def __remove(self, key: Hashable) -> None:
+        """
+        Removes an entry.
+
+        Args:
+            key: The key of the entry to remove.
+        """
+        _expiry, size, _value = self.__entries.pop(key)
+        self.__size -= size
@@ -0,0 +1,162 @@
+# Standard libraries
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Optional
+import time
+
+# Code
+from src.core.db import MongoDBClient
+from .layouts import get_layout, to_series_query
+from .pagination import EVENTS_SORT_ORDER
+
+# Constants
+BLOCK_TIMES_REFRESH_SECONDS = 15
+BLOCK_TIMES_BATCH_SIZE = 10000
+MAX_BLOCK_NUMBER = 2**63 - 1
+
+
+class BlockTimeIndex:
+    """
+    Compact in-memory index of the timestamps of the recorded blocks,
+    resolving time ranges into block ranges with binary searches.
+
+    The index only grows past its latest block, such that blocks recorded
+    later behind it (e.g., historical backfills) are not indexed. Time ranges
+    are thus resolved into the blocks strictly between the indexed neighbours
+    of the range, which contain all the blocks within it. Likewise, as block
+    timestamps never decrease, block ranges are bounded in time by the
+    timestamps of their indexed neighbours.
+    """
+
+    __collection: str
+    __refresh_seconds: float
+    __refreshed_at: float
+    __blocks: "array[int]"
+    __timestamps: "array[int]"
+
+    def __init__(
+        self, collection: str, refresh_seconds: float = BLOCK_TIMES_REFRESH_SECONDS
+    ):
+        self.__collection = collection
+        self.__refresh_seconds = refresh_seconds
+        self.__refreshed_at = float("-inf")
+        self.__blocks = array("q")
+        self.__timestamps = array("q")
+
+    def __len__(self) -> int:
+        return len(self.__blocks)
+
+    def clear(self) -> None:
+        """
+        Removes all the indexed blocks.
+        """
+        self.__refreshed_at = float("-inf")
+        self.__blocks = array("q")
+        self.__timestamps = array("q")
+
+    async def refresh(self, client: MongoDBClient) -> None:
+        """
+        Indexes the blocks recorded past the latest indexed block.
+
+        Args:
+            client: The database client.
+        """
+        latest = self.__blocks[-1] if self.__blocks else -1
+        query: dict[str, Any] = {"block_number": {"$gt": latest}}
+
+        # Only unpack the buckets since the latest indexed block in the time-series
+        # layout, as the block number is not indexed there
+        if (
+            self.__blocks
+            and await get_layout(client, self.__collection) == "timeseries"
+        ):
+            query = to_series_query(query, from_time=self.__timestamps[-1])
+
+        cursor = client[self.__collection].find(
+            query, projection={"_id": 0, "block_number": 1, "timestamp": 1}
+        )
+        cursor = cursor.sort(EVENTS_SORT_ORDER)
+
+        while documents := await cursor.to_list(BLOCK_TIMES_BATCH_SIZE):
+            for document in documents:
+                # Checked against the latest again for concurrent refreshes
+                if not self.__blocks or document["block_number"] > self.__blocks[-1]:
+                    self.__blocks.append(document["block_number"])
+                    self.__timestamps.append(document["timestamp"])
+
+        self.__refreshed_at = time.monotonic()
+
+    async def resolve(
+        self, client: MongoDBClient, from_time: int, to_time: int
+    ) -> tuple[int, int]:
+        """
+        Resolves a time range into the block range containing it,
+        refreshing the index first if it is stale.
+
+        Args:
+            client: The database client.
+            from_time: The smallest timestamp of the range.
+            to_time: The largest timestamp of the range.
+
+        Returns:
+            The smallest and largest block numbers of the range.
+        """
+        await self.__refresh_if_stale(client)
+
+        # After the last block before the range
+        start = bisect_left(self.__timestamps, from_time)
+        from_block = self.__blocks[start - 1] + 1 if start > 0 else 0
+
+        # Before the first block after the range, unbounded if none is recorded yet
+        end = bisect_right(self.__timestamps, to_time)
+        to_block = (
+            self.__blocks[end] - 1 if end < len(self.__blocks) else MAX_BLOCK_NUMBER
+        )
+
+        return from_block, to_block
+
+    async def bound(
+        self, client: MongoDBClient, from_block: int, to_block: int
+    ) -> tuple[Optional[int], Optional[int]]:
+        """
+        Bounds the timestamps of a block range by those of the indexed blocks
+        at or around it, refreshing the index first if it is stale.
+
+        Args:
+            client: The database client.
+            from_block: The smallest block number of the range.
+            to_block: The largest block number of the range.
+
+        Returns:
+            The smallest and largest timestamps of the range,
+            or None for either if no block is indexed beyond it.
+        """
+        await self.__refresh_if_stale(client)
+
+        # The last block at or before the range
+        start = bisect_right(self.__blocks, from_block)
+        from_time = self.__timestamps[start - 1] if start > 0 else None
+
+        # The first block at or after the range
+        end = bisect_left(self.__blocks, to_block)
+        to_time = self.__timestamps[end] if end < len(self.__blocks) else None
+
+        return from_time, to_time
+
+    # ---------
+    # Helpers
+    # ---------
+
+    async def __refresh_if_stale(self, client: MongoDBClient) -> None:
+        """
+        Refreshes the index if it has not been for a while.
+
+        Args:
+            client: The database client.
+        """
+        if time.monotonic() - self.__refreshed_at >= self.__refresh_seconds:
+            await self.refresh(client)
+
+
+# Timestamps of the recorded swaps' blocks
+swaps_block_times = BlockTimeIndex("swaps")
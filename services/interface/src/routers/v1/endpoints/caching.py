@@ -0,0 +1,162 @@
+# Standard libraries
+from typing import Any, NamedTuple, Optional
+import hashlib
+import json
+
+# 3rd party libraries
+from fastapi import Request, Response
+
+# Code
+from src.core.db import MongoDBClient
+from src.lib.cache import TTLCache
+from .layouts import TIMESERIES_TIME_FIELD, get_layout, to_series_query
+
+# Constants
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+FINALIZED_MAX_AGE_SECONDS = 24 * 60 * 60
+RECENT_MAX_AGE_SECONDS = 5
+HEAD_TTL_SECONDS = 15
+# Blocks deeper than this below the latest recorded block are considered final
+REORG_HORIZON_BLOCKS = 64
+# The ledger of the block ranges fully recorded, maintained by the recorders
+COVERAGE_COLLECTION = "block_coverage"
+
+
+class CachedResponse(NamedTuple):
+    """
+    A serialized response with its entity tag and cache lifetime.
+    """
+
+    body: bytes
+    etag: str
+    max_age: int
+
+
+# Serialized responses by normalized query, bounded by their total bytes
+response_cache: TTLCache[CachedResponse] = TTLCache(
+    RECENT_MAX_AGE_SECONDS, maxsize=RESPONSE_CACHE_MAX_BYTES
+)
+
+# Latest recorded block numbers by collection
+head_cache: TTLCache[int] = TTLCache(HEAD_TTL_SECONDS)
+
+
+def get_cache_key(name: str, params: dict[str, Any]) -> str:
+    """
+    Normalizes the parameters of an endpoint into a cache key.
+
+    Args:
+        name: The name of the endpoint.
+        params: The query parameters of the endpoint.
+
+    Returns:
+        The cache key.
+    """
+    return json.dumps([name, params], sort_keys=True)
+
+
+async def get_finalized_block(
+    client: MongoDBClient, collection: str, event_id: str
+) -> int:
+    """
+    Gets the block number below which the recorded events can no longer change,
+    i.e., the latest recorded block less the reorg horizon.
+
+    Args:
+        client: The database client.
+        collection: The collection of the recorded events.
+        event_id: The event id of the recorded events.
+
+    Returns:
+        The finalized block number, or -1 if nothing is recorded.
+    """
+    head: Optional[int] = head_cache.get(collection)
+
+    if head is None:
+        query: dict[str, Any] = {"event_id": event_id}
+        sort = [("block_number", -1)]
+
+        # The latest event by time is of the latest block, as their times never
+        # decrease, and only the time is indexed in the time-series layout
+        if await get_layout(client, collection) == "timeseries":
+            query = to_series_query(query)
+            sort = [(TIMESERIES_TIME_FIELD, -1)]
+
+        latest = await client[collection].find_one(
+            query, projection={"_id": 0, "block_number": 1}, sort=sort
+        )
+        head = latest["block_number"] if latest else -1
+        head_cache.set(collection, head)
+
+    return head - REORG_HORIZON_BLOCKS if head >= 0 else -1
+
+
+async def is_recorded(
+    client: MongoDBClient, event_id: str, address: str, from_block: int, to_block: int
+) -> bool:
+    """
+    Checks the coverage ledger for whether a block range is fully recorded,
+    as the ranges not recorded yet may still be backfilled.
+
+    Args:
+        client: The database client.
+        event_id: The event id of the recorded events.
+        address: The contract address of the recorded events.
+        from_block: The first block of the range.
+        to_block: The last block of the range.
+
+    Returns:
+        Whether the whole range is recorded.
+    """
+    coverage = await client[COVERAGE_COLLECTION].find_one(
+        {"_id": f"{event_id}-{address.lower()}"}, projection={"_id": 0, "ranges": 1}
+    )
+    ranges = coverage["ranges"] if coverage else []
+
+    # The ranges are merged, so a recorded range lies within a single one
+    return any(first <= from_block and to_block <= last for first, last in ranges)
+
+
+def cache_response(key: str, content: Any, finalized: bool) -> CachedResponse:
+    """
+    Serializes and caches the content of a response, for long if it is finalized.
+
+    Args:
+        key: The cache key.
+        content: The json content of the response.
+        finalized: Whether the content can no longer change.
+
+    Returns:
+        The cached response.
+    """
+    body = json.dumps(content, separators=(",", ":")).encode()
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    max_age = FINALIZED_MAX_AGE_SECONDS if finalized else RECENT_MAX_AGE_SECONDS
+
+    cached = CachedResponse(body, etag, max_age)
+    response_cache.set(key, cached, ttl=max_age, size=len(body))
+
+    return cached
+
+
+def to_response(cached: CachedResponse, request: Request) -> Response:
+    """
+    Builds the http response of a cached response with its caching headers,
+    answering **304 - Not Modified** if the client already has it.
+
+    Args:
+        cached: The cached response.
+        request: The request being answered.
+
+    Returns:
+        The http response.
+    """
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": f"public, max-age={cached.max_age}",
+    }
+
+    if request.headers.get("if-none-match") == cached.etag:
+        return Response(status_code=304, headers=headers)
+
+    return Response(cached.body, media_type="application/json", headers=headers)
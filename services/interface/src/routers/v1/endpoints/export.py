@@ -0,0 +1,159 @@
+# Standard libraries
+from typing import Any, AsyncIterator, Callable, Union
+import csv
+import io
+import json
+
+# 3rd party libraries
+from motor.motor_asyncio import AsyncIOMotorCursor
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Code
+from src.core.types import EventLog
+from .pagination import encode_cursor
+
+# Constants
+EXPORT_BATCH_SIZE = 5000
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+CURSOR_FIELD = pa.field("cursor", pa.string())
+
+
+class ChunkSink:
+    """
+    Write-only file object collecting what a writer has written so far,
+    such that a binary file can be streamed while it is being written.
+    """
+
+    __chunks: list[bytes]
+
+    closed: bool = False
+
+    def __init__(self):
+        self.__chunks = []
+
+    def write(self, data: bytes) -> int:
+        """
+        Collects the bytes written.
+
+        Args:
+            data: The bytes to write.
+
+        Returns:
+            The number of bytes written.
+        """
+        self.__chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        """
+        Takes the bytes written since the last drain.
+
+        Returns:
+            The bytes written.
+        """
+        data = b"".join(self.__chunks)
+        self.__chunks = []
+        return data
+
+
+def format_chunk(rows: list[dict[str, Any]], fields: list[str], fmt: str) -> str:
+    """
+    Formats a chunk of flat rows as text.
+
+    Args:
+        rows: The rows to format.
+        fields: The columns of the rows, in order.
+        fmt: Either "ndjson" or "csv".
+
+    Returns:
+        The formatted chunk.
+    """
+    if fmt == "ndjson":
+        return "".join(json.dumps(row) + "\n" for row in rows)
+
+    buffer = io.StringIO()
+    csv.DictWriter(buffer, fields, lineterminator="\n").writerows(rows)
+
+    return buffer.getvalue()
+
+
+async def read_rows(
+    cursor: AsyncIOMotorCursor, flatten: Callable[[EventLog], dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """
+    Reads the next batch of events of a cursor as flat rows,
+    each carrying the continuation token of its position.
+
+    Args:
+        cursor: The cursor of the events, ordered by (block_number, log_index).
+        flatten: Flattens an event into a row.
+
+    Returns:
+        The batch of rows, empty once the cursor is exhausted.
+    """
+    documents: list[EventLog] = await cursor.to_list(EXPORT_BATCH_SIZE)
+
+    rows = []
+    for document in documents:
+        row = flatten(document)
+        position = (document["block_number"], document["log_index"])
+        row["cursor"] = encode_cursor(*position)
+        rows.append(row)
+
+    return rows
+
+
+async def stream_events(
+    cursor: AsyncIOMotorCursor,
+    flatten: Callable[[EventLog], dict[str, Any]],
+    schema: pa.Schema,
+    fmt: str,
+) -> AsyncIterator[Union[str, bytes]]:
+    """
+    Streams the events of a cursor as formatted chunks,
+    holding no more than a batch in memory at a time.
+
+    Every row carries the continuation token of its position
+    such that an interrupted export can be resumed from the last row received.
+
+    Args:
+        cursor: The cursor of the events, ordered by (block_number, log_index).
+        flatten: Flattens an event into a row of the schema.
+        schema: The typed columns of the rows, in order.
+        fmt: One of the export formats.
+
+    Returns:
+        The iterator of the formatted chunks.
+    """
+    schema = schema.append(CURSOR_FIELD)
+
+    if fmt in ("ndjson", "csv"):
+        if fmt == "csv":
+            yield ",".join(schema.names) + "\n"
+
+        while rows := await read_rows(cursor, flatten):
+            yield format_chunk(rows, schema.names, fmt)
+
+        return
+
+    # Binary formats are written batch by batch into a draining sink
+    sink = ChunkSink()
+    writer = (
+        pa.ipc.new_stream(sink, schema)
+        if fmt == "arrow"
+        else pq.ParquetWriter(sink, schema)
+    )
+
+    while rows := await read_rows(cursor, flatten):
+        batch = pa.RecordBatch.from_pylist(rows, schema=schema)
+        writer.write_table(pa.Table.from_batches([batch]))
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
@@ -1,44 +1,86 @@
+# Standard libraries
+from typing import Any, Callable, Optional
+
 # 3rd party libraries
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
 
 # Code
 from src.core.db import MongoDBClient
+from src.core.types import EventLog, decode_event_log, match_hex
 from .models import GasResponse
+from .projection import get_projection, parse_fields
 
 # The router instance
 gas_router = APIRouter()
 
+# Constants
+GAS_FIELD_SERIALIZERS: dict[str, Callable[[EventLog], Any]] = {
+    "gas_used": lambda d: int(d["gas_used"]),
+    "gas_price_wei": lambda d: int(d["gas_price_wei"]),
+    "gas_price_quote": lambda d: {
+        "currency": d["gas_price_quote"]["currency"],
+        "value": int(d["gas_price_quote"]["value"]),
+    },
+}
+
 
 @gas_router.get("/{transaction_hash}", response_model=GasResponse)
-async def get_gas_details(transaction_hash: str = "") -> GasResponse:
+async def get_gas_details(
+    transaction_hash: str = "", fields: Optional[str] = None
+) -> JSONResponse:
     """
     **Gets the gas details for a transaction by its hash**:
 
+    Works for the transactions of every recorded event category.
+
     - **transaction_hash**: The transaction hash whose gas details
         will be returned.
+    - **fields** (optional):
+        The comma-separated fields to return, e.g., "gas_price_quote".
+        (default=all)
     \n
+    Returns **400 - Bad Request** if **fields** has unknown fields.
+
     Returns **404 - Not Found** if gas details for **transaction_hash**
         could not be found.
 
     \f
     Args:
         transaction_hash: The transaction hash to lookup.
+        fields: The comma-separated fields to return.
 
     Returns:
         The gas details for the transaction found.
     """
     # Check the query
     client = MongoDBClient()
-    query: dict[str, str] = {"transaction_hash": transaction_hash}
 
-    # For now we query from the swaps collection
-    # We might denormalize the gas-specific details
-    # into a separate collection in the future
-    # if this access pattern persists
-    data = await client.swaps.find_one(query)
+    try:
+        gas_fields = parse_fields(fields, GasResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    projection = get_projection(gas_fields)
+
+    # Point read of the gas details denormalized per transaction
+    data = await client.transaction_gas.find_one(
+        {"_id": transaction_hash}, projection=projection
+    )
+
+    # Fall back to the swaps recorded before the gas details were denormalized
+    if not data:
+        data = await client.swaps.find_one(
+            {"transaction_hash": match_hex(transaction_hash)},
+            projection={**projection, "schema_version": 1},
+        )
 
     # If empty:
     if not data:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
-    return GasResponse(**data)
+    data = decode_event_log(data)
+
+    return JSONResponse(
+        {field: GAS_FIELD_SERIALIZERS[field](data) for field in gas_fields}
+    )
@@ -0,0 +1,82 @@
+# Standard libraries
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+# Code
+from src.core.db import MongoDBClient
+from src.lib.cache import TTLCache
+
+# Constants
+LAYOUT_TTL_SECONDS = 60
+TIMESERIES_TIME_FIELD = "time"
+TIMESERIES_META_FIELD = "meta"
+SERIES_FIELDS = ("event_id", "address")
+
+# Storage layouts of the event collections, re-checked once in a while
+layout_cache: TTLCache[str] = TTLCache(LAYOUT_TTL_SECONDS)
+
+
+async def get_layout(client: MongoDBClient, collection: str) -> str:
+    """
+    Gets the storage layout the recording service keeps a collection in.
+
+    Args:
+        client: The database client.
+        collection: The collection of the recorded events.
+
+    Returns:
+        Either "timeseries" for time-series collections, or "documents".
+    """
+    layout: Optional[str] = layout_cache.get(collection)
+
+    if layout is None:
+        names = await client.list_collection_names(
+            filter={"name": collection, "type": "timeseries"}
+        )
+        layout = "timeseries" if names else "documents"
+        layout_cache.set(collection, layout)
+
+    return layout
+
+
+def to_series_query(
+    query: dict[str, Any],
+    from_time: Optional[int] = None,
+    to_time: Optional[int] = None,
+) -> dict[str, Any]:
+    """
+    Adds the conditions on the meta and time fields of time-series collections
+    to an events query, such that only the buckets of the matching series
+    and time range are unpacked. The events keep their fields in the buckets,
+    so the original conditions still apply as they are.
+
+    Args:
+        query: The events query.
+        from_time: The smallest timestamp of the events, if the query is not
+            on their timestamps, e.g., bounding the time of their blocks.
+        to_time: The largest timestamp of the events, likewise.
+
+    Returns:
+        The events query with the series and time conditions.
+    """
+    series_query = dict(query)
+
+    for field in SERIES_FIELDS:
+        if isinstance(query.get(field), str):
+            series_query[f"{TIMESERIES_META_FIELD}.{field}"] = query[field]
+
+    time_query: dict[str, int] = query.get("timestamp", {})
+    if not time_query:
+        time_query = {
+            operator: timestamp
+            for operator, timestamp in (("$gte", from_time), ("$lte", to_time))
+            if timestamp is not None
+        }
+
+    if time_query:
+        series_query[TIMESERIES_TIME_FIELD] = {
+            operator: datetime.fromtimestamp(timestamp, timezone.utc)
+            for operator, timestamp in time_query.items()
+        }
+
+    return series_query
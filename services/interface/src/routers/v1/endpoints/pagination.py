@@ -0,0 +1,70 @@
+# Standard libraries
+from typing import Any
+import base64
+import binascii
+
+# The total order of the events across pages
+EVENTS_SORT_ORDER: list[tuple[str, int]] = [("block_number", 1), ("log_index", 1)]
+
+
+def encode_cursor(block_number: int, log_index: int) -> str:
+    """
+    Encodes the position of an event into an opaque continuation token.
+
+    Args:
+        block_number: The block number of the last event returned.
+        log_index: The log index of the last event returned.
+
+    Returns:
+        The url-safe continuation token.
+    """
+    position = f"{block_number}:{log_index}".encode()
+
+    return base64.urlsafe_b64encode(position).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[int, int]:
+    """
+    Decodes a continuation token into the position of an event.
+
+    Args:
+        cursor: The continuation token from a previous page.
+
+    Raises:
+        ValueError: If the token is malformed.
+
+    Returns:
+        The block number and log index of the last event returned.
+    """
+    try:
+        position = base64.urlsafe_b64decode(cursor.encode()).decode()
+        block_number, log_index = position.split(":")
+
+        return int(block_number), int(log_index)
+
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f'Invalid cursor "{cursor}"')
+
+
+def after_cursor(cursor: str) -> dict[str, Any]:
+    """
+    Builds the query filter for the events strictly after a continuation token,
+    which is an index seek on (block_number, log_index).
+
+    Args:
+        cursor: The continuation token from a previous page.
+
+    Raises:
+        ValueError: If the token is malformed.
+
+    Returns:
+        The query filter to be combined with the other filters.
+    """
+    block_number, log_index = decode_cursor(cursor)
+
+    return {
+        "$or": [
+            {"block_number": {"$gt": block_number}},
+            {"block_number": block_number, "log_index": {"$gt": log_index}},
+        ]
+    }
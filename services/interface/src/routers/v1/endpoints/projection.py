@@ -0,0 +1,62 @@
+# Standard libraries
+from typing import Optional, Type
+
+# 3rd party libraries
+from pydantic import BaseModel
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> list[str]:
+    """
+    Parses a sparse fieldset of a response model.
+
+    Args:
+        fields: The comma-separated field names, or None for all the fields.
+        model: The response model of the rows.
+
+    Raises:
+        ValueError: If any of the field names is not in the model.
+
+    Returns:
+        The field names in the order of the model.
+    """
+    if fields is None:
+        return list(model.__fields__)
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(model.__fields__)
+
+    if unknown or not requested:
+        raise ValueError(
+            f'"fields" must be a comma-separated subset of {list(model.__fields__)}'
+        )
+
+    return [field for field in model.__fields__ if field in requested]
+
+
+def get_projection(
+    fields: list[str],
+    paths: Optional[dict[str, str]] = None,
+    required: tuple[str, ...] = (),
+) -> dict[str, int]:
+    """
+    Builds the database projection of the fields of a response model,
+    such that only the needed parts of the documents are read.
+
+    Args:
+        fields: The field names of the response model to read.
+        paths: The document paths of the fields not stored at the top level.
+        required: The document paths needed regardless of the fields.
+
+    Returns:
+        The projection excluding the document id.
+    """
+    paths = paths or {}
+    projection = {"_id": 0}
+
+    for path in required:
+        projection[path] = 1
+
+    for field in fields:
+        projection[paths.get(field, field)] = 1
+
+    return projection
@@ -1,3 +1,6 @@
+# Standard libraries
+from typing import Optional
+
 # 3rd party libraries
 from pydantic import BaseModel
 
@@ -9,6 +12,7 @@ class GasPriceQuote(BaseModel):
 
 class UniswapV3PoolSwap(BaseModel):
     transaction_hash: str
+    log_index: int
     block_number: int
     timestamp: int
     gas_used: int
@@ -27,4 +31,29 @@ class UniswapV3PoolSwap(BaseModel):
 class UniswapV3PoolSwapResponse(BaseModel):
     data: list[UniswapV3PoolSwap]
     count: int
-    total: int
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+
+class UniswapV3PoolCandle(BaseModel):
+    address: str
+    granularity: str
+    bucket: int
+    symbol_0: str
+    symbol_1: str
+    open_0: int
+    open_1: int
+    high_0: int
+    high_1: int
+    low_0: int
+    low_1: int
+    close_0: int
+    close_1: int
+    volume_0: int
+    volume_1: int
+    count: int
+
+
+class UniswapV3PoolCandlesResponse(BaseModel):
+    data: list[UniswapV3PoolCandle]
+    count: int
@@ -1,24 +1,197 @@
 # Standard libraries
-from typing import Optional, Union
+from typing import Any, Callable, Optional
 import asyncio
+import json
 
 # 3rd party libraries
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+import pyarrow as pa
 
 # Code
-from src.core.types import EventLog
+from src.core.types import EventLog, SwapCandle, decode_event_log, match_hex
 from src.core.db import MongoDBClient
-from .models import UniswapV3PoolSwap, UniswapV3PoolSwapResponse
+from src.lib.cache import TTLCache
+from ..block_times import swaps_block_times
+from ..caching import (
+    cache_response,
+    get_cache_key,
+    get_finalized_block,
+    is_recorded,
+    response_cache,
+    to_response,
+)
+from ..export import EXPORT_BATCH_SIZE, EXPORT_MEDIA_TYPES, stream_events
+from ..layouts import get_layout, to_series_query
+from ..pagination import EVENTS_SORT_ORDER, after_cursor, encode_cursor
+from ..projection import get_projection, parse_fields
+from .models import (
+    UniswapV3PoolCandle,
+    UniswapV3PoolCandlesResponse,
+    UniswapV3PoolSwap,
+    UniswapV3PoolSwapResponse,
+)
 
 # The router instance
 uniswap_v3_pool_router = APIRouter()
 
+# Constants
+CANDLE_GRANULARITIES: dict[str, int] = {
+    "1m": 60,
+    "5m": 300,
+    "1h": 3600,
+    "1d": 86400,
+}
+SWAPS_TOTAL_TTL_SECONDS = 30
+SWAP_FIELD_PATHS: dict[str, str] = {
+    "sender": "data.sender",
+    "recipient": "data.recipient",
+    "symbol_0": "data.symbol_0",
+    "symbol_1": "data.symbol_1",
+    "amount_0": "data.amount_0",
+    "amount_1": "data.amount_1",
+    "swap_price_0": "data.swap_price_0",
+    "swap_price_1": "data.swap_price_1",
+}
+SWAP_FIELD_SERIALIZERS: dict[str, Callable[[EventLog], Any]] = {
+    "transaction_hash": lambda d: d["transaction_hash"],
+    "log_index": lambda d: d["log_index"],
+    "block_number": lambda d: d["block_number"],
+    "timestamp": lambda d: d["timestamp"],
+    "gas_used": lambda d: int(d["gas_used"]),
+    "gas_price_wei": lambda d: int(d["gas_price_wei"]),
+    "gas_price_quote": lambda d: {
+        "currency": d["gas_price_quote"]["currency"],
+        "value": int(d["gas_price_quote"]["value"]),
+    },
+    "sender": lambda d: d["data"]["sender"],
+    "recipient": lambda d: d["data"]["recipient"],
+    "symbol_0": lambda d: d["data"]["symbol_0"],
+    "symbol_1": lambda d: d["data"]["symbol_1"],
+    "amount_0": lambda d: int(d["data"]["amount_0"]),
+    "amount_1": lambda d: int(d["data"]["amount_1"]),
+    "swap_price_0": lambda d: int(d["data"]["swap_price_0"]),
+    "swap_price_1": lambda d: int(d["data"]["swap_price_1"]),
+}
+SWAP_EXPORT_SCHEMA = pa.schema(
+    [
+        ("transaction_hash", pa.string()),
+        ("log_index", pa.int64()),
+        ("block_number", pa.int64()),
+        ("timestamp", pa.int64()),
+        ("address", pa.string()),
+        ("gas_used", pa.uint64()),
+        ("gas_price_wei", pa.uint64()),
+        ("gas_price_quote_currency", pa.string()),
+        ("gas_price_quote_value", pa.decimal256(76, 0)),
+        ("sender", pa.string()),
+        ("recipient", pa.string()),
+        ("symbol_0", pa.string()),
+        ("symbol_1", pa.string()),
+        ("amount_0", pa.decimal256(76, 0)),
+        ("amount_1", pa.decimal256(76, 0)),
+        ("swap_price_0", pa.decimal256(76, 0)),
+        ("swap_price_1", pa.decimal256(76, 0)),
+    ]
+)
+
+# Totals per query shape, shared across the pages of a scan
+swaps_total_cache: TTLCache[int] = TTLCache(SWAPS_TOTAL_TTL_SECONDS)
 
-def parse_swaps(raw_data: list[EventLog]) -> list[UniswapV3PoolSwap]:
+
+def serialize_swaps(
+    raw_data: list[EventLog], fields: list[str]
+) -> list[dict[str, Any]]:
     """
-    Parses the swaps data
+    Serializes the requested fields of the swaps data in the shape of
+    `UniswapV3PoolSwap` without building and validating a model per row
     """
-    return [UniswapV3PoolSwap(**d, **d["data"]) for d in raw_data]
+    serializers = [(field, SWAP_FIELD_SERIALIZERS[field]) for field in fields]
+
+    return [
+        {field: serialize(d) for field, serialize in serializers}
+        for d in map(decode_event_log, raw_data)
+    ]
+
+
+def flatten_swap(d: EventLog) -> dict[str, Any]:
+    """
+    Flattens a swap into an export row without model validation
+    """
+    d = decode_event_log(d)
+    data = d["data"]
+
+    return {
+        "transaction_hash": d["transaction_hash"],
+        "log_index": d["log_index"],
+        "block_number": d["block_number"],
+        "timestamp": d["timestamp"],
+        "address": d["address"],
+        "gas_used": int(d["gas_used"]),
+        "gas_price_wei": int(d["gas_price_wei"]),
+        "gas_price_quote_currency": d["gas_price_quote"]["currency"],
+        "gas_price_quote_value": int(d["gas_price_quote"]["value"]),
+        "sender": data["sender"],
+        "recipient": data["recipient"],
+        "symbol_0": data["symbol_0"],
+        "symbol_1": data["symbol_1"],
+        "amount_0": int(data["amount_0"]),
+        "amount_1": int(data["amount_1"]),
+        "swap_price_0": int(data["swap_price_0"]),
+        "swap_price_1": int(data["swap_price_1"]),
+    }
+
+
+def parse_candles(raw_data: list[SwapCandle]) -> list[UniswapV3PoolCandle]:
+    """
+    Parses the pre-aggregated candles data
+    """
+    return [
+        UniswapV3PoolCandle(
+            address=d["address"],
+            granularity=d["granularity"],
+            bucket=d["bucket"],
+            symbol_0=d["symbol_0"],
+            symbol_1=d["symbol_1"],
+            open_0=int(d["open"]["price_0"].to_decimal()),
+            open_1=int(d["open"]["price_1"].to_decimal()),
+            high_0=int(d["high_0"].to_decimal()),
+            high_1=int(d["high_1"].to_decimal()),
+            low_0=int(d["low_0"].to_decimal()),
+            low_1=int(d["low_1"].to_decimal()),
+            close_0=int(d["close"]["price_0"].to_decimal()),
+            close_1=int(d["close"]["price_1"].to_decimal()),
+            volume_0=int(d["volume_0"].to_decimal()),
+            volume_1=int(d["volume_1"].to_decimal()),
+            count=d["count"],
+        )
+        for d in raw_data
+    ]
+
+
+async def count_swaps(client: MongoDBClient, query: dict[str, Any]) -> int:
+    """
+    Counts the swaps matching a query, cached for a short time-to-live
+    such that paging through a range does not recount it for every page.
+
+    Args:
+        client: The database client.
+        query: The query without the cursor filter.
+
+    Returns:
+        The total number of swaps matching the query.
+    """
+    # Binary conditions (e.g., of the transaction hash) are keyed by their repr
+    key = json.dumps(query, sort_keys=True, default=repr)
+    cached_total: Optional[int] = swaps_total_cache.get(key)
+
+    if cached_total is not None:
+        return cached_total
+
+    total: int = await client.swaps.count_documents(query)
+    swaps_total_cache.set(key, total)
+
+    return total
 
 
 @uniswap_v3_pool_router.get(
@@ -27,13 +200,19 @@ def parse_swaps(raw_data: list[EventLog]) -> list[UniswapV3PoolSwap]:
     response_model=UniswapV3PoolSwapResponse,
 )
 async def get_swaps(
+    request: Request,
     transaction_hash: Optional[str] = None,
     from_block: Optional[int] = None,
     to_block: Optional[int] = None,
+    from_time: Optional[int] = None,
+    to_time: Optional[int] = None,
     contract_address: Optional[str] = None,
     limit: int = 200,
-    offset: int = 0,
-) -> UniswapV3PoolSwapResponse:
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[str] = None,
+    offset: Optional[int] = Query(None, deprecated=True),
+) -> Response:
     """
     **Gets uniswap v3 pool's swap events with the arguments**:
 
@@ -46,44 +225,89 @@ async def get_swaps(
     <u>Second type (*range-based*)</u>:\n
     - **from_block**: Filters the events larger than or equal to this number.
     - **to_block**: Filters the events smaller than or equal to this number.
+    - **from_time** & **to_time**: Alternatively to the blocks, filters the events
+        with timestamps within this range.
     - **contract_address** (optional):
         Filters the events that are emitted from this address.
     - **limit** (optional):
         The maximum number of events to be fetched. (default=200)
-    - **offset** (optional):
-        The number of events to skip. Useful for pagination. (default=0)
+    - **cursor** (optional):
+        The **next_cursor** of the previous page to continue from.
+    - **include_total** (optional):
+        Whether to count the total number of events of the query,
+        cached for a short while across pages. (default=true)
+    - **fields** (optional):
+        The comma-separated fields of the events to return, e.g.,
+        "block_number,timestamp,swap_price_1". (default=all)
+    - **offset** (deprecated):
+        No longer supported, pages are continued from **cursor** instead.
+
+    Events are ordered by (block_number, log_index). The response carries
+    a **next_cursor** when the page is full, to be passed as **cursor**
+    to fetch the next page.
+
+    Returns **400 - Bad Request** if no arguments provided, **offset** is given,
+        **cursor** is malformed, or **fields** has unknown fields.
 
-    Returns **400 - Bad Request** if no arguments provided.
+    Responses are cached and carry an **ETag**. A pool's ranges below the
+    reorg horizon are cached for long once fully recorded, the others only briefly.
 
     \f
     Args:
+        request: The request, for its conditional headers.
         transaction_hash: The transction hash to get the events for.
         from_block: The smallest block number to get events from.
         to_block: The largest block number to get events from.
+        from_time: The smallest timestamp to get events from.
+        to_time: The largest timestamp to get events from.
         limit: The maximum number of events returned.
-        offset: The number of events to skip.
+        cursor: The continuation token from the previous page.
+        include_total: Whether to count the total number of events.
+        fields: The comma-separated fields of the events to return.
+        offset: The deprecated number of events to skip, rejected.
 
     Returns:
-        The json response of a list of events, the return count and total count.
+        The json response of a list of events, the return count, total count,
+        and the continuation token of the next page.
     """
+    # Reject the former pagination, which would otherwise repeat the first page
+    if offset is not None:
+        detail = (
+            '"offset" is no longer supported, continue from the "next_cursor" '
+            'of the previous page with "cursor" instead'
+        )
+        raise HTTPException(status_code=400, detail=detail)
+
     # Check the query
     client = MongoDBClient()
-    query: dict[str, Union[str, dict[str, int]]] = {"event_id": "uniswap-v3-pool-swap"}
+    query: dict[str, Any] = {"event_id": "uniswap-v3-pool-swap"}
+
+    try:
+        swap_fields = parse_fields(fields, UniswapV3PoolSwap)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # First priority - Find by txn hash
-    # limit/offfset is not used here
     if transaction_hash is not None:
-        query["transaction_hash"] = transaction_hash
+        query["transaction_hash"] = match_hex(transaction_hash)
 
     # Second priority queries
     else:
-        # Bad request
         if from_block is None or to_block is None:
-            detail = (
-                'Query must include either "transaction_hash" or '
-                'both ("from_block" & "to_block")'
+            # Bad request
+            if from_time is None or to_time is None:
+                detail = (
+                    'Query must include either "transaction_hash", '
+                    'both ("from_block" & "to_block"), '
+                    'or both ("from_time" & "to_time")'
+                )
+                raise HTTPException(status_code=400, detail=detail)
+
+            # Time query, resolved into the blocks containing it to use their index
+            from_block, to_block = await swaps_block_times.resolve(
+                client, from_time, to_time
             )
-            raise HTTPException(status_code=400, detail=detail)
+            query["timestamp"] = {"$gte": from_time, "$lte": to_time}
 
         # Block query
         query["block_number"] = {"$gte": from_block, "$lte": to_block}
@@ -92,13 +316,249 @@ async def get_swaps(
         if contract_address:
             query["address"] = contract_address
 
-    cursor = client.swaps.find(query)
-    cursor = cursor.allow_disk_use(True).sort("block_number").skip(offset)
+    # Only unpack the buckets of the series and time range in the time-series layout
+    is_timeseries = await get_layout(client, "swaps") == "timeseries"
+    if is_timeseries:
+        # Bound the time of block ranges by the blocks around them
+        series_times: tuple[Optional[int], Optional[int]] = (None, None)
+        if (
+            transaction_hash is None
+            and from_block is not None
+            and to_block is not None
+            and "timestamp" not in query
+        ):
+            series_times = await swaps_block_times.bound(client, from_block, to_block)
+
+        query = to_series_query(query, *series_times)
+
+    # Seek past the previous page instead of skipping over it
+    page_query = dict(query)
+    if cursor is not None:
+        try:
+            page_query.update(after_cursor(cursor))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    # Serve identical queries from the cache
+    cache_key = get_cache_key(
+        "swaps",
+        {
+            "transaction_hash": transaction_hash,
+            "from_block": from_block,
+            "to_block": to_block,
+            "from_time": from_time,
+            "to_time": to_time,
+            "contract_address": contract_address,
+            "limit": limit,
+            "cursor": cursor,
+            "include_total": include_total,
+            "fields": swap_fields,
+        },
+    )
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return to_response(cached, request)
+
+    # Read only the requested fields and the position for the next cursor
+    projection = get_projection(
+        swap_fields,
+        SWAP_FIELD_PATHS,
+        required=("block_number", "log_index", "schema_version"),
+    )
+    page = client.swaps.find(page_query, projection=projection)
+
+    # The events order is not indexed in the time-series layout, sorting in memory
+    if is_timeseries:
+        page = page.allow_disk_use(True)
+    page = page.sort(EVENTS_SORT_ORDER).to_list(limit)
+
+    if include_total:
+        data, total = await asyncio.gather(page, count_swaps(client, query))
+    else:
+        data, total = await page, None
 
-    data, total = await asyncio.gather(
-        cursor.to_list(limit), client.swaps.count_documents(query)
+    # Only full pages may have a next page
+    next_cursor = (
+        encode_cursor(data[-1]["block_number"], data[-1]["log_index"])
+        if data and len(data) == limit
+        else None
     )
 
-    return UniswapV3PoolSwapResponse(
-        data=parse_swaps(data), count=len(data), total=total
+    # Rows are serialized as-is, skipping the response model's validation
+    content = {
+        "data": serialize_swaps(data, swap_fields),
+        "count": len(data),
+        "total": total,
+        "next_cursor": next_cursor,
+    }
+
+    # Ranges below the reorg horizon can no longer change once recorded,
+    # which can only be told of a single pool's range
+    finalized = (
+        transaction_hash is None
+        and contract_address is not None
+        and from_block is not None
+        and to_block is not None
+        and to_block
+        <= await get_finalized_block(client, "swaps", "uniswap-v3-pool-swap")
+        and await is_recorded(
+            client, "uniswap-v3-pool-swap", contract_address, from_block, to_block
+        )
     )
+
+    return to_response(cache_response(cache_key, content, finalized), request)
+
+
+@uniswap_v3_pool_router.get(
+    "/swaps/export",
+    summary="Export Uniswap V3 Pool's Swap Events",
+    response_class=StreamingResponse,
+)
+async def export_swaps(
+    from_block: Optional[int] = None,
+    to_block: Optional[int] = None,
+    contract_address: Optional[str] = None,
+    format: str = "ndjson",
+    cursor: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    **Streams uniswap v3 pool's swap events of a block range**:
+
+    - **from_block**: Filters the events larger than or equal to this number.
+    - **to_block**: Filters the events smaller than or equal to this number.
+    - **contract_address** (optional):
+        Filters the events that are emitted from this address.
+    - **format** (optional):
+        One of "ndjson", "csv", "arrow" (IPC stream), or "parquet".
+        (default="ndjson")
+    - **cursor** (optional):
+        The **cursor** of the last row received to resume from.
+
+    Events are streamed in (block_number, log_index) order as flat rows,
+    each carrying the **cursor** of its position. The binary formats keep
+    the integers typed, with the 256-bit values as decimal256(76, 0).
+
+    Returns **400 - Bad Request** if
+    - either **from_block** or **to_block** is not provided.
+    - **format** is not recognizable or **cursor** is malformed.
+
+    \f
+    Args:
+        from_block: The smallest block number to get events from.
+        to_block: The largest block number to get events from.
+        contract_address: The address to filter the events by.
+        format: The format of the rows.
+        cursor: The continuation token of the last row received.
+
+    Returns:
+        The streaming response of the rows.
+    """
+    # Bad request
+    if from_block is None or to_block is None:
+        detail = 'Query must include both "from_block" & "to_block"'
+        raise HTTPException(status_code=400, detail=detail)
+
+    if format not in EXPORT_MEDIA_TYPES:
+        detail = f'"format" must be one of {list(EXPORT_MEDIA_TYPES)}'
+        raise HTTPException(status_code=400, detail=detail)
+
+    query: dict[str, Any] = {
+        "event_id": "uniswap-v3-pool-swap",
+        "block_number": {"$gte": from_block, "$lte": to_block},
+    }
+
+    # Optional filtering by contract address
+    if contract_address:
+        query["address"] = contract_address
+
+    # Resume past the last row received
+    if cursor is not None:
+        try:
+            query.update(after_cursor(cursor))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    client = MongoDBClient()
+
+    # Only unpack the buckets of the series and time range in the time-series layout,
+    # bounding the time of the block range by the blocks around it
+    is_timeseries = await get_layout(client, "swaps") == "timeseries"
+    if is_timeseries:
+        from_bound, to_bound = await swaps_block_times.bound(
+            client, from_block, to_block
+        )
+        query = to_series_query(query, from_bound, to_bound)
+
+    documents = client.swaps.find(query, batch_size=EXPORT_BATCH_SIZE)
+
+    # The events order is not indexed in the time-series layout, sorting in memory
+    if is_timeseries:
+        documents = documents.allow_disk_use(True)
+    documents = documents.sort(EVENTS_SORT_ORDER)
+
+    return StreamingResponse(
+        stream_events(documents, flatten_swap, SWAP_EXPORT_SCHEMA, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+    )
+
+
+@uniswap_v3_pool_router.get(
+    "/candles",
+    summary="Get Uniswap V3 Pool's Swap Candles",
+    response_model=UniswapV3PoolCandlesResponse,
+)
+async def get_candles(
+    contract_address: Optional[str] = None,
+    from_time: Optional[int] = None,
+    to_time: Optional[int] = None,
+    granularity: str = "1m",
+    limit: int = 1000,
+) -> UniswapV3PoolCandlesResponse:
+    """
+    **Gets the pre-aggregated OHLCV candles of a uniswap v3 pool's swaps**:
+
+    - **contract_address**: The address of the pool.
+    - **from_time**: Filters the candles starting at or after this timestamp.
+    - **to_time**: Filters the candles starting at or before this timestamp.
+    - **granularity** (optional):
+        One of "1m", "5m", "1h", or "1d". (default="1m")
+    - **limit** (optional):
+        The maximum number of candles to be fetched. (default=1000)
+
+    Prices are the swap prices (see the swaps endpoint) and volumes are the
+    absolute amounts of each token swapped within the candle.
+
+    Returns **400 - Bad Request** if
+    - any of **contract_address**, **from_time**, or **to_time** is not provided.
+    - **granularity** is not recognizable.
+
+    \f
+    Args:
+        contract_address: The address of the pool to get the candles for.
+        from_time: The smallest candle starting timestamp.
+        to_time: The largest candle starting timestamp.
+        granularity: The granularity of the candles.
+        limit: The maximum number of candles returned.
+
+    Returns:
+        The json response of a list of candles and the return count.
+    """
+    # Bad request
+    if not contract_address or from_time is None or to_time is None:
+        detail = 'Query must include "contract_address", "from_time", and "to_time"'
+        raise HTTPException(status_code=400, detail=detail)
+
+    if granularity not in CANDLE_GRANULARITIES:
+        detail = f'"granularity" must be one of {list(CANDLE_GRANULARITIES)}'
+        raise HTTPException(status_code=400, detail=detail)
+
+    client = MongoDBClient()
+    query = {
+        "address": contract_address,
+        "granularity": granularity,
+        "bucket": {"$gte": from_time, "$lte": to_time},
+    }
+
+    data = await client.swap_candles.find(query).sort("bucket").to_list(limit)
+
+    return UniswapV3PoolCandlesResponse(data=parse_candles(data), count=len(data))
@@ -0,0 +1,145 @@
+# Standard libraries
+from datetime import datetime, timezone
+
+# 3rd party libraries
+from asynctest import CoroutineMock, MagicMock, patch
+import pytest
+
+# Code
+from src.routers.v1.endpoints.block_times import MAX_BLOCK_NUMBER, BlockTimeIndex
+from src.routers.v1.endpoints.layouts import layout_cache
+
+
+class MockedCursor:
+    def __init__(self, documents):
+        self.__documents = list(documents)
+
+    async def to_list(self, length):
+        batch = self.__documents[:length]
+        self.__documents = self.__documents[length:]
+        return batch
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    layout_cache.clear()
+
+
+def get_client(*batches, layouts=()):
+    client = MagicMock()
+    client.list_collection_names = CoroutineMock(return_value=list(layouts))
+    client["swaps"].find().sort.side_effect = [
+        MockedCursor(documents) for documents in batches
+    ]
+    client["swaps"].find.reset_mock()
+    return client
+
+
+# Swaps of blocks 10, 12 and 15 at timestamps 100, 124 and 160
+RECORDED_SWAPS = [
+    {"block_number": 10, "timestamp": 100},
+    {"block_number": 10, "timestamp": 100},
+    {"block_number": 12, "timestamp": 124},
+    {"block_number": 15, "timestamp": 160},
+]
+
+RESOLVE_PARAMETERS = [
+    # Within the indexed blocks
+    (100, 160, (0, MAX_BLOCK_NUMBER)),
+    (101, 159, (11, 14)),
+    (124, 124, (11, 14)),
+    (110, 130, (11, 14)),
+    # Before and after the indexed blocks
+    (0, 99, (0, 9)),
+    (161, 200, (16, MAX_BLOCK_NUMBER)),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("from_time,to_time,block_range", RESOLVE_PARAMETERS)
+@patch("src.routers.v1.endpoints.block_times.BLOCK_TIMES_BATCH_SIZE", 2)
+async def test_resolve(from_time, to_time, block_range):
+    index = BlockTimeIndex("swaps")
+    client = get_client(RECORDED_SWAPS)
+
+    # Should resolve into the blocks between the neighbours of the range
+    assert await index.resolve(client, from_time, to_time) == block_range
+
+    # Should index each block once
+    assert len(index) == 3
+    client["swaps"].find.assert_called_once_with(
+        {"block_number": {"$gt": -1}},
+        projection={"_id": 0, "block_number": 1, "timestamp": 1},
+    )
+
+
+@pytest.mark.asyncio
+async def test_resolve_refreshes_incrementally():
+    index = BlockTimeIndex("swaps", refresh_seconds=0)
+    client = get_client(RECORDED_SWAPS[:3], RECORDED_SWAPS[2:])
+
+    assert await index.resolve(client, 124, 124) == (11, MAX_BLOCK_NUMBER)
+    assert await index.resolve(client, 124, 124) == (11, 14)
+
+    # Should only read the blocks past the latest indexed block
+    assert len(index) == 3
+    client["swaps"].find.assert_called_with(
+        {"block_number": {"$gt": 12}},
+        projection={"_id": 0, "block_number": 1, "timestamp": 1},
+    )
+
+
+@pytest.mark.asyncio
+async def test_resolve_is_not_refreshed_while_fresh():
+    index = BlockTimeIndex("swaps")
+    client = get_client(RECORDED_SWAPS)
+
+    await index.refresh(client)
+    await index.resolve(client, 0, 1)
+
+    # Should not read again for a while
+    assert client["swaps"].find.call_count == 1
+
+    # Should read everything again once cleared
+    index.clear()
+    assert len(index) == 0
+
+
+@pytest.mark.asyncio
+async def test_refresh_in_timeseries_layout():
+    index = BlockTimeIndex("swaps")
+    client = get_client(RECORDED_SWAPS[:3], RECORDED_SWAPS[2:], layouts=["swaps"])
+
+    await index.refresh(client)
+    await index.refresh(client)
+
+    # Should only unpack the buckets since the latest indexed block
+    assert len(index) == 3
+    client["swaps"].find.assert_called_with(
+        {
+            "block_number": {"$gt": 12},
+            "time": {"$gte": datetime(1970, 1, 1, 0, 2, 4, tzinfo=timezone.utc)},
+        },
+        projection={"_id": 0, "block_number": 1, "timestamp": 1},
+    )
+
+
+BOUND_PARAMETERS = [
+    # Within the indexed blocks
+    (10, 15, (100, 160)),
+    (11, 14, (100, 160)),
+    (12, 12, (124, 124)),
+    # Before and after the indexed blocks
+    (0, 9, (None, 100)),
+    (13, 20, (124, None)),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("from_block,to_block,time_range", BOUND_PARAMETERS)
+async def test_bound(from_block, to_block, time_range):
+    index = BlockTimeIndex("swaps")
+    client = get_client(RECORDED_SWAPS)
+
+    # Should bound the range by the timestamps of the blocks around it
+    assert await index.bound(client, from_block, to_block) == time_range
@@ -0,0 +1,108 @@
+# 3rd party libraries
+from asynctest import CoroutineMock, MagicMock
+import pytest
+
+# Code
+from src.routers.v1.endpoints.caching import (
+    cache_response,
+    get_cache_key,
+    get_finalized_block,
+    head_cache,
+    is_recorded,
+    response_cache,
+)
+from src.routers.v1.endpoints.layouts import layout_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    response_cache.clear()
+    head_cache.clear()
+    layout_cache.clear()
+
+
+def test_get_cache_key():
+    # Should be independent of the order of the parameters
+    assert get_cache_key("swaps", {"a": 1, "b": 2}) == get_cache_key(
+        "swaps", {"b": 2, "a": 1}
+    )
+    assert get_cache_key("swaps", {"a": 1}) != get_cache_key("gas", {"a": 1})
+
+
+FINALIZED_BLOCK_PARAMETERS = [({"block_number": 1000}, 936), (None, -1)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("latest,finalized_block", FINALIZED_BLOCK_PARAMETERS)
+async def test_get_finalized_block(latest, finalized_block):
+    client = MagicMock()
+    client.list_collection_names = CoroutineMock(return_value=[])
+    client["swaps"].find_one = CoroutineMock(return_value=latest)
+
+    # Should be the latest recorded block less the reorg horizon
+    assert await get_finalized_block(client, "swaps", "event_id") == finalized_block
+    assert await get_finalized_block(client, "swaps", "event_id") == finalized_block
+
+    # Should only look the latest recorded block up once for a while
+    client["swaps"].find_one.assert_awaited_once_with(
+        {"event_id": "event_id"},
+        projection={"_id": 0, "block_number": 1},
+        sort=[("block_number", -1)],
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_finalized_block_in_timeseries_layout():
+    client = MagicMock()
+    client.list_collection_names = CoroutineMock(return_value=["swaps"])
+    client["swaps"].find_one = CoroutineMock(return_value={"block_number": 1000})
+
+    assert await get_finalized_block(client, "swaps", "event_id") == 936
+
+    # Should look the latest recorded block up by the time of its series
+    client["swaps"].find_one.assert_awaited_once_with(
+        {"event_id": "event_id", "meta.event_id": "event_id"},
+        projection={"_id": 0, "block_number": 1},
+        sort=[("time", -1)],
+    )
+
+
+IS_RECORDED_PARAMETERS = [
+    ({"ranges": [[1, 50], [100, 400]]}, 123, 321, True),
+    # Partially recorded
+    ({"ranges": [[1, 200], [250, 400]]}, 123, 321, False),
+    ({"ranges": [[200, 400]]}, 123, 321, False),
+    # Nothing recorded
+    (None, 123, 321, False),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "coverage,from_block,to_block,expected", IS_RECORDED_PARAMETERS
+)
+async def test_is_recorded(coverage, from_block, to_block, expected):
+    client = MagicMock()
+    client["block_coverage"].find_one = CoroutineMock(return_value=coverage)
+
+    # Should only be recorded if a ledger range contains the whole range
+    assert await is_recorded(client, "event_id", "0xABC", from_block, to_block) == (
+        expected
+    )
+    assert client["block_coverage"].find_one.call_args.args[0] == {
+        "_id": "event_id-0xabc"
+    }
+
+
+def test_cache_response():
+    cached = cache_response("key", {"data": [1, 2]}, finalized=True)
+
+    # Should cache the serialized content with its size
+    assert cached.body == b'{"data":[1,2]}'
+    assert cached.max_age == 86400
+    assert response_cache.get("key") == cached
+    assert response_cache.size == len(cached.body)
+
+    # Should tag the content by its digest
+    assert cached.etag == cache_response("other", {"data": [1, 2]}, False).etag
+    assert cached.etag != cache_response("other", {"data": [1]}, False).etag
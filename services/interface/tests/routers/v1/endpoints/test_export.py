@@ -0,0 +1,93 @@
+# Standard libraries
+import asyncio
+import json
+
+# 3rd party libraries
+from asynctest import patch
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+# Code
+from src.routers.v1.endpoints.export import stream_events
+from src.routers.v1.endpoints.pagination import encode_cursor
+
+
+class MockedCursor:
+    def __init__(self, documents):
+        self.__documents = list(documents)
+
+    async def to_list(self, length):
+        batch = self.__documents[:length]
+        self.__documents = self.__documents[length:]
+        return batch
+
+
+DOCUMENTS = [
+    {"block_number": 1, "log_index": 0, "value": "a"},
+    {"block_number": 1, "log_index": 1, "value": "b"},
+    {"block_number": 2, "log_index": 0, "value": "c"},
+]
+
+
+SCHEMA = pa.schema([("value", pa.string())])
+
+
+def flatten(document):
+    return {"value": document["value"]}
+
+
+def collect(fmt):
+    async def run():
+        cursor = MockedCursor(DOCUMENTS)
+        return [c async for c in stream_events(cursor, flatten, SCHEMA, fmt)]
+
+    return asyncio.run(run())
+
+
+@patch("src.routers.v1.endpoints.export.EXPORT_BATCH_SIZE", 2)
+def test_stream_events_ndjson():
+    chunks = collect("ndjson")
+
+    # Should yield the rows in chunks of the batch size
+    assert len(chunks) == 2
+    assert [json.loads(line) for line in "".join(chunks).splitlines()] == [
+        {
+            "value": d["value"],
+            "cursor": encode_cursor(d["block_number"], d["log_index"]),
+        }
+        for d in DOCUMENTS
+    ]
+
+
+@patch("src.routers.v1.endpoints.export.EXPORT_BATCH_SIZE", 3)
+def test_stream_events_csv():
+    chunks = collect("csv")
+
+    # Should yield the header before a single chunk of rows
+    assert len(chunks) == 2
+    assert "".join(chunks).splitlines() == ["value,cursor"] + [
+        f'{d["value"]},{encode_cursor(d["block_number"], d["log_index"])}'
+        for d in DOCUMENTS
+    ]
+
+
+ARROW_PARAMETERS = [
+    ("arrow", lambda data: pa.ipc.open_stream(data).read_all()),
+    ("parquet", lambda data: pq.read_table(pa.BufferReader(data))),
+]
+
+
+@pytest.mark.parametrize("fmt,read", ARROW_PARAMETERS)
+@patch("src.routers.v1.endpoints.export.EXPORT_BATCH_SIZE", 2)
+def test_stream_events_arrow(fmt, read):
+    chunks = collect(fmt)
+
+    # Should yield a chunk per batch and the remainder after closing
+    assert len(chunks) == 3
+    assert all(isinstance(chunk, bytes) for chunk in chunks)
+
+    # Should be readable as a single typed table
+    table = read(b"".join(chunks))
+    assert table.schema == SCHEMA.append(pa.field("cursor", pa.string()))
+    assert table.column("value").to_pylist() == [d["value"] for d in DOCUMENTS]
@@ -3,6 +3,7 @@ import json
 
 # 3rd party libraries
 from asynctest import CoroutineMock, patch
+from bson.decimal128 import Decimal128
 from fastapi.testclient import TestClient
 
 # Code
@@ -15,7 +16,7 @@ client = TestClient(app)
 @patch("src.routers.v1.endpoints.gas.MongoDBClient")
 def test_get_gas_details(db):
     # Mock the db's response
-    db().swaps.find_one = CoroutineMock(
+    db().transaction_gas.find_one = CoroutineMock(
         return_value={
             "gas_used": "123456",
             "gas_price_wei": "123456789",
@@ -41,9 +42,66 @@ def test_get_gas_details(db):
 @patch("src.routers.v1.endpoints.gas.MongoDBClient")
 def test_get_gas_details_but_not_found(db):
     # Mock the db's response
+    db().transaction_gas.find_one = CoroutineMock(return_value=None)
     db().swaps.find_one = CoroutineMock(return_value=None)
 
     response = client.get("/api/v1/gas/0x123456")
 
     # Should return 404 - Not Found
     assert response.status_code == 404
+
+
+@patch("src.routers.v1.endpoints.gas.MongoDBClient")
+def test_get_gas_details_with_fields(db):
+    # Mock the db's response
+    db().transaction_gas.find_one = CoroutineMock(return_value=None)
+    db().swaps.find_one = CoroutineMock(
+        return_value={"gas_price_quote": {"currency": "SGD", "value": "123456789"}}
+    )
+
+    response = client.get("/api/v1/gas/0x123456?fields=gas_price_quote")
+
+    # Should only read and return the requested fields
+    assert response.json() == {
+        "gas_price_quote": {"currency": "SGD", "value": 123456789}
+    }
+    db().transaction_gas.find_one.assert_called_with(
+        {"_id": "0x123456"}, projection={"_id": 0, "gas_price_quote": 1}
+    )
+
+    # Should fall back to the swaps collection
+    db().swaps.find_one.assert_called_with(
+        {"transaction_hash": {"$in": ["0x123456", b"\x12\x34\x56"]}},
+        projection={"_id": 0, "gas_price_quote": 1, "schema_version": 1},
+    )
+
+
+@patch("src.routers.v1.endpoints.gas.MongoDBClient")
+def test_get_gas_details_with_unknown_fields(db):
+    response = client.get("/api/v1/gas/0x123456?fields=topics")
+
+    # Should return 400 - Bad Request
+    assert response.status_code == 400
+
+
+@patch("src.routers.v1.endpoints.gas.MongoDBClient")
+def test_get_gas_details_in_compact_schema(db):
+    # Mock the db's response of a swap in the compact schema
+    db().transaction_gas.find_one = CoroutineMock(return_value=None)
+    db().swaps.find_one = CoroutineMock(
+        return_value={
+            "schema_version": 2,
+            "gas_used": 123456,
+            "gas_price_wei": 123456789,
+            "gas_price_quote": {"currency": "SGD", "value": Decimal128("123456789")},
+        }
+    )
+
+    response = client.get("/api/v1/gas/0x123456")
+
+    # Should decode into the same output
+    assert response.json() == {
+        "gas_used": 123456,
+        "gas_price_wei": 123456789,
+        "gas_price_quote": {"currency": "SGD", "value": 123456789},
+    }
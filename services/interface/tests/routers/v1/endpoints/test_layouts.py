@@ -0,0 +1,74 @@
+# Standard libraries
+from datetime import datetime, timezone
+
+# 3rd party libraries
+from asynctest import CoroutineMock, MagicMock
+import pytest
+
+# Code
+from src.routers.v1.endpoints.layouts import get_layout, layout_cache, to_series_query
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    layout_cache.clear()
+
+
+LAYOUT_PARAMETERS = [(["swaps"], "timeseries"), ([], "documents")]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("names,layout", LAYOUT_PARAMETERS)
+async def test_get_layout(names, layout):
+    client = MagicMock()
+    client.list_collection_names = CoroutineMock(return_value=names)
+
+    # Should be the layout of the collection
+    assert await get_layout(client, "swaps") == layout
+    assert await get_layout(client, "swaps") == layout
+
+    # Should only look the collection up once for a while
+    client.list_collection_names.assert_awaited_once_with(
+        filter={"name": "swaps", "type": "timeseries"}
+    )
+
+
+def test_to_series_query():
+    query = {
+        "event_id": "uniswap-v3-pool-swap",
+        "address": "0x123",
+        "timestamp": {"$gte": 60, "$lte": 120},
+        "block_number": {"$gte": 1, "$lte": 2},
+    }
+
+    # Should keep the conditions and add those of the series and time
+    assert to_series_query(query) == {
+        **query,
+        "meta.event_id": "uniswap-v3-pool-swap",
+        "meta.address": "0x123",
+        "time": {
+            "$gte": datetime(1970, 1, 1, 0, 1, tzinfo=timezone.utc),
+            "$lte": datetime(1970, 1, 1, 0, 2, tzinfo=timezone.utc),
+        },
+    }
+
+
+def test_to_series_query_without_series():
+    query = {"transaction_hash": {"$in": ["0x12", b"\x12"]}}
+
+    # Should leave queries without the series or time as they are
+    assert to_series_query(query) == query
+
+
+def test_to_series_query_with_time_bounds():
+    query = {"event_id": "uniswap-v3-pool-swap", "block_number": {"$gte": 1}}
+
+    # Should bound the time of the query not on the timestamps
+    assert to_series_query(query, 60) == {
+        **query,
+        "meta.event_id": "uniswap-v3-pool-swap",
+        "time": {"$gte": datetime(1970, 1, 1, 0, 1, tzinfo=timezone.utc)},
+    }
+    assert to_series_query(query, None, 120)["time"] == {
+        "$lte": datetime(1970, 1, 1, 0, 2, tzinfo=timezone.utc)
+    }
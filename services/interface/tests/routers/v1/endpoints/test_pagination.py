@@ -0,0 +1,37 @@
+# 3rd party libraries
+import pytest
+
+# Code
+from src.routers.v1.endpoints.pagination import (
+    after_cursor,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def test_encode_decode_cursor():
+    cursor = encode_cursor(14900020, 123)
+
+    # Should be opaque and round-trip
+    assert "14900020" not in cursor
+    assert decode_cursor(cursor) == (14900020, 123)
+
+
+INVALID_CURSOR_PARAMETERS = ["invalid", "MTIz", encode_cursor(1, 2)[:-2], "gA=="]
+
+
+@pytest.mark.parametrize("cursor", INVALID_CURSOR_PARAMETERS)
+def test_decode_invalid_cursor(cursor):
+    # Should raise a value error for malformed tokens
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_after_cursor():
+    # Should seek strictly past the position in (block_number, log_index) order
+    assert after_cursor(encode_cursor(100, 5)) == {
+        "$or": [
+            {"block_number": {"$gt": 100}},
+            {"block_number": 100, "log_index": {"$gt": 5}},
+        ]
+    }
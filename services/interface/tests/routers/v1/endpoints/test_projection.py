@@ -0,0 +1,40 @@
+# 3rd party libraries
+from pydantic import BaseModel
+import pytest
+
+# Code
+from src.routers.v1.endpoints.projection import get_projection, parse_fields
+
+
+class Model(BaseModel):
+    a: int
+    b: int
+    c: int
+
+
+def test_parse_fields():
+    # Should default to all the fields
+    assert parse_fields(None, Model) == ["a", "b", "c"]
+
+    # Should keep the order of the model
+    assert parse_fields("c, a", Model) == ["a", "c"]
+
+
+INVALID_FIELDS_PARAMETERS = ["a,d", "", ","]
+
+
+@pytest.mark.parametrize("fields", INVALID_FIELDS_PARAMETERS)
+def test_parse_invalid_fields(fields):
+    # Should raise a value error
+    with pytest.raises(ValueError):
+        parse_fields(fields, Model)
+
+
+def test_get_projection():
+    # Should map the nested fields and include the required paths
+    assert get_projection(["a", "c"], {"c": "data.c"}, required=("b",)) == {
+        "_id": 0,
+        "b": 1,
+        "a": 1,
+        "data.c": 1,
+    }
@@ -1,13 +1,21 @@
 # Standard libraries
+from datetime import datetime, timezone
+from decimal import Decimal
 import json
 
 # 3rd party libraries
-from asynctest import CoroutineMock, patch
+from asynctest import ANY, CoroutineMock, patch
+from bson.decimal128 import Decimal128
 from fastapi.testclient import TestClient
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 
 # Code
 from src.app import app
+from src.routers.v1.endpoints.caching import response_cache
+from src.routers.v1.endpoints.pagination import after_cursor, encode_cursor
+from src.routers.v1.endpoints.uniswap.v3_pool import swaps_total_cache
 
 # The mocked app client
 client = TestClient(app)
@@ -15,8 +23,10 @@ client = TestClient(app)
 # Constants
 MOCKED_SWAP_EVENT = {
     "transaction_hash": "0x123456",
+    "log_index": 12,
     "block_number": 123456,
     "timestamp": 123456789,
+    "address": "0x123",
     "gas_used": "123456",
     "gas_price_wei": "123456789",
     "gas_price_quote": {"currency": "SGD", "value": "123456789"},
@@ -33,8 +43,26 @@ MOCKED_SWAP_EVENT = {
 }
 
 
+# The same swap stored in the compact schema
+MOCKED_COMPACT_SWAP_EVENT = {
+    **MOCKED_SWAP_EVENT,
+    "schema_version": 2,
+    "transaction_hash": b"\x12\x34\x56",
+    "gas_used": 123456,
+    "gas_price_wei": 123456789,
+    "gas_price_quote": {"currency": "SGD", "value": Decimal128("123456789")},
+    "data": {
+        **MOCKED_SWAP_EVENT["data"],
+        "amount_0": 123456789,
+        "amount_1": Decimal128("123456789"),
+        "swap_price_0": "123456789",
+    },
+}
+
+
 PARSED_MOCKED_SWAP_EVENT = {
     "transaction_hash": "0x123456",
+    "log_index": 12,
     "block_number": 123456,
     "timestamp": 123456789,
     "gas_used": 123456,
@@ -51,6 +79,26 @@ PARSED_MOCKED_SWAP_EVENT = {
 }
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Totals and responses should not leak across tests
+    swaps_total_cache.clear()
+    response_cache.clear()
+
+    # Nothing is finalized nor in the time-series layout unless a test says so
+    with patch(
+        "src.routers.v1.endpoints.uniswap.v3_pool.get_layout",
+        CoroutineMock(return_value="documents"),
+    ), patch(
+        "src.routers.v1.endpoints.uniswap.v3_pool.is_recorded",
+        CoroutineMock(return_value=True),
+    ), patch(
+        "src.routers.v1.endpoints.uniswap.v3_pool.get_finalized_block",
+        CoroutineMock(return_value=-1),
+    ) as get_finalized_block:
+        yield get_finalized_block
+
+
 SUCCESS_RESPONSE_PARAMETERS = [
     "/api/v1/uniswap/v3-pool/swaps?transaction_hash=0x123456",
     "/api/v1/uniswap/v3-pool/swaps?from_block=123&to_block=321",
@@ -62,7 +110,7 @@ SUCCESS_RESPONSE_PARAMETERS = [
 @patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
 def test_get_swaps_with_transaction_hash(db, uri):
     # Mock the db response
-    db().swaps.find().allow_disk_use().sort().skip().to_list = CoroutineMock(
+    db().swaps.find().sort().to_list = CoroutineMock(
         return_value=10 * [MOCKED_SWAP_EVENT]
     )
     db().swaps.count_documents = CoroutineMock(return_value=100)
@@ -75,11 +123,295 @@ def test_get_swaps_with_transaction_hash(db, uri):
     assert result["data"] == 10 * [PARSED_MOCKED_SWAP_EVENT]
     assert result["count"] == 10
     assert result["total"] == 100
+    assert result["next_cursor"] is None
+
+
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_get_swaps_in_compact_schema(db):
+    # Mock the db response
+    db().swaps.find().sort().to_list = CoroutineMock(
+        return_value=[MOCKED_COMPACT_SWAP_EVENT, MOCKED_SWAP_EVENT]
+    )
+
+    response = client.get(
+        "/api/v1/uniswap/v3-pool/swaps?transaction_hash=0x123456&include_total=false"
+    )
+
+    # Should decode the compact swaps into the same output
+    assert response.json()["data"] == 2 * [PARSED_MOCKED_SWAP_EVENT]
+
+    # Should match the transaction hash in either form
+    assert db().swaps.find.call_args[0][0]["transaction_hash"] == {
+        "$in": ["0x123456", b"\x12\x34\x56"]
+    }
+
+
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_get_swaps_with_cursor(db):
+    # Mock the db response
+    db().swaps.find().sort().to_list = CoroutineMock(
+        return_value=10 * [MOCKED_SWAP_EVENT]
+    )
+    db().swaps.count_documents = CoroutineMock(return_value=100)
+
+    cursor = encode_cursor(123, 4)
+    response = client.get(
+        f"/api/v1/uniswap/v3-pool/swaps?from_block=123&to_block=321"
+        f"&limit=10&cursor={cursor}"
+    )
+
+    result = response.json()
+
+    # Should seek past the cursor for the page but not for the total
+    query = {
+        "event_id": "uniswap-v3-pool-swap",
+        "block_number": {"$gte": 123, "$lte": 321},
+    }
+    db().swaps.find.assert_called_with(
+        {**query, **after_cursor(cursor)}, projection=ANY
+    )
+    db().swaps.count_documents.assert_called_with(query)
+
+    # Should return the position of the last event for a full page
+    assert result["count"] == 10
+    assert result["next_cursor"] == encode_cursor(123456, 12)
+
+
+@patch(
+    "src.routers.v1.endpoints.uniswap.v3_pool.swaps_block_times.resolve",
+    CoroutineMock(return_value=(11, 14)),
+)
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_get_swaps_with_time_range(db):
+    # Mock the db response
+    db().swaps.find().sort().to_list = CoroutineMock(
+        return_value=10 * [MOCKED_SWAP_EVENT]
+    )
+    db().swaps.count_documents = CoroutineMock(return_value=100)
+
+    response = client.get("/api/v1/uniswap/v3-pool/swaps?from_time=110&to_time=130")
+
+    # Should filter by the blocks containing the time range
+    assert response.status_code == 200
+    db().swaps.count_documents.assert_called_with(
+        {
+            "event_id": "uniswap-v3-pool-swap",
+            "timestamp": {"$gte": 110, "$lte": 130},
+            "block_number": {"$gte": 11, "$lte": 14},
+        }
+    )
+
+
+@patch(
+    "src.routers.v1.endpoints.uniswap.v3_pool.get_layout",
+    CoroutineMock(return_value="timeseries"),
+)
+@patch(
+    "src.routers.v1.endpoints.uniswap.v3_pool.swaps_block_times.bound",
+    CoroutineMock(return_value=(60, None)),
+)
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_get_swaps_in_timeseries_layout(db):
+    # Mock the db response
+    db().swaps.find().allow_disk_use().sort().to_list = CoroutineMock(
+        return_value=10 * [MOCKED_SWAP_EVENT]
+    )
+    db().swaps.count_documents = CoroutineMock(return_value=100)
+
+    response = client.get(
+        "/api/v1/uniswap/v3-pool/swaps?from_block=123&to_block=321"
+        "&contract_address=0x123"
+    )
+
+    # Should read the same swaps, also matching their series and time bounds
+    assert response.json()["data"] == 10 * [PARSED_MOCKED_SWAP_EVENT]
+    db().swaps.count_documents.assert_called_with(
+        {
+            "event_id": "uniswap-v3-pool-swap",
+            "block_number": {"$gte": 123, "$lte": 321},
+            "address": "0x123",
+            "meta.event_id": "uniswap-v3-pool-swap",
+            "meta.address": "0x123",
+            "time": {"$gte": datetime(1970, 1, 1, 0, 1, tzinfo=timezone.utc)},
+        }
+    )
+
+    # Should sort the unindexed events order in memory
+    db().swaps.find().allow_disk_use.assert_called_with(True)
+
+
+@patch(
+    "src.routers.v1.endpoints.uniswap.v3_pool.get_layout",
+    CoroutineMock(return_value="timeseries"),
+)
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.swaps_block_times.bound")
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_get_swaps_by_transaction_hash_in_timeseries_layout(db, bound):
+    # Mock the db response
+    db().swaps.find().allow_disk_use().sort().to_list = CoroutineMock(
+        return_value=[MOCKED_SWAP_EVENT]
+    )
+    db().swaps.count_documents = CoroutineMock(return_value=1)
+
+    response = client.get(
+        "/api/v1/uniswap/v3-pool/swaps?transaction_hash=0x123456&from_block=123"
+    )
+
+    # Should not bound the time of the transaction's swaps by the blocks
+    assert response.status_code == 200
+    bound.assert_not_called()
+    assert "time" not in db().swaps.count_documents.call_args.args[0]
+
+
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_get_swaps_with_fields(db):
+    # Mock the db response
+    db().swaps.find().sort().to_list = CoroutineMock(
+        return_value=10 * [MOCKED_SWAP_EVENT]
+    )
+
+    response = client.get(
+        "/api/v1/uniswap/v3-pool/swaps?from_block=123&to_block=321"
+        "&include_total=false&fields=swap_price_1,timestamp"
+    )
+
+    # Should only return the requested fields
+    assert response.json()["data"] == 10 * [
+        {"timestamp": 123456789, "swap_price_1": 123456789}
+    ]
+
+    # Should only read the requested fields, the position, and the schema version
+    assert db().swaps.find.call_args[1]["projection"] == {
+        "_id": 0,
+        "block_number": 1,
+        "log_index": 1,
+        "schema_version": 1,
+        "timestamp": 1,
+        "data.swap_price_1": 1,
+    }
+
+
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_get_swaps_with_unknown_fields(db):
+    response = client.get(
+        "/api/v1/uniswap/v3-pool/swaps?from_block=123&to_block=321&fields=raw_data"
+    )
+
+    # Should return 400 - Bad Request
+    assert response.status_code == 400
+
+
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_get_swaps_total_is_cached(db):
+    # Mock the db response
+    db().swaps.find().sort().to_list = CoroutineMock(
+        return_value=10 * [MOCKED_SWAP_EVENT]
+    )
+    db().swaps.count_documents = CoroutineMock(return_value=100)
+
+    uri = "/api/v1/uniswap/v3-pool/swaps?from_block=123&to_block=321&limit=10"
+    first_page = client.get(uri).json()
+    second_page = client.get(f"{uri}&cursor={first_page['next_cursor']}").json()
+
+    # Should count the query only once across the pages
+    assert first_page["total"] == second_page["total"] == 100
+    assert db().swaps.count_documents.call_count == 1
+
+
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_get_swaps_without_total(db):
+    # Mock the db response
+    db().swaps.find().sort().to_list = CoroutineMock(
+        return_value=10 * [MOCKED_SWAP_EVENT]
+    )
+    db().swaps.count_documents = CoroutineMock(return_value=100)
+
+    response = client.get(
+        "/api/v1/uniswap/v3-pool/swaps?from_block=123&to_block=321&include_total=false"
+    )
+
+    result = response.json()
+
+    # Should skip counting
+    assert result["count"] == 10
+    assert result["total"] is None
+    assert db().swaps.count_documents.call_count == 0
+
+
+CACHE_CONTROL_PARAMETERS = [
+    (1000, True, "&contract_address=0x123", "public, max-age=86400"),
+    # Not finalized yet
+    (100, True, "&contract_address=0x123", "public, max-age=5"),
+    # Not recorded yet
+    (1000, False, "&contract_address=0x123", "public, max-age=5"),
+    # Across pools
+    (1000, True, "", "public, max-age=5"),
+]
+
+
+@pytest.mark.parametrize(
+    "finalized_block,recorded,params,cache_control", CACHE_CONTROL_PARAMETERS
+)
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.is_recorded")
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_get_swaps_is_cached(
+    db, is_recorded, finalized_block, recorded, params, cache_control, clear_caches
+):
+    # Mock the db response
+    db().swaps.find().sort().to_list = CoroutineMock(
+        return_value=10 * [MOCKED_SWAP_EVENT]
+    )
+    clear_caches.return_value = finalized_block
+    is_recorded.side_effect = CoroutineMock(return_value=recorded)
+
+    uri = (
+        "/api/v1/uniswap/v3-pool/swaps?from_block=123&to_block=321&include_total=0"
+        + params
+    )
+    first = client.get(uri)
+    second = client.get(uri)
+
+    # Should only read from the database once
+    assert db().swaps.find().sort().to_list.call_count == 1
+    assert first.json() == second.json()
+
+    # Should cache for long only if the range is finalized
+    assert first.headers["Cache-Control"] == cache_control
+    assert first.headers["ETag"] == second.headers["ETag"]
+
+    # Should return 304 - Not Modified if the client has it already
+    third = client.get(uri, headers={"If-None-Match": first.headers["ETag"]})
+    assert third.status_code == 304
+    assert third.content == b""
+
+
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_get_swaps_with_invalid_cursor(db):
+    response = client.get(
+        "/api/v1/uniswap/v3-pool/swaps?from_block=123&to_block=321&cursor=invalid"
+    )
+
+    # Should return 400 - Bad Request
+    assert response.status_code == 400
+
+
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_get_swaps_with_offset(db):
+    response = client.get(
+        "/api/v1/uniswap/v3-pool/swaps?from_block=123&to_block=321&offset=200"
+    )
+
+    # Should return 400 - Bad Request, pointing to the cursor
+    assert response.status_code == 400
+    assert '"cursor"' in response.json()["detail"]
+    db().swaps.find.assert_not_called()
 
 
 FAILURE_RESPONSE_PARAMETERS = [
     "/api/v1/uniswap/v3-pool/swaps?from_block=123",
     "/api/v1/uniswap/v3-pool/swaps?to_block=321",
+    "/api/v1/uniswap/v3-pool/swaps?from_time=123",
+    "/api/v1/uniswap/v3-pool/swaps?from_block=123&to_time=321",
     "/api/v1/uniswap/v3-pool/swaps?contract_address=0x123",
     "/api/v1/uniswap/v3-pool/swaps",
 ]
@@ -89,7 +421,7 @@ FAILURE_RESPONSE_PARAMETERS = [
 @patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
 def test_get_swaps_without_arguments(db, uri):
     # Mock the db response
-    db().swaps.find().allow_disk_use().sort().skip().to_list = CoroutineMock(
+    db().swaps.find().sort().to_list = CoroutineMock(
         return_value=10 * [MOCKED_SWAP_EVENT]
     )
     db().swaps.count_documents = CoroutineMock(return_value=100)
@@ -98,3 +430,222 @@ def test_get_swaps_without_arguments(db, uri):
 
     # Should return 400 - Bad Request
     assert response.status_code == 400
+
+
+class MockedCursor:
+    def __init__(self, documents):
+        self.__documents = list(documents)
+
+    async def to_list(self, length):
+        batch = self.__documents[:length]
+        self.__documents = self.__documents[length:]
+        return batch
+
+
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_export_swaps_ndjson(db):
+    # Mock the db cursor
+    db().swaps.find().sort.return_value = MockedCursor(
+        [MOCKED_SWAP_EVENT, MOCKED_COMPACT_SWAP_EVENT, MOCKED_SWAP_EVENT]
+    )
+
+    cursor = encode_cursor(123, 4)
+    response = client.get(
+        "/api/v1/uniswap/v3-pool/swaps/export"
+        f"?from_block=123&to_block=321&contract_address=0x123&cursor={cursor}"
+    )
+
+    # Should stream the flattened swaps as json lines
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 3
+    assert rows[0]["swap_price_0"] == 123456789
+    assert rows[0]["gas_price_quote_currency"] == "SGD"
+    assert rows[0]["cursor"] == encode_cursor(123456, 12)
+    assert rows[1] == rows[0]
+
+    # Should resume past the cursor
+    db().swaps.find.assert_called_with(
+        {
+            "event_id": "uniswap-v3-pool-swap",
+            "block_number": {"$gte": 123, "$lte": 321},
+            "address": "0x123",
+            **after_cursor(cursor),
+        },
+        batch_size=5000,
+    )
+
+
+@patch(
+    "src.routers.v1.endpoints.uniswap.v3_pool.get_layout",
+    CoroutineMock(return_value="timeseries"),
+)
+@patch(
+    "src.routers.v1.endpoints.uniswap.v3_pool.swaps_block_times.bound",
+    CoroutineMock(return_value=(None, 120)),
+)
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_export_swaps_in_timeseries_layout(db):
+    # Mock the db cursor
+    db().swaps.find().allow_disk_use().sort.return_value = MockedCursor(
+        [MOCKED_SWAP_EVENT]
+    )
+
+    response = client.get(
+        "/api/v1/uniswap/v3-pool/swaps/export?from_block=123&to_block=321"
+    )
+
+    # Should stream the same swaps, also matching their series and time bounds
+    assert len(response.text.splitlines()) == 1
+    db().swaps.find.assert_called_with(
+        {
+            "event_id": "uniswap-v3-pool-swap",
+            "block_number": {"$gte": 123, "$lte": 321},
+            "meta.event_id": "uniswap-v3-pool-swap",
+            "time": {"$lte": datetime(1970, 1, 1, 0, 2, tzinfo=timezone.utc)},
+        },
+        batch_size=5000,
+    )
+    db().swaps.find().allow_disk_use.assert_called_with(True)
+
+
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_export_swaps_csv(db):
+    # Mock the db cursor
+    db().swaps.find().sort.return_value = MockedCursor(3 * [MOCKED_SWAP_EVENT])
+
+    response = client.get(
+        "/api/v1/uniswap/v3-pool/swaps/export?from_block=123&to_block=321&format=csv"
+    )
+
+    # Should stream the header and the rows
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    lines = response.text.splitlines()
+    assert len(lines) == 4
+    assert lines[0].startswith("transaction_hash,log_index,block_number,")
+    assert lines[1].startswith("0x123456,12,123456,")
+
+
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_export_swaps_parquet(db):
+    # Mock the db cursor
+    db().swaps.find().sort.return_value = MockedCursor(3 * [MOCKED_SWAP_EVENT])
+
+    response = client.get(
+        "/api/v1/uniswap/v3-pool/swaps/export"
+        "?from_block=123&to_block=321&format=parquet"
+    )
+
+    # Should stream a parquet file with the large integers typed
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+
+    table = pq.read_table(pa.BufferReader(response.content))
+    assert table.num_rows == 3
+    assert table.schema.field("swap_price_0").type == pa.decimal256(76, 0)
+    assert table.column("swap_price_0").to_pylist() == 3 * [Decimal(123456789)]
+
+
+EXPORT_FAILURE_RESPONSE_PARAMETERS = [
+    "/api/v1/uniswap/v3-pool/swaps/export?from_block=123",
+    "/api/v1/uniswap/v3-pool/swaps/export?to_block=321",
+    "/api/v1/uniswap/v3-pool/swaps/export?from_block=123&to_block=321&format=xml",
+    "/api/v1/uniswap/v3-pool/swaps/export?from_block=123&to_block=321&cursor=invalid",
+]
+
+
+@pytest.mark.parametrize("uri", EXPORT_FAILURE_RESPONSE_PARAMETERS)
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_export_swaps_bad_request(db, uri):
+    response = client.get(uri)
+
+    # Should return 400 - Bad Request
+    assert response.status_code == 400
+
+
+def d(value):
+    return Decimal128(str(value))
+
+
+MOCKED_CANDLE = {
+    "address": "0x123",
+    "granularity": "1m",
+    "bucket": 60,
+    "symbol_0": "USDC",
+    "symbol_1": "WETH",
+    "open": {"sequence": 1, "price_0": d(10), "price_1": d(1)},
+    "close": {"sequence": 3, "price_0": d(30), "price_1": d(3)},
+    "high_0": d(40),
+    "high_1": d(4),
+    "low_0": d(5),
+    "low_1": d(10**25),
+    "volume_0": d(600),
+    "volume_1": d(1200),
+    "count": 3,
+}
+
+
+PARSED_MOCKED_CANDLE = {
+    "address": "0x123",
+    "granularity": "1m",
+    "bucket": 60,
+    "symbol_0": "USDC",
+    "symbol_1": "WETH",
+    "open_0": 10,
+    "open_1": 1,
+    "high_0": 40,
+    "high_1": 4,
+    "low_0": 5,
+    "low_1": 10**25,
+    "close_0": 30,
+    "close_1": 3,
+    "volume_0": 600,
+    "volume_1": 1200,
+    "count": 3,
+}
+
+
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_get_candles(db):
+    db().swap_candles.find().sort().to_list = CoroutineMock(
+        return_value=5 * [MOCKED_CANDLE]
+    )
+
+    response = client.get(
+        "/api/v1/uniswap/v3-pool/candles"
+        "?contract_address=0x123&from_time=0&to_time=3600&granularity=1m"
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"data": 5 * [PARSED_MOCKED_CANDLE], "count": 5}
+
+    # Should read the pre-aggregated candles of the range
+    db().swap_candles.find.assert_called_with(
+        {
+            "address": "0x123",
+            "granularity": "1m",
+            "bucket": {"$gte": 0, "$lte": 3600},
+        }
+    )
+
+
+CANDLES_FAILURE_RESPONSE_PARAMETERS = [
+    "/api/v1/uniswap/v3-pool/candles?from_time=0&to_time=3600",
+    "/api/v1/uniswap/v3-pool/candles?contract_address=0x123&to_time=3600",
+    "/api/v1/uniswap/v3-pool/candles?contract_address=0x123&from_time=0",
+    "/api/v1/uniswap/v3-pool/candles"
+    "?contract_address=0x123&from_time=0&to_time=3600&granularity=2m",
+]
+
+
+@pytest.mark.parametrize("uri", CANDLES_FAILURE_RESPONSE_PARAMETERS)
+@patch("src.routers.v1.endpoints.uniswap.v3_pool.MongoDBClient")
+def test_get_candles_bad_request(db, uri):
+    response = client.get(uri)
+
+    # Should return 400 - Bad Request
+    assert response.status_code == 400
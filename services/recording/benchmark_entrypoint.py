@@ -0,0 +1,80 @@
+# Standard libraries
+import argparse
+import json
+
+# 3rd party libraries
+from dotenv import load_dotenv
+
+# Code
+from src.lib.logger import RecordingLogger
+from src.sinks import SinkBenchmark
+from src.storage import STORAGE_LAYOUTS, WRITE_MODES, MongoClientFactory
+
+
+def parse_write_concern(value: str):
+    """Parses the write concern's acknowledgements or tag, e.g., 1 or "majority"."""
+    return int(value) if value.isdigit() else value
+
+
+def parse_boolean(value: str) -> bool:
+    """Parses a "true" or "false" flag."""
+    if value not in ("true", "false"):
+        raise argparse.ArgumentTypeError('must be "true" or "false"')
+
+    return value == "true"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmarks the write throughput of the database sink under every "
+            "combination of the write settings, in a scratch database."
+        )
+    )
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument(
+        "--write-concerns", nargs="+", type=parse_write_concern, default=[1, "majority"]
+    )
+    parser.add_argument(
+        "--journal", nargs="+", type=parse_boolean, default=[False, True]
+    )
+    parser.add_argument(
+        "--ordered", nargs="+", type=parse_boolean, default=[False, True]
+    )
+    parser.add_argument(
+        "--batch-sizes", nargs="+", type=int, default=[1, 100, 1000, 5000]
+    )
+    parser.add_argument("--write-mode", choices=WRITE_MODES, default="insert")
+    parser.add_argument(
+        "--storage-layout", choices=STORAGE_LAYOUTS, default="documents"
+    )
+    parser.add_argument(
+        "--database",
+        help='The scratch database to drop and write into, "<DB_DATABASE>_benchmark" '
+        "by default.",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    database = MongoClientFactory.get_database()
+    scratch_name = args.database or f"{database.name}_benchmark"
+    if scratch_name == database.name:
+        raise ValueError("The benchmark must not drop the recorded events' database")
+
+    logger = RecordingLogger("BenchmarkLogger")
+    benchmark = SinkBenchmark(
+        logger, database.client[scratch_name], args.write_mode, args.storage_layout
+    )
+    combinations = SinkBenchmark.get_combinations(
+        args.write_concerns, args.journal, args.ordered, args.batch_sizes
+    )
+
+    try:
+        results = benchmark.run_synchronously(args.records, combinations)
+    finally:
+        MongoClientFactory.close()
+
+    # Fastest first
+    results.sort(key=lambda result: -result["records_per_second"])
+    print(json.dumps(results, indent=4))
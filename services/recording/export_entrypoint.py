@@ -0,0 +1,40 @@
+# Standard libraries
+import argparse
+
+# 3rd party libraries
+from dotenv import load_dotenv
+
+# Code
+from src.export import EventsExporter
+from src.export.exporter import EXPORT_FORMATS
+from src.lib.logger import RecordingLogger
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Exports recorded events into an Arrow IPC stream or Parquet file."
+    )
+    parser.add_argument("output_path", help="The path of the file to write.")
+    parser.add_argument("--event-id", default="uniswap-v3-pool-swap")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="parquet")
+    parser.add_argument("--from-block", type=int)
+    parser.add_argument("--to-block", type=int)
+    parser.add_argument("--from-time", type=int)
+    parser.add_argument("--to-time", type=int)
+    parser.add_argument("--contract-address")
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    logger = RecordingLogger("ExportLogger")
+    exporter = EventsExporter(logger)
+    exporter.export_synchronously(
+        args.event_id,
+        args.output_path,
+        args.format,
+        from_block=args.from_block,
+        to_block=args.to_block,
+        from_time=args.from_time,
+        to_time=args.to_time,
+        contract_address=args.contract_address,
+    )
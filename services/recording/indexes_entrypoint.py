@@ -0,0 +1,47 @@
+# Standard libraries
+import argparse
+import json
+
+# 3rd party libraries
+from dotenv import load_dotenv
+
+# Code
+from src.lib.logger import RecordingLogger
+from src.storage import STORAGE_LAYOUTS, IndexManager
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Manages the indexes of the recorded events' collections."
+    )
+    parser.add_argument(
+        "command",
+        choices=["ensure", "explain", "stats"],
+        help=(
+            "ensure: creates the managed indexes and drops the unmanaged ones. "
+            "explain: prints the query plans of the endpoints' query shapes. "
+            "stats: prints the collection and index sizes."
+        ),
+    )
+    parser.add_argument(
+        "--storage-layout",
+        choices=STORAGE_LAYOUTS,
+        default="documents",
+        help=(
+            "timeseries: creates the missing event collections as time-series "
+            "collections when ensuring the indexes."
+        ),
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    logger = RecordingLogger("IndexesLogger")
+    manager = IndexManager(logger, args.storage_layout)
+
+    if args.command == "ensure":
+        manager.ensure_synchronously()
+    elif args.command == "explain":
+        print(json.dumps(manager.explain_synchronously(), indent=4))
+    else:
+        print(json.dumps(manager.stats_synchronously(), indent=4))
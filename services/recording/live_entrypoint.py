@@ -5,6 +5,7 @@ import yaml
 # Code
 from src.lib.logger import RecordingLogger
 from src.live.stream import Stream
+from src.storage import MongoClientFactory
 
 
 if __name__ == "__main__":
@@ -14,5 +15,9 @@ if __name__ == "__main__":
     load_dotenv()
 
     logger = RecordingLogger("LiveRecordingLogger")
-    stream = Stream(logger, config)
-    stream.start_synchronously()
+
+    try:
+        stream = Stream(logger, config)
+        stream.start_synchronously()
+    finally:
+        MongoClientFactory.close()
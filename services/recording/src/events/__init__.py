@@ -1,2 +1,4 @@
 from .handlers.base import BaseEventHandler
+from .record import EventRecord
 from .resolver import EventsResolver
+from .types import ProcessedLog
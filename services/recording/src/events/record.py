@@ -0,0 +1,134 @@
+# Code
+from .types import ProcessedLog
+
+
+class EventRecord:
+    """
+    Compact record of a processed event log passed between the pipeline stages.
+
+    Large integers are kept as native integers and the record is only
+    converted into its document form at the writer's boundary.
+    """
+
+    __slots__ = (
+        "event_id",
+        "transaction_hash",
+        "log_index",
+        "block_number",
+        "timestamp",
+        "gas_used",
+        "gas_price_wei",
+        "gas_price_quote_value",
+        "quote_currency",
+        "address",
+        "topics",
+        "raw_data",
+        "data",
+    )
+
+    event_id: str
+    transaction_hash: str
+    log_index: int
+    block_number: int
+    timestamp: int
+    gas_used: int
+    gas_price_wei: int
+    gas_price_quote_value: int
+    quote_currency: str
+    address: str
+    topics: list[str]
+    raw_data: str
+    data: dict[str, str]
+
+    def __init__(
+        self,
+        event_id: str,
+        transaction_hash: str,
+        log_index: int,
+        block_number: int,
+        timestamp: int,
+        gas_used: int,
+        gas_price_wei: int,
+        gas_price_quote_value: int,
+        quote_currency: str,
+        address: str,
+        topics: list[str],
+        raw_data: str,
+        data: dict[str, str],
+    ):
+        self.event_id = event_id
+        self.transaction_hash = transaction_hash
+        self.log_index = log_index
+        self.block_number = block_number
+        self.timestamp = timestamp
+        self.gas_used = gas_used
+        self.gas_price_wei = gas_price_wei
+        self.gas_price_quote_value = gas_price_quote_value
+        self.quote_currency = quote_currency
+        self.address = address
+        self.topics = topics
+        self.raw_data = raw_data
+        self.data = data
+
+    def __repr__(self):
+        return f"EventRecord({self.event_id}: {self.key})"
+
+    @property
+    def key(self) -> str:
+        """
+        Returns:
+            The unique key of the event (transaction hash and log index).
+        """
+        return f"{self.transaction_hash}-{self.log_index}"
+
+    def to_document(self) -> ProcessedLog:
+        """
+        Converts the record into the document to be written into the database.
+
+        Returns:
+            The processed log document.
+        """
+        return ProcessedLog(
+            event_id=self.event_id,
+            transaction_hash=self.transaction_hash,
+            log_index=self.log_index,
+            block_number=self.block_number,
+            timestamp=self.timestamp,
+            gas_used=str(self.gas_used),
+            gas_price_wei=str(self.gas_price_wei),
+            gas_price_quote={
+                "currency": self.quote_currency,
+                "value": str(self.gas_price_quote_value),
+            },
+            address=self.address,
+            topics=self.topics,
+            raw_data=self.raw_data,
+            data=self.data,
+        )
+
+    @classmethod
+    def from_document(cls, document: ProcessedLog) -> "EventRecord":
+        """
+        Converts a document back into the record, e.g., when read back from a spool.
+
+        Args:
+            document: The processed log document.
+
+        Returns:
+            The event record.
+        """
+        return cls(
+            event_id=document["event_id"],
+            transaction_hash=document["transaction_hash"],
+            log_index=document["log_index"],
+            block_number=document["block_number"],
+            timestamp=document["timestamp"],
+            gas_used=int(document["gas_used"]),
+            gas_price_wei=int(document["gas_price_wei"]),
+            gas_price_quote_value=int(document["gas_price_quote"]["value"]),
+            quote_currency=document["gas_price_quote"]["currency"],
+            address=document["address"],
+            topics=document["topics"],
+            raw_data=document["raw_data"],
+            data=document["data"],
+        )
@@ -0,0 +1,2 @@
+from .exporter import EventsExporter
+from .schemas import ExportSchemaResolver
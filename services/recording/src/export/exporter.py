@@ -0,0 +1,243 @@
+# Standard libraries
+from typing import Any, Optional
+import asyncio
+
+# 3rd party libraries
+from motor.motor_asyncio import AsyncIOMotorDatabase
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Code
+from src.events import EventsResolver, ProcessedLog
+from src.lib.logger import RecordingLogger
+from src.storage import (
+    DatabaseConfig,
+    DocumentSchema,
+    MongoClientFactory,
+    TimeSeriesWriter,
+)
+from .schemas import BASE_FIELDS, INT256_DECIMAL, ExportSchemaResolver
+
+# Constants
+EXPORT_BATCH_SIZE = 5000
+EXPORT_FORMATS = ("arrow", "parquet")
+
+
+class EventsExporter:
+    """
+    Exports recorded events into Arrow IPC stream or Parquet files,
+    reading the database cursor in record batches such that
+    memory is bounded by a batch regardless of the range.
+    """
+
+    __logger: RecordingLogger
+    __database: AsyncIOMotorDatabase
+
+    def __init__(
+        self, logger: RecordingLogger, database_config: Optional[DatabaseConfig] = None
+    ):
+        self.__logger = logger
+        self.__database = MongoClientFactory.get_database(database_config)
+
+    def export_synchronously(self, event_id: str, output_path: str, fmt: str, **kwargs):
+        """
+        Exports synchronously.
+
+        Args:
+            event_id: The id of the events to export.
+            output_path: The path of the file to write.
+            fmt: Either "arrow" or "parquet".
+            kwargs: The range and filters, see `get_query`.
+
+        Returns:
+            The number of events exported.
+        """
+        loop = asyncio.get_event_loop()
+        return loop.run_until_complete(
+            self.export_asynchronously(event_id, output_path, fmt, **kwargs)
+        )
+
+    async def export_asynchronously(
+        self,
+        event_id: str,
+        output_path: str,
+        fmt: str,
+        from_block: Optional[int] = None,
+        to_block: Optional[int] = None,
+        from_time: Optional[int] = None,
+        to_time: Optional[int] = None,
+        contract_address: Optional[str] = None,
+    ) -> int:
+        """
+        Exports asynchronously.
+
+        Args:
+            event_id: The id of the events to export.
+            output_path: The path of the file to write.
+            fmt: Either "arrow" or "parquet".
+            from_block: The smallest block number to export events from.
+            to_block: The largest block number to export events from.
+            from_time: The smallest timestamp to export events from.
+            to_time: The largest timestamp to export events from.
+            contract_address: The address to filter the events by.
+
+        Raises:
+            ValueError: If the event, format, or range is not valid.
+
+        Returns:
+            The number of events exported.
+        """
+        schema = ExportSchemaResolver.get_schema(event_id)
+        data_fields = [field for field in schema if field not in BASE_FIELDS]
+        category = EventsResolver.get_category(event_id)
+        query = self.get_query(
+            event_id, from_block, to_block, from_time, to_time, contract_address
+        )
+
+        # Only unpack the buckets of the series and time range in the time-series
+        # layout, where the events order is not indexed and sorted in memory instead
+        is_timeseries = await TimeSeriesWriter.is_timeseries(self.__database, category)
+        if is_timeseries:
+            query = TimeSeriesWriter.to_series_query(query)
+
+        cursor = self.__database[category].find(query, batch_size=EXPORT_BATCH_SIZE)
+        if is_timeseries:
+            cursor = cursor.allow_disk_use(True)
+        cursor = cursor.sort([("block_number", 1), ("log_index", 1)])
+
+        writer = self.__get_writer(output_path, schema, fmt)
+        exported = 0
+
+        try:
+            while documents := await cursor.to_list(EXPORT_BATCH_SIZE):
+                rows = [
+                    self.flatten(DocumentSchema.decode(document), data_fields)
+                    for document in documents
+                ]
+                batch = pa.RecordBatch.from_pylist(rows, schema=schema)
+                writer.write_table(pa.Table.from_batches([batch]))
+
+                exported += len(documents)
+                self.__logger.info(f"Exported {exported} events to {output_path}")
+
+        finally:
+            writer.close()
+
+        return exported
+
+    @staticmethod
+    def get_query(
+        event_id: str,
+        from_block: Optional[int] = None,
+        to_block: Optional[int] = None,
+        from_time: Optional[int] = None,
+        to_time: Optional[int] = None,
+        contract_address: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """
+        Builds the query of the events in a block or time range.
+
+        Args:
+            event_id: The id of the events to export.
+            from_block: The smallest block number to export events from.
+            to_block: The largest block number to export events from.
+            from_time: The smallest timestamp to export events from.
+            to_time: The largest timestamp to export events from.
+            contract_address: The address to filter the events by.
+
+        Raises:
+            ValueError: If neither a complete block range nor time range is given.
+
+        Returns:
+            The query for the events.
+        """
+        query: dict[str, Any] = {"event_id": event_id}
+
+        if from_block is not None and to_block is not None:
+            query["block_number"] = {"$gte": from_block, "$lte": to_block}
+
+        elif from_time is not None and to_time is not None:
+            query["timestamp"] = {"$gte": from_time, "$lte": to_time}
+
+        else:
+            raise ValueError(
+                'Export needs either both "from_block" & "to_block" '
+                'or both "from_time" & "to_time".'
+            )
+
+        if contract_address:
+            query["address"] = contract_address
+
+        return query
+
+    @staticmethod
+    def flatten(document: ProcessedLog, data_fields: list[pa.Field]) -> dict[str, Any]:
+        """
+        Flattens an event document into a row of the schema,
+        restoring the integers stored as strings.
+
+        Args:
+            document: The event document.
+            data_fields: The data columns of the event's export schema.
+
+        Raises:
+            ValueError: If an integer has more digits than the decimal columns.
+
+        Returns:
+            The flat row.
+        """
+        row: dict[str, Any] = {
+            "transaction_hash": document["transaction_hash"],
+            "log_index": document["log_index"],
+            "block_number": document["block_number"],
+            "timestamp": document["timestamp"],
+            "address": document["address"],
+            "gas_used": int(document["gas_used"]),
+            "gas_price_wei": int(document["gas_price_wei"]),
+            "gas_price_quote_currency": document["gas_price_quote"]["currency"],
+            "gas_price_quote_value": int(document["gas_price_quote"]["value"]),
+        }
+
+        for field in data_fields:
+            value = document["data"][field.name]
+            row[field.name] = value if pa.types.is_string(field.type) else int(value)
+
+        # Name the event rather than failing the conversion of the whole batch
+        for name, value in row.items():
+            digits = len(str(abs(value))) if isinstance(value, int) else 0
+            if digits > INT256_DECIMAL.precision:
+                key = f'{document["transaction_hash"]}-{document["log_index"]}'
+                raise ValueError(
+                    f'Event "{key}" has "{name}" of {digits} digits, beyond the '
+                    f"{INT256_DECIMAL.precision} digits of the export schema."
+                )
+
+        return row
+
+    # ---------
+    # Helpers
+    # ---------
+
+    @staticmethod
+    def __get_writer(output_path: str, schema: pa.Schema, fmt: str) -> Any:
+        """
+        Opens the file writer of the format.
+
+        Args:
+            output_path: The path of the file to write.
+            schema: The export schema of the event.
+            fmt: Either "arrow" or "parquet".
+
+        Raises:
+            ValueError: If the format is not recognizable.
+
+        Returns:
+            The record batch writer.
+        """
+        if fmt == "arrow":
+            return pa.ipc.new_stream(output_path, schema)
+
+        if fmt == "parquet":
+            return pq.ParquetWriter(output_path, schema)
+
+        raise ValueError(f'Export format "{fmt}" is not recognizable.')
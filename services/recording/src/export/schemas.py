@@ -0,0 +1,60 @@
+# 3rd party libraries
+import pyarrow as pa
+
+# Constants
+# The signed and unsigned 256-bit integers need up to 78 digits, but decimal256
+# caps the precision at 76, which still covers any realistic token amount or price.
+# Exports fail naming the event of any value beyond it.
+INT256_DECIMAL = pa.decimal256(76, 0)
+
+# The columns common to all events, read from the top level of the documents
+BASE_FIELDS: list[pa.Field] = [
+    pa.field("transaction_hash", pa.string()),
+    pa.field("log_index", pa.int64()),
+    pa.field("block_number", pa.int64()),
+    pa.field("timestamp", pa.int64()),
+    pa.field("address", pa.string()),
+    pa.field("gas_used", pa.uint64()),
+    pa.field("gas_price_wei", pa.uint64()),
+    pa.field("gas_price_quote_currency", pa.string()),
+    pa.field("gas_price_quote_value", INT256_DECIMAL),
+]
+
+# The columns specific to each event, read from the handled data of the documents
+_EVENT_DATA_FIELDS_MAPPING: dict[str, list[pa.Field]] = {
+    "uniswap-v3-pool-swap": [
+        pa.field("sender", pa.string()),
+        pa.field("recipient", pa.string()),
+        pa.field("symbol_0", pa.string()),
+        pa.field("symbol_1", pa.string()),
+        pa.field("amount_0", INT256_DECIMAL),
+        pa.field("amount_1", INT256_DECIMAL),
+        pa.field("swap_price_0", INT256_DECIMAL),
+        pa.field("swap_price_1", INT256_DECIMAL),
+    ]
+}
+
+
+class ExportSchemaResolver:
+    """
+    Static class to resolve the typed export schema of an event.
+    """
+
+    @staticmethod
+    def get_schema(event_id: str) -> pa.Schema:
+        """
+        Args:
+            event_id: The id of the event to get the schema for.
+
+        Raises:
+            ValueError: If the event has no export schema.
+
+        Returns:
+            The schema of the base columns followed by the event's data columns.
+        """
+        data_fields = _EVENT_DATA_FIELDS_MAPPING.get(event_id)
+
+        if data_fields is None:
+            raise ValueError(f'Event "{event_id}" has no export schema.')
+
+        return pa.schema(BASE_FIELDS + data_fields)
@@ -3,6 +3,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Code
+from src.storage import MongoClientFactory
+from .coverage.router import coverage_router
 from .tasks.router import task_router
 
 
@@ -16,3 +18,12 @@ app.add_middleware(
 )
 
 app.include_router(task_router, prefix="/api/rpc/v1/tasks")
+app.include_router(coverage_router, prefix="/api/rpc/v1/coverage")
+
+
+@app.on_event("shutdown")
+def close_database_clients() -> None:
+    """
+    Closes the database clients shared by the requests.
+    """
+    MongoClientFactory.close()
@@ -0,0 +1,10 @@
+# 3rd party libraries
+from pydantic import BaseModel
+
+
+class MissingRangesResult(BaseModel):
+    event_id: str
+    contract_address: str
+    from_block: int
+    to_block: int
+    missing_ranges: list[tuple[int, int]]
@@ -0,0 +1,67 @@
+# Standard libraries
+from typing import Any
+
+# 3rd party libraries
+from fastapi import APIRouter, HTTPException
+
+# Code
+from src.storage import CoverageLedger, MongoClientFactory
+from .models import MissingRangesResult
+
+coverage_router = APIRouter()
+
+
+@coverage_router.get(
+    "/get_missing_ranges",
+    summary="Get the Block Ranges Not Recorded Yet",
+    response_model=MissingRangesResult,
+)
+async def get_missing_ranges(
+    event_id: str, contract_address: str, from_block: int, to_block: int
+) -> dict[str, Any]:
+    """
+    **Gets the sub-ranges of a block range whose events are not recorded yet**,
+    neither by the historical tasks nor by the live stream.
+
+    <u>Query parameters</u>:\n
+    - **event_id**: The identifier of the event. (e.g., "uniswap-v3-pool-swap")
+    - **contract_address**: The address of the contract emitting the events.
+    - **from_block**: The first block of the range.
+    - **to_block**: The last block of the range.
+
+    <u>Returns **400 - Bad Request** if</u>:
+    - **from_block** > **to_block**.
+    - Either of **from_block** or **to_block** < 0.
+    - Either of **event_id** or **contract_address** is an empty string.
+
+    \f
+    Args:
+        event_id: The event id to lookup.
+        contract_address: The contract address to lookup.
+        from_block: The first block of the range.
+        to_block: The last block of the range.
+
+    Returns:
+        The response dictionary of the range and its missing sub-ranges, in order.
+    """
+    if not contract_address or not event_id or from_block < 0 or to_block < 0:
+        raise HTTPException(status_code=400, detail="Request parameters incomplete")
+
+    # Bad request if from_block greater than to block
+    if from_block > to_block:
+        raise HTTPException(
+            status_code=400, detail='"from_block" must be smaller than "to_block"'
+        )
+
+    ledger = CoverageLedger(MongoClientFactory.get_database())
+    missing_ranges = await ledger.get_missing(
+        event_id, contract_address, from_block, to_block
+    )
+
+    return {
+        "event_id": event_id,
+        "contract_address": contract_address,
+        "from_block": from_block,
+        "to_block": to_block,
+        "missing_ranges": missing_ranges,
+    }
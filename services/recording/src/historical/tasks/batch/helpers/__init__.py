@@ -1,4 +1,5 @@
-from .types import EventLog, ProcessedLog
+from .types import EventLog
+from .columns import EventLogBatch
 from .loader import BatchLoader
 from .processor import BatchProcessor
 from .writer import BatchWriter
@@ -0,0 +1,55 @@
+# Standard libraries
+from array import array
+
+# Code
+from .types import EventLog
+
+
+class EventLogBatch:
+    """
+    Columnar batch of event logs, with the hexadecimal fields
+    decoded once into parallel arrays when the batch is loaded.
+    """
+
+    __slots__ = (
+        "event_logs",
+        "block_numbers",
+        "timestamps",
+        "gas_used",
+        "gas_prices",
+        "log_indexes",
+    )
+
+    event_logs: list[EventLog]
+    block_numbers: "array[int]"
+    timestamps: "array[int]"
+    gas_used: "array[int]"
+    gas_prices: "array[int]"
+    log_indexes: "array[int]"
+
+    def __init__(self, event_logs: list[EventLog]):
+        self.event_logs = event_logs
+        self.block_numbers = self.__decode([log["blockNumber"] for log in event_logs])
+        self.timestamps = self.__decode([log["timeStamp"] for log in event_logs])
+        self.gas_used = self.__decode([log["gasUsed"] for log in event_logs])
+        self.gas_prices = self.__decode([log["gasPrice"] for log in event_logs])
+        self.log_indexes = self.__decode([log["logIndex"] for log in event_logs])
+
+    def __len__(self) -> int:
+        return len(self.event_logs)
+
+    def __repr__(self):
+        return f"EventLogBatch({len(self)} event logs)"
+
+    @staticmethod
+    def __decode(hex_values: list[str]) -> "array[int]":
+        """
+        Decodes a column of hexadecimal strings into an unsigned 64-bit array.
+
+        Args:
+            hex_values: The hexadecimal strings to decode.
+
+        Returns:
+            The array of the decoded integers.
+        """
+        return array("Q", [int(value, 16) for value in hex_values])
@@ -0,0 +1,79 @@
+# Standard libraries
+import hashlib
+
+# Code
+from src.events import EventRecord
+
+# Constants
+# Comfortably more than the blocks of a batch, as repeats only cross adjacent batches
+SEEN_HORIZON_BLOCKS = 256
+SEEN_DIGEST_BYTES = 8
+
+
+class SeenRecords:
+    """
+    Bounded set of the records seen by a task, to drop the repeats in-flight
+    before they are written (e.g., of overlapping or repeated block ranges).
+
+    Keys are kept as 8-byte digests by their block, and the blocks further
+    behind the latest seen than the horizon are evicted, such that memory
+    is bounded by the events of the horizon rather than of the whole range.
+    Records older than the horizon are let through, as writing is idempotent.
+    """
+
+    __horizon_blocks: int
+    __blocks: dict[int, set[int]]
+    __latest_block: int
+
+    def __init__(self, horizon_blocks: int = SEEN_HORIZON_BLOCKS):
+        self.__horizon_blocks = horizon_blocks
+        self.__blocks = dict()
+        self.__latest_block = -1
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            The number of keys kept.
+        """
+        return sum(len(digests) for digests in self.__blocks.values())
+
+    def filter(self, records: list[EventRecord]) -> list[EventRecord]:
+        """
+        Filters out the records seen before, remembering the others.
+
+        Args:
+            records: The records to filter.
+
+        Returns:
+            The records not seen before, in order.
+        """
+        unseen = []
+
+        for record in records:
+            digests = self.__blocks.setdefault(record.block_number, set())
+            digest = self.get_digest(record.key)
+
+            if digest in digests:
+                continue
+
+            digests.add(digest)
+            unseen.append(record)
+            self.__latest_block = max(self.__latest_block, record.block_number)
+
+        horizon = self.__latest_block - self.__horizon_blocks
+        for block_number in [n for n in self.__blocks if n < horizon]:
+            del self.__blocks[block_number]
+
+        return unseen
+
+    @staticmethod
+    def get_digest(key: str) -> int:
+        """
+        Args:
+            key: The unique key of a record.
+
+        Returns:
+            The compact digest of the key.
+        """
+        digest = hashlib.blake2b(key.encode(), digest_size=SEEN_DIGEST_BYTES).digest()
+        return int.from_bytes(digest, "big")
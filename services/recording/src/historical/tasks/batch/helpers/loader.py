@@ -6,8 +6,13 @@ import aiohttp
 
 # Code
 from src.lib.logger import RecordingLogger
+from .columns import EventLogBatch
 from .types import EventLog
 
+# Constants
+# EtherScan truncates the event logs of a request beyond this many
+ETHERSCAN_MAX_RESULTS = 1000
+
 
 class BatchLoader:
     """
@@ -23,7 +28,7 @@ class BatchLoader:
 
     async def start_loading(
         self,
-        output_queue: asyncio.Queue[list[EventLog]],
+        output_queue: asyncio.Queue[EventLogBatch],
         contract_address: str,
         event_topic: str,
         from_block: int,
@@ -31,7 +36,8 @@ class BatchLoader:
         blocks_per_batch: int,
     ) -> None:
         """
-        Loads data from EtherScan and puts the results into the output queue.
+        Loads data from EtherScan and puts the results into the output queue,
+        one batch per block range requested.
 
         Args:
             output_queue: The output queue to put the results into.
@@ -40,37 +46,97 @@ class BatchLoader:
             from_block: The first block the fetch for.
             to_block: The last block to fetch for.
             blocks_per_batch: The number of blocks to fetch per request.
+
+        Raises:
+            ValueError: If a single block has more event logs than EtherScan returns.
         """
         self.__logger.info("Loader starting...")
 
         async with aiohttp.ClientSession() as session:
             for i in range(from_block, to_block + 1, blocks_per_batch):
+                # The block range is inclusive, so end before the next batch's
+                last_block = min(i + blocks_per_batch - 1, to_block)
 
-                self.__logger.info(
-                    f"Fetching event logs from block {i} to {i + blocks_per_batch}"
-                )
-
-                uri: str = (
-                    "https://api.etherscan.io/api?module=logs&action=getLogs"
-                    f"&apikey={self.__api_key}&address={contract_address}"
-                    f"&topic0={event_topic}"
-                    f"&fromBlock={i}&toBlock={i + blocks_per_batch}"
+                result = await self.__fetch(
+                    session, contract_address, event_topic, i, last_block
                 )
 
-                response = await session.get(uri)
-                data = await response.json()
-                result = data["result"]
-
                 # Skip if empty
                 if not result:
                     continue
 
-                # Put the non empty results list into the queue
-                await output_queue.put(result)
+                # Decode the non empty results into a batch for the queue
+                await output_queue.put(EventLogBatch(result))
 
                 # Sleep half a second between requests to prevent rate limit
                 # We can remove this if we have $$$ to upgrade our plan lel
                 await asyncio.sleep(0.5)
 
-        # Put an empty list to indicate the end
-        await output_queue.put([])
+        # Put an empty batch to indicate the end
+        await output_queue.put(EventLogBatch([]))
+
+    # ---------
+    # Helpers
+    # ---------
+
+    async def __fetch(
+        self,
+        session: aiohttp.ClientSession,
+        contract_address: str,
+        event_topic: str,
+        from_block: int,
+        to_block: int,
+    ) -> list[EventLog]:
+        """
+        Fetches the event logs of a block range from EtherScan,
+        splitting the range in halves while the results are truncated,
+        such that the whole range is loaded as one batch.
+
+        Args:
+            session: The session to request with.
+            contract_address: The contract address to fetch events for.
+            event_topic: The hashed event topic identifier.
+            from_block: The first block the fetch for.
+            to_block: The last block to fetch for.
+
+        Raises:
+            ValueError: If a single block has more event logs than EtherScan returns.
+
+        Returns:
+            The event logs of the block range, in order.
+        """
+        self.__logger.info(f"Fetching event logs from block {from_block} to {to_block}")
+
+        uri: str = (
+            "https://api.etherscan.io/api?module=logs&action=getLogs"
+            f"&apikey={self.__api_key}&address={contract_address}"
+            f"&topic0={event_topic}"
+            f"&fromBlock={from_block}&toBlock={to_block}"
+        )
+
+        response = await session.get(uri)
+        data = await response.json()
+        result: list[EventLog] = data["result"]
+
+        if len(result) < ETHERSCAN_MAX_RESULTS:
+            return result
+
+        # Fail rather than let the truncated range be recorded as covered
+        if from_block == to_block:
+            raise ValueError(
+                f"Block {from_block} has at least {ETHERSCAN_MAX_RESULTS} event logs, "
+                "more than EtherScan returns."
+            )
+
+        await asyncio.sleep(0.5)
+        middle_block = (from_block + to_block) // 2
+        first_half = await self.__fetch(
+            session, contract_address, event_topic, from_block, middle_block
+        )
+
+        await asyncio.sleep(0.5)
+        second_half = await self.__fetch(
+            session, contract_address, event_topic, middle_block + 1, to_block
+        )
+
+        return first_half + second_half
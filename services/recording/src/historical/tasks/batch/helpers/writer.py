@@ -1,48 +1,65 @@
 # Standard libraries
+from typing import Awaitable, Callable
 import asyncio
 
-# 3rd party libraries
-from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import UpdateOne
-
 # Code
 from src.lib.logger import RecordingLogger
-from .types import ProcessedLog
+from src.events import EventRecord
+from src.sinks import BaseSink
+from .dedupe import SeenRecords
 
 
 class BatchWriter:
     """
-    Writer for writing the processed data batches into the database.
+    Writer for writing the processed data batches into the storage sink,
+    dropping the records already seen by the task before writing them,
+    and optionally those already recorded by earlier runs.
+
+    Checkpoint observers are awaited with the last block of each batch once
+    it is written, as every event up to it is written by then.
     """
 
     __logger: RecordingLogger
-    __host: str
-    __port: str
-    __database_name: str
-    __user: str
-    __password: str
+    __sink: BaseSink
+    __skip_recorded: bool
+    __write_observers: list[Callable[[list[EventRecord]], None]]
+    __checkpoint_observers: list[Callable[[int], Awaitable[None]]]
 
     def __init__(
-        self,
-        logger: RecordingLogger,
-        host: str,
-        port: str,
-        database_name: str,
-        user: str,
-        password: str,
+        self, logger: RecordingLogger, sink: BaseSink, skip_recorded: bool = False
     ):
         self.__logger = logger
-        self.__host = host
-        self.__port = port
-        self.__database_name = database_name
-        self.__user = user
-        self.__password = password
+        self.__sink = sink
+        self.__skip_recorded = skip_recorded
+        self.__write_observers = []
+        self.__checkpoint_observers = []
+
+    def add_write_observer(self, observer: Callable[[list[EventRecord]], None]) -> None:
+        """
+        Adds an observer to be called with the records after they are written.
+
+        Args:
+            observer: The callback taking the list of written records.
+        """
+        self.__write_observers.append(observer)
+
+    def add_checkpoint_observer(
+        self, observer: Callable[[int], Awaitable[None]]
+    ) -> None:
+        """
+        Adds an observer to be awaited with the last block of each batch written.
+
+        Args:
+            observer: The coroutine function taking the last block written.
+        """
+        self.__checkpoint_observers.append(observer)
 
     async def start_writing(
-        self, input_queue: asyncio.Queue[list[ProcessedLog]], category: str
+        self, input_queue: asyncio.Queue[list[EventRecord]], category: str
     ) -> None:
         """
-        Reads from the input queue asynchronously and writing them into the database.
+        Reads from the input queue asynchronously and writing them into the sink,
+        closing the sink once the input ends.
 
         Args:
             input_queue: The queue to read from.
@@ -50,25 +67,35 @@ class BatchWriter:
         """
         self.__logger.info("Writer starting...")
 
-        db_uri = (
-            f"mongodb://{self.__user}:{self.__password}@{self.__host}:{self.__port}"
-        )
-        client = AsyncIOMotorClient(db_uri)
-        collection = client[self.__database_name][category]
+        await self.__sink.open([category])
+        seen = SeenRecords()
+
+        try:
+            while True:
+                records = await input_queue.get()
+
+                # End if empty list
+                if not records:
+                    return
+
+                self.__logger.info(f"Writer got {len(records)} processed events...")
+
+                last_block = max(record.block_number for record in records)
 
-        while True:
-            processed_logs = await input_queue.get()
+                records = seen.filter(records)
+                if self.__skip_recorded:
+                    records = await self.__sink.filter_written(category, records)
 
-            # End if empty list
-            if not processed_logs:
-                return
+                if records:
+                    await self.__sink.write(category, records)
 
-            self.__logger.info(f"Writer got {len(processed_logs)} processed events...")
+                    for observer in self.__write_observers:
+                        observer(records)
+                else:
+                    self.__logger.info("Writer skipped the events written before")
 
-            # Structure the bulk write request
-            bulk_input = []
-            for log in processed_logs:
-                key = {"_id": f'{log["transaction_hash"]}-{log["log_index"]}'}
-                bulk_input.append(UpdateOne(key, {"$set": log}, upsert=True))
+                for checkpoint_observer in self.__checkpoint_observers:
+                    await checkpoint_observer(last_block)
 
-            await collection.bulk_write(bulk_input)
+        finally:
+            await self.__sink.close()
@@ -1,19 +1,27 @@
 # Standard libraries
+from functools import partial
+from typing import Callable, Optional
 import os
 import asyncio
 
+# 3rd party libraries
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
 # Code
 from src.lib.logger import RecordingLogger
-from src.events import EventsResolver
-from .helpers import EventLog, ProcessedLog, BatchLoader, BatchProcessor, BatchWriter
-from .types import BatchConfig, GasPricingConfig
+from src.events import EventRecord, EventsResolver
+from src.pricing import BasePriceSource, PriceSourceResolver
+from src.sinks import SinkResolver
+from src.storage import CoverageLedger, MongoClientFactory
+from .helpers import EventLogBatch, BatchLoader, BatchProcessor, BatchWriter
+from .types import BatchConfig
 
 # Constants
-# We choose 50 blocks per batch to be safe
-# that we will not miss any events since EtherScan
-# does not allow pagination (1000 max per response).
-# This limits it to a cap of about 20 events per block,
+# We choose 50 blocks per batch such that EtherScan,
+# which does not allow pagination (1000 max per response),
+# rarely truncates a batch of about 20 events per block,
 # which is somewhat reasonable, at least for Ethereum's TPB.
+# The truncated batches are loaded again in halves by the loader.
 BLOCKS_PER_BATCH = 50
 
 
@@ -21,18 +29,34 @@ class BatchRecorder:
     """
     Main class that composes the loader, processor, and writer
     to record events in batches from the chain indexer into the database.
+
+    With the coverage ledger, only the block ranges not recorded yet are fetched,
+    and each range is added to the ledger as its batches are written.
     """
 
     __logger: RecordingLogger
     __loader: BatchLoader
+    __price_source: BasePriceSource
     __processor: BatchProcessor
     __writer: BatchWriter
+    __ledger: Optional[CoverageLedger]
+    # The event id, contract address, and block range being recorded
+    __recording: tuple[str, str, int, int]
 
     def __init__(self, logger: RecordingLogger, config: BatchConfig):
         self.__logger = logger
         self.__loader = self.__get_loader(logger)
-        self.__processor = self.__get_processor(logger, config["gas_pricing"])
-        self.__writer = self.__get_writer(logger)
+
+        # The database of the process-wide client shared by the components
+        get_database = partial(MongoClientFactory.get_database, config.get("database"))
+
+        self.__price_source = self.__get_price_source(config, get_database)
+        self.__processor = self.__get_processor(logger, self.__price_source)
+        self.__writer = self.__get_writer(logger, config, get_database)
+        self.__writer.add_write_observer(self.__price_source.observe_records)
+        self.__ledger = self.__get_ledger(config, get_database)
+        if self.__ledger is not None:
+            self.__writer.add_checkpoint_observer(self.__checkpoint_batch)
         self.__rpc_uri = self.__get_rpc_uri()
 
     def record_synchronously(
@@ -66,28 +90,88 @@ class BatchRecorder:
         """
         event_topic = EventsResolver.get_topic(event_id)
         event_category = EventsResolver.get_category(event_id)
+
+        block_ranges = [(from_block, to_block)]
+        if self.__ledger is not None:
+            block_ranges = await self.__ledger.get_missing(
+                event_id, contract_address, from_block, to_block
+            )
+
+        if not block_ranges:
+            self.__logger.info(f"Blocks {from_block} to {to_block} already recorded")
+            return
+
         event_handler = EventsResolver.get_handler(event_id, contract_address)
 
         if event_handler is not None:
             await event_handler.resolve_context_asynchronously(self.__rpc_uri)
 
-        processor_queue = asyncio.Queue[list[EventLog]]()
-        writer_queue = asyncio.Queue[list[ProcessedLog]]()
-
-        await asyncio.gather(
-            self.__loader.start_loading(
-                processor_queue,
+        for range_from_block, range_to_block in block_ranges:
+            self.__logger.info(
+                f"Recording blocks {range_from_block} to {range_to_block}..."
+            )
+            self.__recording = (
+                event_id,
                 contract_address,
-                event_topic,
-                from_block,
-                to_block,
-                BLOCKS_PER_BATCH,
-            ),
-            self.__processor.start_processing(
-                processor_queue, writer_queue, event_id, event_handler
-            ),
-            self.__writer.start_writing(writer_queue, event_category),
-        )
+                range_from_block,
+                range_to_block,
+            )
+
+            processor_queue = asyncio.Queue[EventLogBatch]()
+            writer_queue = asyncio.Queue[list[EventRecord]]()
+
+            await asyncio.gather(
+                self.__loader.start_loading(
+                    processor_queue,
+                    contract_address,
+                    event_topic,
+                    range_from_block,
+                    range_to_block,
+                    BLOCKS_PER_BATCH,
+                ),
+                self.__processor.start_processing(
+                    processor_queue, writer_queue, event_id, event_handler
+                ),
+                self.__writer.start_writing(writer_queue, event_category),
+            )
+
+            # Also the trailing batches without any events
+            await self.__checkpoint(range_to_block)
+
+    # ---------
+    # Helpers
+    # ---------
+
+    async def __checkpoint_batch(self, last_block: int) -> None:
+        """
+        Adds the range up to the end of the batch of the last block written
+        to the ledger, as the batches are loaded in order.
+
+        Args:
+            last_block: The last block written.
+        """
+        _event_id, _address, from_block, _to_block = self.__recording
+        batches = (last_block - from_block) // BLOCKS_PER_BATCH + 1
+
+        await self.__checkpoint(from_block + batches * BLOCKS_PER_BATCH - 1)
+
+    async def __checkpoint(self, last_block: int) -> None:
+        """
+        Adds the range being recorded up to a block to the ledger.
+
+        Args:
+            last_block: The last block recorded of the range.
+        """
+        if self.__ledger is None:
+            return
+
+        event_id, address, from_block, to_block = self.__recording
+        last_block = min(last_block, to_block)
+
+        if not await self.__ledger.add(event_id, address, from_block, last_block):
+            self.__logger.warning(
+                f"Failed to add blocks {from_block} to {last_block} to the ledger"
+            )
 
     # ------------------------
     # Initialization helpers
@@ -113,33 +197,56 @@ class BatchRecorder:
 
         return BatchLoader(logger, etherscan_api_key)
 
+    @staticmethod
+    def __get_price_source(
+        config: BatchConfig,
+        get_database: Callable[[], AsyncIOMotorDatabase],
+    ) -> BasePriceSource:
+        """
+        Initializes the price source to quote the gas prices with.
+
+        Args:
+            config: The config dictionary, with the pricing config.
+            get_database: Gets the database for sources reading recorded events.
+
+        Returns:
+            The price source instance.
+        """
+        return PriceSourceResolver.get_price_source(
+            config["gas_pricing"],
+            get_database,
+            config.get("storage_layout", "documents"),
+        )
+
     @staticmethod
     def __get_processor(
-        logger: RecordingLogger, pricing_config: GasPricingConfig
+        logger: RecordingLogger, price_source: BasePriceSource
     ) -> BatchProcessor:
         """
         Initializes the batch processor.
 
         Args:
             logger: The logger instance to pass into the processor.
-            pricing_config: The pricing config dictionary.
+            price_source: The price source to quote the gas prices with.
 
         Returns:
             The batch processor instance.
         """
-        return BatchProcessor(
-            logger,
-            pricing_config["gas_currency"],
-            pricing_config["quote_currency"],
-        )
+        return BatchProcessor(logger, price_source)
 
     @staticmethod
-    def __get_writer(logger: RecordingLogger) -> BatchWriter:
+    def __get_writer(
+        logger: RecordingLogger,
+        config: BatchConfig,
+        get_database: Callable[[], AsyncIOMotorDatabase],
+    ) -> BatchWriter:
         """
         Initializes the batch writer.
 
         Args:
             logger: The logger instance to pass into the writer.
+            config: The batch config dictionary, for the sink to write into.
+            get_database: Gets the database for the "mongo" sink.
 
         Raises:
             ValueError: When any of the required environment variables is not provided.
@@ -147,20 +254,42 @@ class BatchRecorder:
         Returns:
             The batch writer instance.
         """
-        host = os.environ.get("DB_HOST")
-        port = os.environ.get("DB_PORT")
-        database = os.environ.get("DB_DATABASE")
-        user = os.environ.get("DB_USER")
-        password = os.environ.get("DB_PASSWORD")
-
-        if not all([host, port, database, user, password]):
-            raise ValueError(
-                "Environment variables for the database is incomplete. "
-                'Needs "DB_HOST", "DB_PORT", "DB_DATABASE", '
-                '"DB_USER", and "DB_PASSWORD"'
-            )
+        sink = SinkResolver.get_sink(
+            config.get("sink", {}),
+            get_database,
+            config.get("write_mode", "insert"),
+            config.get("schema_version", 1),
+            config.get("storage_layout", "documents"),
+        )
 
-        return BatchWriter(logger, host, port, database, user, password)
+        return BatchWriter(logger, sink, config.get("skip_recorded", False))
+
+    @staticmethod
+    def __get_ledger(
+        config: BatchConfig, get_database: Callable[[], AsyncIOMotorDatabase]
+    ) -> Optional[CoverageLedger]:
+        """
+        Initializes the ledger of the recorded block ranges, unless disabled
+        or the records are not written into the database.
+
+        Args:
+            config: The batch config dictionary.
+            get_database: Gets the database of the ledger.
+
+        Raises:
+            ValueError: When any of the required environment variables is not provided.
+
+        Returns:
+            The coverage ledger instance, if any.
+        """
+        # The ranges written elsewhere are not recorded in the database
+        if (
+            not config.get("coverage", True)
+            or config.get("sink", {}).get("type", "mongo") != "mongo"
+        ):
+            return None
+
+        return CoverageLedger(get_database())
 
     @staticmethod
     def __get_rpc_uri() -> str:
@@ -1,9 +1,11 @@
 # 3rd party libraries
+from celery.signals import worker_process_shutdown
 from dotenv import load_dotenv
 import yaml
 
 # Code
 from src.lib.logger import RecordingLogger
+from src.storage import MongoClientFactory
 from ..worker import worker
 from .recorder import BatchRecorder
 from .types import BatchConfig
@@ -26,3 +28,11 @@ def record_historical_events_task(*args, **kwargs) -> str:
     logger.info("Task complete!")
 
     return "OK"
+
+
+@worker_process_shutdown.connect
+def close_database_clients(*args, **kwargs) -> None:
+    """
+    Closes the database clients shared by the tasks of the worker process.
+    """
+    MongoClientFactory.close()
@@ -1,11 +1,29 @@
 # Standard libraries
 from typing import TypedDict
 
+# Code
+from src.pricing import GasPricingConfig
+from src.sinks import SinkConfig
+from src.storage import DatabaseConfig
 
-class GasPricingConfig(TypedDict):
-    gas_currency: str
-    quote_currency: str
 
-
-class BatchConfig(TypedDict):
+class _RequiredBatchConfig(TypedDict):
     gas_pricing: GasPricingConfig
+
+
+class BatchConfig(_RequiredBatchConfig, total=False):
+    # "insert" (default), "replace", or "upsert"
+    write_mode: str
+    # 1 (default) or 2 for the compact documents
+    schema_version: int
+    # "documents" (default) or "timeseries" for the bucketed collections
+    storage_layout: str
+    # Whether to skip the events recorded before instead of re-writing them
+    skip_recorded: bool
+    # Whether to only fetch the block ranges missing from the coverage ledger,
+    # adding them to it once recorded (default), instead of the whole range
+    coverage: bool
+    # The sink to write into, the database by default
+    sink: SinkConfig
+    # The connection pool of the database client
+    database: DatabaseConfig
@@ -0,0 +1,2 @@
+from .scheduler import GAP_FILLS_COLLECTION, GapScheduler
+from .types import GapFillingConfig
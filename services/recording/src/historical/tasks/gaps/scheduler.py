@@ -0,0 +1,302 @@
+# Standard libraries
+from typing import Optional
+import asyncio
+import itertools
+import os
+import time
+
+# 3rd party libraries
+from motor.motor_asyncio import AsyncIOMotorCollection
+import aiohttp
+
+# Code
+from src.lib.logger import RecordingLogger
+from src.storage import (
+    BlockRange,
+    BlockRanges,
+    CoverageLedger,
+    DatabaseConfig,
+    MongoClientFactory,
+)
+from ..batch.task import record_historical_events_task
+from ..worker import worker
+from .types import GapFillingConfig, GapSubscriptionConfig
+
+# Constants
+GAP_FILLS_COLLECTION = "gap_fills"
+GAP_CHUNK_BLOCKS = 5000
+GAP_MAX_PENDING_CHUNKS = 1
+# Comfortably past the reorgs, and the blocks the live stream is still processing
+GAP_CONFIRMATIONS = 64
+GAP_PENDING_TIMEOUT_SECONDS = 3600
+
+# The event id, contract address, and block range of a backfill task
+GapChunk = tuple[str, str, int, int]
+
+
+class GapScheduler:
+    """
+    Schedules the backfill tasks filling the gaps in the recorded blocks
+    of the live subscriptions, from their first recorded block up to their
+    last recorded block, capped at the chain head less the confirmations.
+
+    The pending tasks are tracked in the database, such that at most
+    so many are pending at once across the runs and the workers,
+    and each run only fetches the chain head besides the ledger.
+    Each backfill resolves its pool's tokens with a few eth_calls
+    to the node provider the live stream shares, such that the pending
+    limit also caps the backfills' calls to it per run.
+    """
+
+    __logger: RecordingLogger
+    __subscriptions: list[GapSubscriptionConfig]
+    __chunk_blocks: int
+    __max_pending_chunks: int
+    __confirmations: int
+    __pending_timeout_seconds: int
+    __etherscan_api_key: str
+    __ledger: CoverageLedger
+    __fills: AsyncIOMotorCollection
+
+    def __init__(
+        self,
+        logger: RecordingLogger,
+        config: GapFillingConfig,
+        database_config: Optional[DatabaseConfig] = None,
+    ):
+        self.__logger = logger
+        self.__subscriptions = config["subscriptions"]
+        self.__chunk_blocks = config.get("chunk_blocks", GAP_CHUNK_BLOCKS)
+        self.__max_pending_chunks = config.get(
+            "max_pending_chunks", GAP_MAX_PENDING_CHUNKS
+        )
+        self.__confirmations = config.get("confirmations", GAP_CONFIRMATIONS)
+        self.__pending_timeout_seconds = config.get(
+            "pending_timeout_seconds", GAP_PENDING_TIMEOUT_SECONDS
+        )
+
+        if self.__chunk_blocks < 1:
+            raise ValueError('"chunk_blocks" must be positive')
+
+        if self.__max_pending_chunks < 1:
+            raise ValueError('"max_pending_chunks" must be positive')
+
+        if self.__confirmations < 0:
+            raise ValueError('"confirmations" must not be negative')
+
+        etherscan_api_key = os.environ.get("ETHERSCAN_API_KEY")
+        if etherscan_api_key is None:
+            raise ValueError('Environment variable "ETHERSCAN_API_KEY" not found.')
+
+        self.__etherscan_api_key = etherscan_api_key
+
+        database = MongoClientFactory.get_database(database_config)
+        self.__ledger = CoverageLedger(database)
+        self.__fills = database[GAP_FILLS_COLLECTION]
+
+    def schedule_synchronously(self) -> list[GapChunk]:
+        """
+        Schedules the backfill tasks synchronously.
+
+        Returns:
+            The chunks scheduled.
+        """
+        loop = asyncio.get_event_loop()
+        return loop.run_until_complete(self.schedule_asynchronously())
+
+    async def schedule_asynchronously(self) -> list[GapChunk]:
+        """
+        Schedules the backfill tasks of the oldest gaps not pending yet,
+        taking turns between the subscriptions, until the pending limit.
+
+        Returns:
+            The chunks scheduled.
+        """
+        pending = await self.__get_pending_chunks()
+
+        budget = self.__max_pending_chunks - len(pending)
+        if budget < 1:
+            self.__logger.info(f"{len(pending)} backfills still pending")
+            return []
+
+        to_block = await self.__get_head_block() - self.__confirmations
+
+        chunks_by_subscription = []
+        for subscription in self.__subscriptions:
+            event_id = subscription["event_id"]
+            address = subscription["contract_address"].lower()
+
+            pending_ranges = [
+                (from_block, last_block)
+                for pending_event_id, pending_address, from_block, last_block in pending
+                if (pending_event_id, pending_address) == (event_id, address)
+            ]
+            chunks = await self.__get_gap_chunks(
+                subscription, to_block, pending_ranges, budget
+            )
+            chunks_by_subscription.append(chunks)
+
+        scheduled = [
+            chunk
+            for chunk in itertools.chain(
+                *itertools.zip_longest(*chunks_by_subscription)
+            )
+            if chunk is not None
+        ][:budget]
+
+        for chunk in scheduled:
+            await self.__enqueue(chunk)
+
+        return scheduled
+
+    @staticmethod
+    def get_chunks(
+        event_id: str,
+        address: str,
+        ranges: list[BlockRange],
+        chunk_blocks: int,
+        max_chunks: int,
+    ) -> list[GapChunk]:
+        """
+        Splits the ranges into chunks of at most so many blocks.
+
+        Args:
+            event_id: The event id of the ranges.
+            address: The contract address of the ranges.
+            ranges: The ranges to split, in order.
+            chunk_blocks: The maximum blocks of each chunk.
+            max_chunks: The maximum number of chunks.
+
+        Returns:
+            The first chunks of the ranges, in order.
+        """
+        chunks: list[GapChunk] = []
+
+        for first_block, last_block in ranges:
+            for from_block in range(first_block, last_block + 1, chunk_blocks):
+                if len(chunks) == max_chunks:
+                    return chunks
+
+                to_block = min(from_block + chunk_blocks - 1, last_block)
+                chunks.append((event_id, address, from_block, to_block))
+
+        return chunks
+
+    # ---------
+    # Helpers
+    # ---------
+
+    async def __get_pending_chunks(self) -> list[GapChunk]:
+        """
+        Gets the chunks still pending, forgetting those done or lost.
+
+        Returns:
+            The chunks pending.
+        """
+        pending: list[GapChunk] = []
+        expired_at = time.time() - self.__pending_timeout_seconds
+
+        for fill in await self.__fills.find().to_list(None):
+            if (
+                worker.AsyncResult(fill["task_id"]).ready()
+                or fill["enqueued_at"] < expired_at
+            ):
+                await self.__fills.delete_one({"_id": fill["_id"]})
+                continue
+
+            pending.append(
+                (
+                    fill["event_id"],
+                    fill["address"],
+                    fill["from_block"],
+                    fill["to_block"],
+                )
+            )
+
+        return pending
+
+    async def __get_gap_chunks(
+        self,
+        subscription: GapSubscriptionConfig,
+        to_block: int,
+        pending_ranges: list[BlockRange],
+        max_chunks: int,
+    ) -> list[GapChunk]:
+        """
+        Gets the chunks of the gaps of a subscription not pending yet.
+
+        Args:
+            subscription: The subscription config dictionary.
+            to_block: The last block to fill up to at most.
+            pending_ranges: The ranges of the subscription pending.
+            max_chunks: The maximum number of chunks.
+
+        Returns:
+            The oldest chunks of the gaps, in order.
+        """
+        event_id = subscription["event_id"]
+        address = subscription["contract_address"].lower()
+
+        ranges = await self.__ledger.get_ranges(event_id, address)
+        if not ranges and "from_block" not in subscription:
+            self.__logger.info(f"Nothing recorded yet of {event_id} at {address}")
+            return []
+
+        from_block = subscription.get("from_block", ranges[0][0] if ranges else 0)
+
+        # The blocks since the last recorded are left to the live stream,
+        # which only covers up to the latest event of a quiet pool
+        if ranges:
+            to_block = min(to_block, ranges[-1][1])
+
+        gaps = BlockRanges.subtract(
+            from_block, to_block, BlockRanges.merge(ranges + pending_ranges)
+        )
+
+        return self.get_chunks(event_id, address, gaps, self.__chunk_blocks, max_chunks)
+
+    async def __enqueue(self, chunk: GapChunk) -> None:
+        """
+        Enqueues the backfill task of a chunk, tracking it as pending.
+
+        Args:
+            chunk: The chunk to backfill.
+        """
+        event_id, address, from_block, to_block = chunk
+
+        self.__logger.info(
+            f"Backfilling {event_id} at {address} from {from_block} to {to_block}"
+        )
+        task_id = record_historical_events_task.delay(
+            address, event_id, from_block, to_block
+        )
+
+        await self.__fills.insert_one(
+            {
+                "_id": f"{event_id}-{address}-{from_block}-{to_block}",
+                "event_id": event_id,
+                "address": address,
+                "from_block": from_block,
+                "to_block": to_block,
+                "task_id": str(task_id),
+                "enqueued_at": int(time.time()),
+            }
+        )
+
+    async def __get_head_block(self) -> int:
+        """
+        Gets the latest block number from Etherscan.
+
+        Returns:
+            The latest block number.
+        """
+        uri = (
+            "https://api.etherscan.io/api?module=proxy&action=eth_blockNumber"
+            f"&apikey={self.__etherscan_api_key}"
+        )
+
+        async with aiohttp.ClientSession() as session:
+            response = await session.get(uri)
+            data = await response.json()
+
+        return int(data["result"], 16)
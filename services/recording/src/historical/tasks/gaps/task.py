@@ -0,0 +1,35 @@
+# 3rd party libraries
+from dotenv import load_dotenv
+import yaml
+
+# Code
+from src.lib.logger import RecordingLogger
+from ..worker import worker
+from .scheduler import GapScheduler
+
+# Load the environment
+load_dotenv()
+
+
+@worker.task(name="fill_gaps_task")
+def fill_gaps_task() -> str:
+    """
+    The task entrypoint to schedule the backfills of the live subscriptions' gaps,
+    if configured.
+    """
+    with open("config.yaml", "r") as f:
+        config = yaml.load(f, yaml.Loader)
+
+    logger = RecordingLogger("GapFillingTaskLogger")
+
+    if "gap_filling" not in config:
+        logger.info("Gap filling not configured")
+        return "OK"
+
+    scheduler = GapScheduler(
+        logger, config["gap_filling"], config["batch"].get("database")
+    )
+    scheduled = scheduler.schedule_synchronously()
+    logger.info(f"Scheduled {len(scheduled)} backfills")
+
+    return "OK"
@@ -0,0 +1,28 @@
+# Standard libraries
+from typing import TypedDict
+
+
+class _RequiredGapSubscriptionConfig(TypedDict):
+    contract_address: str
+    event_id: str
+
+
+class GapSubscriptionConfig(_RequiredGapSubscriptionConfig, total=False):
+    # The first block to keep filled, the first block recorded by default
+    from_block: int
+
+
+class _RequiredGapFillingConfig(TypedDict):
+    # The live subscriptions to fill the gaps of
+    subscriptions: list[GapSubscriptionConfig]
+
+
+class GapFillingConfig(_RequiredGapFillingConfig, total=False):
+    # The blocks of each backfill task, 5000 by default
+    chunk_blocks: int
+    # The backfill tasks pending at once, 1 by default
+    max_pending_chunks: int
+    # The newest blocks left to the live stream, 64 by default
+    confirmations: int
+    # How long until a pending backfill task is considered lost, 3600 by default
+    pending_timeout_seconds: int
@@ -3,11 +3,21 @@ from celery import Celery
 
 
 BROKER_URI = os.environ.get("BROKER_URI", "redis://redis:6379")
+GAP_FILLING_INTERVAL_SECONDS = int(os.environ.get("GAP_FILLING_INTERVAL_SECONDS", 600))
 
 
 worker = Celery(
     "worker",
     broker=BROKER_URI,
     backend=BROKER_URI,
-    include=["src.historical.tasks.batch.task"],
+    include=["src.historical.tasks.batch.task", "src.historical.tasks.gaps.task"],
 )
+
+# Scheduled by the beat, dropping the runs not started by the next one
+worker.conf.beat_schedule = {
+    "fill_gaps": {
+        "task": "fill_gaps_task",
+        "schedule": GAP_FILLING_INTERVAL_SECONDS,
+        "options": {"expires": GAP_FILLING_INTERVAL_SECONDS},
+    },
+}
@@ -1,4 +1,6 @@
 from .types import ListenerOutput, ProcessorOutput
+from .coverage import CoverageTracker
 from .listener import StreamListener
+from .spool import WriteAheadSpool
 from .processor import StreamProcessor
 from .writer import StreamWriter
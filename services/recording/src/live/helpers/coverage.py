@@ -0,0 +1,102 @@
+# Standard libraries
+import asyncio
+
+# 3rd party libraries
+from pymongo.errors import PyMongoError
+
+# Code
+from src.lib.logger import RecordingLogger
+from src.events import EventRecord
+from src.storage import BlockRange, BlockRanges, CoverageLedger
+
+# Constants
+# About a block, such that the ledger is updated once per block at most
+COVERAGE_CHECKPOINT_SECONDS = 12
+
+
+class CoverageTracker:
+    """
+    Tracks the blocks the stream has processed per event and contract,
+    adding them to the coverage ledger periodically.
+
+    Logs arrive in the order of their blocks, so a block is processed
+    once a record of a later block is accepted, covering every block
+    since the first one accepted after the subscriptions were (re)made.
+    """
+
+    __logger: RecordingLogger
+    __ledger: CoverageLedger
+    # The first and last block accepted of each event and contract
+    __blocks: dict[tuple[str, str], BlockRange]
+    # The ranges processed but not added to the ledger yet
+    __pending: dict[tuple[str, str], list[BlockRange]]
+
+    def __init__(self, logger: RecordingLogger, ledger: CoverageLedger):
+        self.__logger = logger
+        self.__ledger = ledger
+        self.__blocks = dict()
+        self.__pending = dict()
+
+    def observe_records(self, records: list[EventRecord]) -> None:
+        """
+        Observes the records accepted by the writer.
+
+        Args:
+            records: The accepted event records.
+        """
+        for record in records:
+            key = (record.event_id, record.address)
+            block_number = record.block_number
+
+            if key not in self.__blocks:
+                self.__blocks[key] = (block_number, block_number)
+                continue
+
+            first_block, last_block = self.__blocks[key]
+
+            # Postponed records of the blocks processed already
+            if block_number <= last_block:
+                continue
+
+            self.__blocks[key] = (first_block, block_number)
+            self.__pending[key] = BlockRanges.merge(
+                self.__pending.get(key, []) + [(first_block, block_number - 1)]
+            )
+
+    def reset(self) -> None:
+        """
+        Starts tracking anew, as the events emitted while disconnected are missed.
+        """
+        self.__blocks.clear()
+
+    async def checkpoint(self) -> None:
+        """
+        Adds the ranges processed to the ledger,
+        keeping those failing to be added for the next checkpoint.
+        """
+        for key in list(self.__pending):
+            event_id, address = key
+
+            for first_block, last_block in self.__pending.pop(key):
+                try:
+                    added = await self.__ledger.add(
+                        event_id, address, first_block, last_block
+                    )
+                except PyMongoError as e:
+                    self.__logger.warning(f"Failed to update the ledger: {e}")
+                    added = False
+
+                if not added:
+                    self.__pending[key] = BlockRanges.merge(
+                        self.__pending.get(key, []) + [(first_block, last_block)]
+                    )
+
+    async def checkpoint_forever(self) -> None:
+        """
+        Adds the ranges processed to the ledger periodically.
+        """
+        self.__logger.info("Checkpointing the coverage forever...")
+
+        while True:
+            await asyncio.sleep(COVERAGE_CHECKPOINT_SECONDS)
+            await self.checkpoint()
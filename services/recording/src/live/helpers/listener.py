@@ -1,4 +1,5 @@
 # Standard libraries
+from typing import Callable
 import asyncio
 import json
 
@@ -19,12 +20,14 @@ class StreamListener:
     __wss_uri: str
     __subscription_messages: list[str]
     __subscription_ids: dict[str, int]
+    __connect_observers: list[Callable[[], None]]
 
     def __init__(self, logger: RecordingLogger, wss_uri: str):
         self.__logger = logger
         self.__wss_uri = wss_uri
         self.__subscription_messages = []
         self.__subscription_ids = {}
+        self.__connect_observers = []
 
     def add_event_subscription(self, contract_address: str, topic: str) -> int:
         """
@@ -52,6 +55,16 @@ class StreamListener:
         )
         return len(self.__subscription_messages) - 1
 
+    def add_connect_observer(self, observer: Callable[[], None]) -> None:
+        """
+        Adds an observer to be called whenever the subscriptions are (re)made,
+        as the events emitted while disconnected are missed.
+
+        Args:
+            observer: The callback taking no arguments.
+        """
+        self.__connect_observers.append(observer)
+
     async def listen_forever(self, output_queue: asyncio.Queue[ListenerOutput]) -> None:
         """
         Listens to the blockchain asynchronously,
@@ -77,6 +90,9 @@ class StreamListener:
                     json_message = json.loads(string_message)
                     self.__subscription_ids[json_message["result"]] = i
 
+                for observer in self.__connect_observers:
+                    observer()
+
                 self.__logger.info("Starting to listen for events...")
 
                 try:
@@ -1,5 +1,6 @@
 # Standard libraries
 from collections import defaultdict
+from typing import Optional
 import asyncio
 import json
 
@@ -9,11 +10,11 @@ import aiohttp
 
 # Code
 from src.lib.logger import RecordingLogger
-from src.events import BaseEventHandler
+from src.events import BaseEventHandler, EventRecord
+from src.pricing import BasePriceSource
 from .types import (
     ListenerOutput,
     TransactionReceipt,
-    ProcessedLog,
     ProcessorOutput,
 )
 
@@ -32,24 +33,24 @@ class StreamProcessor:
 
     __logger: RecordingLogger
     __rpc_uri: str
-    __gas_currency: str
-    __quote_currency: str
+    __price_source: BasePriceSource
     __event_ids: dict[int, str]
     __event_handlers: dict[int, BaseEventHandler]
+    # The last price fetched, to fall back to while none can be fetched
+    __last_price: Optional[tuple[int, int]]
 
     def __init__(
         self,
         logger: RecordingLogger,
         rpc_uri: str,
-        gas_currency: str,
-        quote_currency: str,
+        price_source: BasePriceSource,
     ):
         self.__logger = logger
         self.__rpc_uri = rpc_uri
-        self.__gas_currency = gas_currency
-        self.__quote_currency = quote_currency
+        self.__price_source = price_source
         self.__event_ids = {}
         self.__event_handlers = {}
+        self.__last_price = None
 
     def register_event_id(self, subscription_id: int, event_id: str) -> None:
         """
@@ -191,12 +192,7 @@ class StreamProcessor:
 
         # Fetch the gas currency price
         gas_currency_price_task = asyncio.create_task(
-            self.__fetch_gas_currency_price(
-                session,
-                self.__gas_currency,
-                self.__quote_currency,
-                block_timestamp,
-            )
+            self.__quote_gas_currency_price(session, block_timestamp)
         )
 
         # Catch and postpone if txn receipt not found
@@ -229,18 +225,16 @@ class StreamProcessor:
         await output_queue.put(
             ProcessorOutput(
                 subscription_id=subscription_id,
-                data=ProcessedLog(
+                data=EventRecord(
                     event_id=self.__event_ids[subscription_id],
                     transaction_hash=event_log["transactionHash"],
                     log_index=int(event_log["logIndex"], 16),
                     block_number=int(event_log["blockNumber"], 16),
                     timestamp=block_timestamp,
-                    gas_used=str(gas_used),
-                    gas_price_wei=str(gas_price_wei),
-                    gas_price_quote={
-                        "currency": self.__quote_currency,
-                        "value": str(gas_price_quoted_value),
-                    },
+                    gas_used=gas_used,
+                    gas_price_wei=gas_price_wei,
+                    gas_price_quote_value=gas_price_quoted_value,
+                    quote_currency=self.__price_source.quote_currency,
                     address=event_log["address"],
                     topics=event_log["topics"],
                     raw_data=event_log["data"],
@@ -293,12 +287,7 @@ class StreamProcessor:
 
         # Fetch the gas currency price
         gas_currency_price_task = asyncio.create_task(
-            self.__fetch_gas_currency_price(
-                session,
-                self.__gas_currency,
-                self.__quote_currency,
-                block_timestamp,
-            )
+            self.__quote_gas_currency_price(session, block_timestamp)
         )
 
         # Wait for the transaction receipt
@@ -331,18 +320,16 @@ class StreamProcessor:
             await output_queue.put(
                 ProcessorOutput(
                     subscription_id=subscription_id,
-                    data=ProcessedLog(
+                    data=EventRecord(
                         event_id=self.__event_ids[subscription_id],
                         transaction_hash=transaction_hash,
                         log_index=int(event_log["logIndex"], 16),
                         block_number=int(event_log["blockNumber"], 16),
                         timestamp=block_timestamp,
-                        gas_used=str(gas_used),
-                        gas_price_wei=str(gas_price_wei),
-                        gas_price_quote={
-                            "currency": self.__quote_currency,
-                            "value": str(gas_price_quoted_value),
-                        },
+                        gas_used=gas_used,
+                        gas_price_wei=gas_price_wei,
+                        gas_price_quote_value=gas_price_quoted_value,
+                        quote_currency=self.__price_source.quote_currency,
                         address=event_log["address"],
                         topics=event_log["topics"],
                         raw_data=event_log["data"],
@@ -438,41 +425,53 @@ class StreamProcessor:
         result: TransactionReceipt = json_response["result"]
         return result
 
+    async def __quote_gas_currency_price(
+        self, session: aiohttp.ClientSession, timestamp: int
+    ) -> tuple[int, int]:
+        """
+        Fetches the gas currency price, degrading to the last price fetched,
+        or a zero price if there is none yet, when the price source has none
+        (e.g., no swaps recorded recently), such that the stream keeps recording.
+
+        Args:
+            session: The asynchronous http session to use to make the request.
+            timestamp: The timestamp in seconds at which to fetch the price.
+
+        Returns:
+            The tuple of the integer price and decimal scaling.
+        """
+        try:
+            price: tuple[int, int] = await self.__fetch_gas_currency_price(
+                session, self.__price_source, timestamp
+            )
+        except ValueError as e:
+            fallback = self.__last_price or (0, 0)
+            self.__logger.warning(
+                f"No gas currency price at {timestamp}, quoting with {fallback}: {e}"
+            )
+            return fallback
+
+        self.__last_price = price
+        return price
+
     @staticmethod
-    @alru_cache(maxsize=16)
+    @alru_cache(maxsize=16, cache_exceptions=False)
     async def __fetch_gas_currency_price(
         session: aiohttp.ClientSession,
-        gas_currency: str,
-        quote_currency: str,
+        price_source: BasePriceSource,
         timestamp: int,
     ) -> tuple[int, int]:
         """
-        Fetches the price from a centralized exchange.
-        LRU-cached to reduce the number of calls made.
+        Fetches the gas currency price from the price source.
+        LRU-cached to reduce the number of calls made, except for the failures.
 
         Args:
             session: The asynchronous http session to use to make the request.
-            gas_currency: The gas currency to get the price of.
-            quote_currency: The quote currency for the price to be quoted in.
+            price_source: The source to fetch the price from.
             timestamp: The timestamp in seconds at which to fetch the price.
 
         Returns:
-            The tuple of the kline's integer close price and decimal scaling.
+            The tuple of the integer price and decimal scaling.
         """
-        # Fetch the minute kline where the timestamp was in
-        uri = (
-            "https://api.binance.com/api/v3/klines"
-            f"?symbol={gas_currency}{quote_currency}&interval=1m"
-            f"&endTime={timestamp * 1000}&limit=1"
-        )
-
-        response = await session.get(uri)
-        json_response = await response.json()
-        kline = json_response[0]
-
-        # We shall simply use the close price
-        string_price = kline[4]
-        decimals: int = len(string_price) - string_price.find(".") - 1
-        integer_price = int(string_price.replace(".", ""))
-
-        return integer_price, decimals
+        price: tuple[int, int] = await price_source.fetch_price(session, timestamp)
+        return price
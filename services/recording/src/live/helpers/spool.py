@@ -0,0 +1,236 @@
+# Standard libraries
+from typing import Optional
+import mmap
+import os
+import struct
+import zlib
+
+# Constants
+SPOOL_SEGMENT_BYTES = 4 * 1024 * 1024
+SPOOL_SEGMENT_SUFFIX = ".spool"
+# The offset of the first unacknowledged entry, at the start of each segment
+SPOOL_HEADER = struct.Struct("<Q")
+# The length and checksum of each entry, where a zero length ends the segment
+SPOOL_FRAME = struct.Struct("<II")
+
+# The segment and offset of an entry
+SpoolPosition = tuple[int, int]
+
+
+class WriteAheadSpool:
+    """
+    Local append-only spool of entries in memory-mapped segment files,
+    which are read back in order and removed once acknowledged.
+
+    Entries are framed with their length and checksum such that an entry
+    torn by a crash ends the segment when the spool is reopened,
+    and every unacknowledged entry is read back again.
+    """
+
+    __directory: str
+    __segment_bytes: int
+    __segments: dict[int, mmap.mmap]
+    __write_offset: int
+    __acknowledged: SpoolPosition
+
+    def __init__(self, directory: str, segment_bytes: int = SPOOL_SEGMENT_BYTES):
+        if segment_bytes <= SPOOL_HEADER.size + SPOOL_FRAME.size:
+            raise ValueError('"segment_bytes" is too small to hold any entry')
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.__directory = directory
+        self.__segment_bytes = segment_bytes
+        self.__segments = dict()
+
+        numbers = sorted(
+            int(name[: -len(SPOOL_SEGMENT_SUFFIX)])
+            for name in os.listdir(directory)
+            if name.endswith(SPOOL_SEGMENT_SUFFIX)
+        )
+
+        for number in numbers:
+            self.__segments[number] = self.__open_segment(number)
+
+        if not self.__segments:
+            self.__segments[0] = self.__open_segment(0, SPOOL_HEADER.size)
+
+        head = min(self.__segments)
+        (offset,) = SPOOL_HEADER.unpack_from(self.__segments[head])
+        self.__acknowledged = (head, offset)
+
+        # Continue after the last whole entry, clearing what was torn past it
+        tail = max(self.__segments)
+        _entries, (_tail, self.__write_offset) = self.__read_segment(
+            tail, SPOOL_HEADER.size if tail != head else offset, None
+        )
+        segment, end = self.__segments[tail], self.__write_offset
+        segment[end:] = bytes(len(segment) - end)
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            The number of segments, i.e., files, of the spool.
+        """
+        return len(self.__segments)
+
+    @property
+    def is_empty(self) -> bool:
+        """
+        Whether every appended entry is acknowledged.
+        """
+        return self.__acknowledged == (max(self.__segments), self.__write_offset)
+
+    def append(self, entry: bytes) -> None:
+        """
+        Appends an entry, starting a new segment if it does not fit the current one.
+
+        Args:
+            entry: The entry to append.
+        """
+        frame_bytes = SPOOL_FRAME.size + len(entry)
+        tail = max(self.__segments)
+
+        # Keep room for the zero length ending the segment
+        if self.__write_offset + frame_bytes + SPOOL_FRAME.size > len(
+            self.__segments[tail]
+        ):
+            self.__segments[tail].flush()
+            tail += 1
+            self.__segments[tail] = self.__open_segment(
+                tail, SPOOL_HEADER.size + frame_bytes + SPOOL_FRAME.size
+            )
+            self.__write_offset = SPOOL_HEADER.size
+
+        segment = self.__segments[tail]
+        start = self.__write_offset + SPOOL_FRAME.size
+        end = start + len(entry)
+        segment[start:end] = entry
+        SPOOL_FRAME.pack_into(
+            segment, self.__write_offset, len(entry), zlib.crc32(entry)
+        )
+
+        self.__write_offset += frame_bytes
+
+    def read(self, max_entries: int) -> tuple[list[bytes], SpoolPosition]:
+        """
+        Reads the earliest entries not acknowledged yet.
+
+        Args:
+            max_entries: The maximum number of entries to read.
+
+        Returns:
+            The entries, and the position after them to acknowledge them with.
+        """
+        entries: list[bytes] = []
+        number, offset = self.__acknowledged
+
+        while True:
+            segment_entries, position = self.__read_segment(
+                number, offset, max_entries - len(entries)
+            )
+            entries.extend(segment_entries)
+
+            # Continue into the next segment only after reading the whole segment
+            is_last = number == max(self.__segments)
+            if len(entries) == max_entries or is_last:
+                return entries, position
+
+            number, offset = number + 1, SPOOL_HEADER.size
+
+    def acknowledge(self, position: SpoolPosition) -> None:
+        """
+        Acknowledges the entries before a position,
+        removing the segments whose entries are all acknowledged.
+
+        Args:
+            position: The position returned with the entries read.
+        """
+        number, offset = position
+
+        for earlier in [n for n in self.__segments if n < number]:
+            self.__segments.pop(earlier).close()
+            os.remove(self.__get_path(earlier))
+
+        SPOOL_HEADER.pack_into(self.__segments[number], 0, offset)
+        self.__segments[number].flush()
+        self.__acknowledged = position
+
+    def close(self) -> None:
+        """
+        Flushes and closes the segments.
+        """
+        for segment in self.__segments.values():
+            segment.flush()
+            segment.close()
+
+        self.__segments.clear()
+
+    # ---------
+    # Helpers
+    # ---------
+
+    def __read_segment(
+        self, number: int, offset: int, max_entries: Optional[int]
+    ) -> tuple[list[bytes], SpoolPosition]:
+        """
+        Reads the whole entries of a segment from an offset.
+
+        Args:
+            number: The number of the segment.
+            offset: The offset to read from.
+            max_entries: The maximum number of entries to read, if any.
+
+        Returns:
+            The entries, and the position after them.
+        """
+        entries: list[bytes] = []
+        segment = self.__segments[number]
+
+        # Appends always leave room for the zero length ending the segment
+        while max_entries is None or len(entries) < max_entries:
+            length, checksum = SPOOL_FRAME.unpack_from(segment, offset)
+            start = offset + SPOOL_FRAME.size
+            end = start + length
+            if length == 0 or end > len(segment):
+                break
+
+            entry = segment[start:end]
+            if zlib.crc32(entry) != checksum:
+                break
+
+            entries.append(entry)
+            offset = end
+
+        return entries, (number, offset)
+
+    def __open_segment(self, number: int, min_bytes: int = 0) -> mmap.mmap:
+        """
+        Opens a segment file, creating it with its header if missing.
+
+        Args:
+            number: The number of the segment.
+            min_bytes: The minimum size of the segment if created.
+
+        Returns:
+            The memory map of the segment.
+        """
+        path = self.__get_path(number)
+
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.truncate(max(self.__segment_bytes, min_bytes))
+                f.write(SPOOL_HEADER.pack(SPOOL_HEADER.size))
+
+        with open(path, "r+b") as f:
+            return mmap.mmap(f.fileno(), 0)
+
+    def __get_path(self, number: int) -> str:
+        """
+        Args:
+            number: The number of the segment.
+
+        Returns:
+            The path of the segment file.
+        """
+        return os.path.join(self.__directory, f"{number:012d}{SPOOL_SEGMENT_SUFFIX}")
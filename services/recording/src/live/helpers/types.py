@@ -1,6 +1,9 @@
 # Standard libraries
 from typing import TypedDict
 
+# Code
+from src.events import EventRecord
+
 
 class EventLog(TypedDict):
     removed: bool
@@ -24,26 +27,6 @@ class TransactionReceipt(TypedDict):
     effectiveGasPrice: str
 
 
-class GasPriceQuote(TypedDict):
-    currency: str
-    value: str
-
-
-class ProcessedLog(TypedDict):
-    event_id: str
-    transaction_hash: str
-    log_index: int
-    block_number: int
-    timestamp: int
-    gas_used: str
-    gas_price_wei: str
-    gas_price_quote: GasPriceQuote
-    address: str
-    topics: list[str]
-    raw_data: str
-    data: dict[str, str]
-
-
 class ProcessorOutput(TypedDict):
     subscription_id: int
-    data: ProcessedLog
+    data: EventRecord
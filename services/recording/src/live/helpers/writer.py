@@ -1,37 +1,48 @@
 # Standard libraries
+from typing import Callable, Optional
 import asyncio
+import json
 
 # 3rd party libraries
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo.errors import PyMongoError
 
 # Code
 from src.lib.logger import RecordingLogger
+from src.events import EventRecord
+from src.sinks import BaseSink
+from .spool import WriteAheadSpool
 from .types import ProcessorOutput
 
+# Constants
+SPOOL_DRAIN_BATCH_SIZE = 500
+SPOOL_RETRY_SECONDS = 1
+SPOOL_MAX_RETRY_SECONDS = 60
+
 
 class StreamWriter:
     """
-    Writer for writing the processed data into the database.
+    Writer for writing the processed data into the storage sink.
     """
 
     __logger: RecordingLogger
-    __client: AsyncIOMotorClient
-    __db: AsyncIOMotorDatabase
+    __sink: BaseSink
     __categories: dict[int, str]
+    __spool: Optional[WriteAheadSpool]
+    __write_observers: list[Callable[[list[EventRecord]], None]]
+    __accept_observers: list[Callable[[list[EventRecord]], None]]
 
     def __init__(
         self,
         logger: RecordingLogger,
-        host: str,
-        port: str,
-        database_name: str,
-        user: str,
-        password: str,
+        sink: BaseSink,
+        spool: Optional[WriteAheadSpool] = None,
     ):
         self.__logger = logger
-        self.__client = AsyncIOMotorClient(f"mongodb://{user}:{password}@{host}:{port}")
-        self.__db = self.__client[database_name]
+        self.__sink = sink
         self.__categories = dict()
+        self.__spool = spool
+        self.__write_observers = []
+        self.__accept_observers = []
 
     def register_category(self, subscription_id: int, category: str) -> None:
         """
@@ -43,25 +54,167 @@ class StreamWriter:
         """
         self.__categories[subscription_id] = category
 
+    def add_write_observer(self, observer: Callable[[list[EventRecord]], None]) -> None:
+        """
+        Adds an observer to be called with the records after they are written.
+
+        Args:
+            observer: The callback taking the list of written records.
+        """
+        self.__write_observers.append(observer)
+
+    def add_accept_observer(
+        self, observer: Callable[[list[EventRecord]], None]
+    ) -> None:
+        """
+        Adds an observer to be called with the records taken off the queue
+        once they are written, or spooled to be written.
+
+        Unlike the write observers, these are never called with the records
+        spooled by an earlier run.
+
+        Args:
+            observer: The callback taking the list of accepted records.
+        """
+        self.__accept_observers.append(observer)
+
     async def write_forever(self, input_queue: asyncio.Queue[ProcessorOutput]) -> None:
         """
-        Reads from the input queue asynchronously and writing them into the database.
+        Reads from the input queue asynchronously and writing them into the sink.
+
+        With a spool, the records are appended to the spool first and drained
+        into the sink in bulk, such that the records keep being taken
+        off the queue while the sink is unavailable.
 
         Args:
             input_queue: The queue to read from.
         """
         self.__logger.info("Writing forever...")
 
+        await self.__sink.open(sorted(set(self.__categories.values())))
+
+        # Close the sink when stopped such that its buffered records are kept
+        try:
+            if self.__spool is None:
+                await self.__write_forever(input_queue)
+            else:
+                spooled = asyncio.Event()
+                await asyncio.gather(
+                    self.__spool_forever(self.__spool, input_queue, spooled),
+                    self.__drain_forever(self.__spool, spooled),
+                )
+        finally:
+            await self.__sink.close()
+
+    # ---------
+    # Helpers
+    # ---------
+
+    async def __write_forever(
+        self, input_queue: asyncio.Queue[ProcessorOutput]
+    ) -> None:
+        """
+        Writes the records from the input queue into the sink one by one.
+
+        Args:
+            input_queue: The queue to read from.
+        """
         while True:
             processor_output = await input_queue.get()
 
-            self.__logger.info(
-                "Writer got event for txn: "
-                + processor_output["data"]["transaction_hash"]
-            )
+            record = processor_output["data"]
+
+            self.__logger.info(f"Writer got event for txn: {record.transaction_hash}")
 
             category = self.__categories[processor_output["subscription_id"]]
-            data = processor_output["data"]
 
-            key = {"_id": f'{data["transaction_hash"]}-{data["log_index"]}'}
-            await self.__db[category].update_one(key, {"$set": data}, upsert=True)
+            await self.__sink.write(category, [record])
+
+            # Persist the buffered records whenever caught up with the stream
+            if input_queue.empty():
+                await self.__sink.flush()
+
+            for observer in self.__write_observers + self.__accept_observers:
+                observer([record])
+
+    async def __spool_forever(
+        self,
+        spool: WriteAheadSpool,
+        input_queue: asyncio.Queue[ProcessorOutput],
+        spooled: asyncio.Event,
+    ) -> None:
+        """
+        Appends the records from the input queue to the spool.
+
+        Args:
+            spool: The spool to append to.
+            input_queue: The queue to read from.
+            spooled: The event to set whenever records are appended.
+        """
+        while True:
+            processor_output = await input_queue.get()
+
+            record = processor_output["data"]
+
+            self.__logger.info(f"Writer got event for txn: {record.transaction_hash}")
+
+            # Spooled with the category as subscription ids do not survive restarts
+            entry = {
+                "category": self.__categories[processor_output["subscription_id"]],
+                "document": record.to_document(),
+            }
+            spool.append(json.dumps(entry).encode())
+            spooled.set()
+
+            for observer in self.__accept_observers:
+                observer([record])
+
+    async def __drain_forever(
+        self, spool: WriteAheadSpool, spooled: asyncio.Event
+    ) -> None:
+        """
+        Writes the spooled records into the sink in bulk,
+        acknowledging them only once written and flushed,
+        and retrying with a backoff while the sink is unavailable.
+
+        Args:
+            spool: The spool to drain.
+            spooled: The event set whenever records are appended.
+        """
+        delay = SPOOL_RETRY_SECONDS
+
+        while True:
+            entries, position = spool.read(SPOOL_DRAIN_BATCH_SIZE)
+
+            if not entries:
+                spooled.clear()
+                await spooled.wait()
+                continue
+
+            records_by_category: dict[str, list[EventRecord]] = dict()
+            for entry in map(json.loads, entries):
+                records_by_category.setdefault(entry["category"], []).append(
+                    EventRecord.from_document(entry["document"])
+                )
+
+            try:
+                for category, records in records_by_category.items():
+                    await self.__sink.write(category, records)
+
+                    for observer in self.__write_observers:
+                        observer(records)
+
+                # The records buffered by the sink would be lost once acknowledged
+                await self.__sink.flush()
+
+            except (PyMongoError, OSError) as e:
+                self.__logger.warning(
+                    f"Writer failed to drain {len(entries)} spooled events, "
+                    f"retrying in {delay}s: {e}"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, SPOOL_MAX_RETRY_SECONDS)
+                continue
+
+            spool.acknowledge(position)
+            delay = SPOOL_RETRY_SECONDS
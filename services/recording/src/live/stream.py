@@ -1,22 +1,28 @@
 # Standard libraries
+from functools import partial
+from typing import Callable, Optional
 import asyncio
 import os
 
+# 3rd party libraries
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
 # Code
 from src.lib.logger import RecordingLogger
 from src.events import EventsResolver
+from src.pricing import BasePriceSource, PriceSourceResolver
+from src.sinks import SinkResolver
+from src.storage import CoverageLedger, MongoClientFactory
 from .helpers import (
+    CoverageTracker,
     ListenerOutput,
     ProcessorOutput,
     StreamListener,
     StreamProcessor,
     StreamWriter,
+    WriteAheadSpool,
 )
-from .types import (
-    StreamConfig,
-    GasPricingConfig,
-    SubscriptionsConfig,
-)
+from .types import StreamConfig, SubscriptionsConfig
 
 
 class Stream:
@@ -27,14 +33,28 @@ class Stream:
 
     __logger: RecordingLogger
     __listener: StreamListener
+    __price_source: BasePriceSource
     __processor: StreamProcessor
     __writer: StreamWriter
+    __coverage_tracker: Optional[CoverageTracker]
 
     def __init__(self, logger: RecordingLogger, config: StreamConfig):
         self.__logger = logger
         self.__listener = self.__get_listener(logger)
-        self.__processor = self.__get_processor(logger, config["gas_pricing"])
-        self.__writer = self.__get_writer(logger)
+
+        # The database of the process-wide client shared by the components
+        get_database = partial(MongoClientFactory.get_database, config.get("database"))
+
+        self.__price_source = self.__get_price_source(config, get_database)
+        self.__processor = self.__get_processor(logger, self.__price_source)
+        self.__writer = self.__get_writer(logger, config, get_database)
+        self.__writer.add_write_observer(self.__price_source.observe_records)
+        self.__coverage_tracker = self.__get_coverage_tracker(
+            logger, config, get_database
+        )
+        if self.__coverage_tracker is not None:
+            self.__writer.add_accept_observer(self.__coverage_tracker.observe_records)
+            self.__listener.add_connect_observer(self.__coverage_tracker.reset)
         self.__initialize_subscriptions(
             self.__listener, self.__processor, self.__writer, config["subscriptions"]
         )
@@ -55,11 +75,15 @@ class Stream:
         writer_queue = asyncio.Queue[ProcessorOutput]()
 
         self.__logger.info("Starting listener, processor, and writer...")
-        await asyncio.gather(
+        components = [
             self.__listener.listen_forever(processor_queue),
             self.__processor.process_forever(processor_queue, writer_queue),
             self.__writer.write_forever(writer_queue),
-        )
+        ]
+        if self.__coverage_tracker is not None:
+            components.append(self.__coverage_tracker.checkpoint_forever())
+
+        await asyncio.gather(*components)
 
     # ------------------------
     # Initialization helpers
@@ -85,19 +109,40 @@ class Stream:
 
         return StreamListener(logger, node_provider_wss_uri)
 
+    @staticmethod
+    def __get_price_source(
+        config: StreamConfig,
+        get_database: Callable[[], AsyncIOMotorDatabase],
+    ) -> BasePriceSource:
+        """
+        Initializes the price source to quote the gas prices with.
+
+        Args:
+            config: The config dictionary, with the pricing config.
+            get_database: Gets the database for sources reading recorded events.
+
+        Returns:
+            The price source instance.
+        """
+        return PriceSourceResolver.get_price_source(
+            config["gas_pricing"],
+            get_database,
+            config.get("storage_layout", "documents"),
+        )
+
     @staticmethod
     def __get_processor(
-        logger: RecordingLogger, pricing_config: GasPricingConfig
+        logger: RecordingLogger, price_source: BasePriceSource
     ) -> StreamProcessor:
         """
         Initializes the stream processor.
 
         Args:
             logger: The logger instance to pass into the processor.
+            price_source: The price source to quote the gas prices with.
 
         Raises:
             ValueError: When the environment variable is not provided.
-            pricing_config: The pricing config dictionary.
 
         Returns:
             The stream processor instance.
@@ -106,41 +151,81 @@ class Stream:
         if node_provider_rpc_uri is None:
             raise ValueError('Environment variable "NODE_PROVIDER_RPC_URI" not found.')
 
-        return StreamProcessor(
-            logger,
-            node_provider_rpc_uri,
-            pricing_config["gas_currency"],
-            pricing_config["quote_currency"],
-        )
+        return StreamProcessor(logger, node_provider_rpc_uri, price_source)
 
     @staticmethod
-    def __get_writer(logger: RecordingLogger) -> StreamWriter:
+    def __get_writer(
+        logger: RecordingLogger,
+        config: StreamConfig,
+        get_database: Callable[[], AsyncIOMotorDatabase],
+    ) -> StreamWriter:
         """
         Initializes the stream writer.
 
         Args:
             logger: The logger instance to pass into the writer.
+            config: The stream config dictionary, for the sink and spool to write into.
+            get_database: Gets the database for the "mongo" sink.
 
         Raises:
-            ValueError: When any of the required environment variables is not provided.
+            ValueError: When the sink is not supported live.
 
         Returns:
             The stream writer instance.
         """
-        host = os.environ.get("DB_HOST")
-        port = os.environ.get("DB_PORT")
-        database = os.environ.get("DB_DATABASE")
-        user = os.environ.get("DB_USER")
-        password = os.environ.get("DB_PASSWORD")
+        sink_config = config.get("sink", {})
 
-        if not all([host, port, database, user, password]):
+        # Parquet segments are only readable once closed, i.e., every so many events
+        if (
+            sink_config.get("type") == "files"
+            and sink_config.get("format") == "parquet"
+        ):
             raise ValueError(
-                "Environment variables for the database is incomplete. "
-                'Needs "DB_HOST", "DB_PORT", "DB_DATABASE", '
-                '"DB_USER", and "DB_PASSWORD"'
+                'The "parquet" format of the "files" sink is not supported live.'
             )
 
-        return StreamWriter(logger, host, port, database, user, password)
+        sink = SinkResolver.get_sink(
+            sink_config,
+            get_database,
+            "upsert",
+            config.get("schema_version", 1),
+            config.get("storage_layout", "documents"),
+        )
+
+        spool_directory = config.get("spool_directory")
+        spool = WriteAheadSpool(spool_directory) if spool_directory else None
+
+        return StreamWriter(logger, sink, spool)
+
+    @staticmethod
+    def __get_coverage_tracker(
+        logger: RecordingLogger,
+        config: StreamConfig,
+        get_database: Callable[[], AsyncIOMotorDatabase],
+    ) -> Optional[CoverageTracker]:
+        """
+        Initializes the tracker of the blocks processed, unless disabled
+        or the records are not written into the database.
+
+        Args:
+            logger: The logger instance to pass into the tracker.
+            config: The stream config dictionary.
+            get_database: Gets the database of the coverage ledger.
+
+        Raises:
+            ValueError: When any of the required environment variables is not provided.
+
+        Returns:
+            The coverage tracker instance, if any.
+        """
+        # The blocks written elsewhere are not recorded in the database
+        if (
+            not config.get("coverage", True)
+            or config.get("sink", {}).get("type", "mongo") != "mongo"
+        ):
+            return None
+
+        return CoverageTracker(logger, CoverageLedger(get_database()))
 
     @staticmethod
     def __initialize_subscriptions(
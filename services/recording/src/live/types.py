@@ -1,6 +1,11 @@
 # Standard libraries
 from typing import TypedDict
 
+# Code
+from src.pricing import GasPricingConfig
+from src.sinks import SinkConfig
+from src.storage import DatabaseConfig
+
 
 class SubscriptionConfig(TypedDict):
     contract_address: str
@@ -10,11 +15,21 @@ class SubscriptionConfig(TypedDict):
 SubscriptionsConfig = list[SubscriptionConfig]
 
 
-class GasPricingConfig(TypedDict):
-    gas_currency: str
-    quote_currency: str
-
-
-class StreamConfig(TypedDict):
+class _RequiredStreamConfig(TypedDict):
     subscriptions: SubscriptionsConfig
     gas_pricing: GasPricingConfig
+
+
+class StreamConfig(_RequiredStreamConfig, total=False):
+    # 1 (default) or 2 for the compact documents
+    schema_version: int
+    # "documents" (default) or "timeseries" for the bucketed collections
+    storage_layout: str
+    # The directory to spool the records into before writing them, if any
+    spool_directory: str
+    # Whether to add the blocks processed to the coverage ledger (default)
+    coverage: bool
+    # The sink to write into, the database by default
+    sink: SinkConfig
+    # The connection pool of the database client
+    database: DatabaseConfig
@@ -0,0 +1,5 @@
+from .base import BasePriceSource
+from .binance import BinancePriceSource
+from .swaps import SwapsPriceSource
+from .resolver import PriceSourceResolver
+from .types import GasPricingConfig
@@ -0,0 +1,67 @@
+# Standard libraries
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+# 3rd party libraries
+import aiohttp
+
+# Code
+from src.events import EventRecord
+
+
+class BasePriceSource(ABC):
+    """
+    Protocol for a source of gas currency prices.
+
+    Prices are returned as tuples of the integer price and its decimal scaling.
+    """
+
+    quote_currency: str
+
+    def __init__(self, quote_currency: str):
+        self.quote_currency = quote_currency
+
+    def __repr__(self):
+        return f"{type(self).__name__} quoted in {self.quote_currency}"
+
+    def __str__(self):
+        return f"{type(self).__name__} quoted in {self.quote_currency}"
+
+    @abstractmethod
+    async def fetch_prices(
+        self, session: aiohttp.ClientSession, timestamps: Sequence[int]
+    ) -> list[tuple[int, int]]:
+        """
+        Fetches the prices for a batch of timestamps.
+
+        Args:
+            session: The asynchronous http session to make any requests with.
+            timestamps: The timestamps in seconds, in any order.
+
+        Returns:
+            The integer price and decimal scaling for each timestamp.
+        """
+
+    async def fetch_price(
+        self, session: aiohttp.ClientSession, timestamp: int
+    ) -> tuple[int, int]:
+        """
+        Fetches the price at a single timestamp.
+
+        Args:
+            session: The asynchronous http session to make any requests with.
+            timestamp: The timestamp in seconds.
+
+        Returns:
+            The integer price and decimal scaling.
+        """
+        return (await self.fetch_prices(session, [timestamp]))[0]
+
+    def observe_records(self, records: list[EventRecord]) -> None:
+        """
+        Observes the records that have just been written.
+        Does nothing unless the source derives its prices from recorded events.
+
+        Args:
+            records: The written event records.
+        """
@@ -0,0 +1,144 @@
+# Standard libraries
+from bisect import bisect_left
+from typing import Sequence
+
+# 3rd party libraries
+import aiohttp
+
+# Code
+from .base import BasePriceSource
+
+# Constants
+# The maximum number of klines Binance returns per request
+KLINES_LIMIT = 1000
+
+
+class BinancePriceSource(BasePriceSource):
+    """
+    Price source from Binance's minute klines' close prices.
+    """
+
+    gas_currency: str
+
+    def __init__(self, gas_currency: str, quote_currency: str):
+        super().__init__(quote_currency)
+        self.gas_currency = gas_currency
+
+    async def fetch_prices(
+        self, session: aiohttp.ClientSession, timestamps: Sequence[int]
+    ) -> list[tuple[int, int]]:
+        """
+        Fetches the klines covering the timestamps and matches each timestamp
+        with the price of the kline it closed in, by binary searching
+        the sorted close times for the whole batch.
+
+        Args:
+            session: The asynchronous http session to use to make the requests.
+            timestamps: The timestamps in seconds, in any order.
+
+        Raises:
+            ValueError: If there are no prices to match with.
+
+        Returns:
+            The integer price and decimal scaling for each timestamp.
+        """
+        close_times, prices = await self.__fetch_klines(
+            session, min(timestamps), max(timestamps)
+        )
+
+        if not prices:
+            raise ValueError("No gas currency prices found to match the events with.")
+
+        # Find the first kline with close_time >= event_time,
+        # falling back to the latest kline if the event is beyond it.
+        last_index = len(prices) - 1
+        return [
+            prices[min(bisect_left(close_times, timestamp * 1000), last_index)]
+            for timestamp in timestamps
+        ]
+
+    async def fetch_price(
+        self, session: aiohttp.ClientSession, timestamp: int
+    ) -> tuple[int, int]:
+        """
+        Fetches the price of the minute kline the timestamp is in.
+
+        Args:
+            session: The asynchronous http session to use to make the request.
+            timestamp: The timestamp in seconds at which to fetch the price.
+
+        Returns:
+            The tuple of the kline's integer close price and decimal scaling.
+        """
+        uri = (
+            "https://api.binance.com/api/v3/klines"
+            f"?symbol={self.gas_currency}{self.quote_currency}&interval=1m"
+            f"&endTime={timestamp * 1000}&limit=1"
+        )
+
+        response = await session.get(uri)
+        json_response = await response.json()
+
+        # We shall simply use the close price
+        return self.__parse_price(json_response[0][4])
+
+    async def __fetch_klines(
+        self,
+        session: aiohttp.ClientSession,
+        start_timestamp: int,
+        end_timestamp: int,
+    ) -> tuple[list[int], list[tuple[int, int]]]:
+        """
+        Fetches the minute klines covering the time range,
+        paginating since each response is capped at KLINES_LIMIT klines.
+
+        Args:
+            session: The asynchronous http session to use to make the request.
+            start_timestamp: The earliest timestamp to fetch.
+            end_timestamp: The latest timestamp to fetch.
+
+        Returns:
+            The tuple of the klines' close times in milliseconds
+            and their integer close prices and decimal scalings.
+        """
+        close_times: list[int] = []
+        prices: list[tuple[int, int]] = []
+
+        # Fetch from the minute kline before the earliest timestamp
+        start_time = (start_timestamp - 60) * 1000
+        end_time = end_timestamp * 1000
+
+        while True:
+            uri = (
+                "https://api.binance.com/api/v3/klines"
+                f"?symbol={self.gas_currency}{self.quote_currency}&interval=1m"
+                f"&startTime={start_time}&endTime={end_time}&limit={KLINES_LIMIT}"
+            )
+
+            response = await session.get(uri)
+            klines = await response.json()
+
+            # Parse the close times and prices
+            for kline in klines:
+                close_times.append(kline[6])
+                prices.append(self.__parse_price(kline[4]))
+
+            # Done once the range is covered or there is nothing more to fetch
+            if len(klines) < KLINES_LIMIT or klines[-1][6] >= end_time:
+                return close_times, prices
+
+            # Continue from the kline after the last one
+            start_time = klines[-1][6] + 1
+
+    @staticmethod
+    def __parse_price(string_price: str) -> tuple[int, int]:
+        """
+        Args:
+            string_price: The decimal string price.
+
+        Returns:
+            The tuple of the integer price and its decimal scaling.
+        """
+        decimals: int = len(string_price) - string_price.find(".") - 1
+        integer_price = int(string_price.replace(".", ""))
+        return integer_price, decimals
@@ -0,0 +1,54 @@
+# Standard libraries
+from typing import Callable
+
+# 3rd party libraries
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+# Code
+from .base import BasePriceSource
+from .binance import BinancePriceSource
+from .swaps import SwapsPriceSource
+from .types import GasPricingConfig
+
+
+class PriceSourceResolver:
+    """
+    Static class to resolve the price source from the gas pricing config.
+    """
+
+    @staticmethod
+    def get_price_source(
+        config: GasPricingConfig,
+        get_database: Callable[[], AsyncIOMotorDatabase],
+        storage_layout: str = "documents",
+    ) -> BasePriceSource:
+        """
+        Initializes the price source based on the config's source.
+
+        Args:
+            config: The gas pricing config dictionary.
+            get_database: Gets the database for sources reading recorded events.
+            storage_layout: The layout of the collections, for the "swaps" source.
+
+        Raises:
+            ValueError: If the source is not recognizable.
+
+        Returns:
+            The initialized price source instance.
+        """
+        source = config.get("source", "binance")
+
+        if source == "binance":
+            return BinancePriceSource(config["gas_currency"], config["quote_currency"])
+
+        if source == "swaps":
+            return SwapsPriceSource(
+                get_database()["swaps"],
+                config["pool_address"],
+                config["price_field"],
+                config["decimals"],
+                config["quote_currency"],
+                storage_layout=storage_layout,
+            )
+
+        raise ValueError(f'Price source "{source}" is not recognizable.')
@@ -0,0 +1,232 @@
+# Standard libraries
+from bisect import bisect_right, insort
+from typing import Any, Optional, Sequence
+
+# 3rd party libraries
+from motor.motor_asyncio import AsyncIOMotorCollection
+import aiohttp
+
+# Code
+from src.events import EventRecord
+from src.storage import DocumentSchema, TimeSeriesWriter
+from src.storage.timeseries import TIMESERIES_TIME_FIELD
+from .base import BasePriceSource
+
+# Constants
+SWAP_EVENT_ID = "uniswap-v3-pool-swap"
+
+
+class SwapsPriceSource(BasePriceSource):
+    """
+    Price source derived from the swap prices recorded from a pool,
+    kept in a time-bucketed in-memory index of the last price per bucket.
+
+    The index is loaded from the database for ranges it does not cover yet
+    and is updated incrementally with the records observed being written.
+    """
+
+    __collection: AsyncIOMotorCollection
+    __pool_address: str
+    __price_field: str
+    __decimals: int
+    __bucket_seconds: int
+    __lookback_seconds: int
+    __storage_layout: str
+    __bucket_starts: list[int]
+    __buckets: dict[int, tuple[int, int]]
+    __loaded_from: Optional[int]
+    __loaded_to: Optional[int]
+
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        pool_address: str,
+        price_field: str,
+        decimals: int,
+        quote_currency: str,
+        bucket_seconds: int = 60,
+        lookback_seconds: int = 3600,
+        storage_layout: str = "documents",
+    ):
+        super().__init__(quote_currency)
+        self.__collection = collection
+        self.__pool_address = pool_address.lower()
+        self.__price_field = price_field
+        self.__decimals = decimals
+        self.__bucket_seconds = bucket_seconds
+        self.__lookback_seconds = lookback_seconds
+        self.__storage_layout = storage_layout
+        self.__bucket_starts = []
+        self.__buckets = {}
+        self.__loaded_from = None
+        self.__loaded_to = None
+
+    async def fetch_prices(
+        self, session: aiohttp.ClientSession, timestamps: Sequence[int]
+    ) -> list[tuple[int, int]]:
+        """
+        Looks up the latest recorded swap price at or before each timestamp,
+        loading the range from the database first if it is not indexed yet.
+
+        Args:
+            session: Unused since no requests are made.
+            timestamps: The timestamps in seconds, in any order.
+
+        Raises:
+            ValueError: If there is no recorded swap price within the lookback
+                before a timestamp to match with.
+
+        Returns:
+            The integer price and decimal scaling for each timestamp.
+        """
+        start_timestamp, end_timestamp = min(timestamps), max(timestamps)
+        if not self.__is_loaded(start_timestamp, end_timestamp):
+            await self.__load(start_timestamp, end_timestamp)
+
+        if not self.__bucket_starts:
+            raise ValueError(
+                f"No recorded swap prices found for pool {self.__pool_address}."
+            )
+
+        return [(self.__lookup(timestamp), self.__decimals) for timestamp in timestamps]
+
+    def observe_records(self, records: list[EventRecord]) -> None:
+        """
+        Indexes the swap prices of the pool's records that have just been written,
+        keeping the loaded range fresh as the records stream in.
+
+        Args:
+            records: The written event records.
+        """
+        for record in records:
+            if (
+                record.address.lower() != self.__pool_address
+                or self.__price_field not in record.data
+            ):
+                continue
+
+            self.__index(record.timestamp, int(record.data[self.__price_field]))
+
+            # Only extend the loaded range up to a bucket past its end,
+            # never across the gap of the swaps not loaded (e.g., of backfills)
+            if (
+                self.__loaded_to is not None
+                and self.__loaded_to
+                < record.timestamp
+                <= self.__loaded_to + self.__bucket_seconds
+            ):
+                self.__loaded_to = record.timestamp
+
+    def __is_loaded(self, start_timestamp: int, end_timestamp: int) -> bool:
+        """
+        Args:
+            start_timestamp: The earliest timestamp to check.
+            end_timestamp: The latest timestamp to check.
+
+        Returns:
+            Whether the range is covered by the index, allowing the latest
+            price to be up to a bucket stale.
+        """
+        return (
+            self.__loaded_from is not None
+            and self.__loaded_to is not None
+            and self.__loaded_from <= start_timestamp
+            and end_timestamp <= self.__loaded_to + self.__bucket_seconds
+        )
+
+    async def __load(self, start_timestamp: int, end_timestamp: int) -> None:
+        """
+        Loads the recorded swap prices for the range into the index,
+        looking back before the range for the price preceding it.
+
+        Args:
+            start_timestamp: The earliest timestamp to load.
+            end_timestamp: The latest timestamp to load.
+        """
+        load_from = start_timestamp - self.__lookback_seconds
+        query: dict[str, Any] = {
+            "event_id": SWAP_EVENT_ID,
+            "address": self.__pool_address,
+            "timestamp": {"$gte": load_from, "$lte": end_timestamp},
+        }
+        sort_field = "timestamp"
+
+        # Only unpack the buckets of the pool's series and range in the time-series
+        # layout, where the time is indexed instead of the timestamp
+        if self.__storage_layout == "timeseries":
+            query = TimeSeriesWriter.to_series_query(query)
+            sort_field = TIMESERIES_TIME_FIELD
+
+        cursor = self.__collection.find(
+            query, {"_id": 0, "timestamp": 1, f"data.{self.__price_field}": 1}
+        ).sort(sort_field)
+
+        for document in await cursor.to_list(None):
+            self.__index(
+                document["timestamp"],
+                int(DocumentSchema.decode_value(document["data"][self.__price_field])),
+            )
+
+        # Extend the loaded range if it overlaps with the previous one
+        if (
+            self.__loaded_from is not None
+            and self.__loaded_to is not None
+            and load_from <= self.__loaded_to
+            and self.__loaded_from <= end_timestamp
+        ):
+            self.__loaded_from = min(self.__loaded_from, load_from)
+            self.__loaded_to = max(self.__loaded_to, end_timestamp)
+        else:
+            self.__loaded_from, self.__loaded_to = load_from, end_timestamp
+
+    def __index(self, timestamp: int, price: int) -> None:
+        """
+        Keeps the latest price within the timestamp's bucket,
+        skipping the zero prices of empty or degenerate swaps.
+
+        Args:
+            timestamp: The timestamp of the price.
+            price: The integer price.
+        """
+        if price == 0:
+            return
+
+        bucket_start = timestamp - timestamp % self.__bucket_seconds
+        current = self.__buckets.get(bucket_start)
+
+        if current is None:
+            insort(self.__bucket_starts, bucket_start)
+        elif current[0] > timestamp:
+            return
+
+        self.__buckets[bucket_start] = (timestamp, price)
+
+    def __lookup(self, timestamp: int) -> int:
+        """
+        Args:
+            timestamp: The timestamp to lookup.
+
+        Raises:
+            ValueError: If there is no price within the lookback before the timestamp.
+
+        Returns:
+            The price of the latest bucket at or before the timestamp's bucket.
+        """
+        bucket_start = timestamp - timestamp % self.__bucket_seconds
+        index = bisect_right(self.__bucket_starts, bucket_start) - 1
+
+        # Never fall forward onto a later price, nor back onto a stale one
+        if index < 0:
+            raise ValueError(
+                f"No recorded swap prices found for pool {self.__pool_address} "
+                f"at or before {timestamp}."
+            )
+
+        price_timestamp, price = self.__buckets[self.__bucket_starts[index]]
+        if timestamp - price_timestamp > self.__lookback_seconds:
+            raise ValueError(
+                f"No recorded swap prices found for pool {self.__pool_address} "
+                f"within {self.__lookback_seconds} seconds before {timestamp}."
+            )
+
+        return price
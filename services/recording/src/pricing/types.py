@@ -0,0 +1,16 @@
+# Standard libraries
+from typing import TypedDict
+
+
+class _RequiredGasPricingConfig(TypedDict):
+    gas_currency: str
+    quote_currency: str
+
+
+class GasPricingConfig(_RequiredGasPricingConfig, total=False):
+    # "binance" (default) or "swaps"
+    source: str
+    # Required for the "swaps" source
+    pool_address: str
+    price_field: str
+    decimals: int
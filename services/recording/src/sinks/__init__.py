@@ -0,0 +1,6 @@
+from .base import BaseSink
+from .benchmark import SinkBenchmark
+from .files import FILE_FORMATS, FileSink
+from .mongo import MongoSink
+from .resolver import SinkResolver
+from .types import SinkConfig
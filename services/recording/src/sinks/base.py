@@ -0,0 +1,70 @@
+# Standard libraries
+from abc import ABC, abstractmethod
+
+# Code
+from src.events import EventRecord
+
+
+class BaseSink(ABC):
+    """
+    Protocol for a storage sink the pipelines write the event records into.
+
+    Sinks are opened before writing and closed after, and may buffer
+    the records written until flushed.
+    """
+
+    def __repr__(self):
+        return type(self).__name__
+
+    def __str__(self):
+        return type(self).__name__
+
+    async def open(self, categories: list[str]) -> None:
+        """
+        Prepares the sink to write the records of categories.
+        Does nothing unless the sink needs preparing.
+
+        Args:
+            categories: The categories to be written into.
+        """
+
+    @abstractmethod
+    async def write(self, category: str, records: list[EventRecord]) -> list[int]:
+        """
+        Writes a batch of records into their category.
+
+        Args:
+            category: The category of the records.
+            records: The records to write.
+
+        Returns:
+            The indices of the records not written before, in order.
+        """
+
+    async def filter_written(
+        self, category: str, records: list[EventRecord]
+    ) -> list[EventRecord]:
+        """
+        Filters out the records written before.
+        Keeps all of them unless the sink can look the records up.
+
+        Args:
+            category: The category of the records.
+            records: The records to filter.
+
+        Returns:
+            The records not written before, in order.
+        """
+        return records
+
+    async def flush(self) -> None:
+        """
+        Persists the records buffered so far.
+        Does nothing unless the sink buffers the records.
+        """
+
+    async def close(self) -> None:
+        """
+        Flushes and releases the resources of the sink.
+        Does nothing unless the sink holds any.
+        """
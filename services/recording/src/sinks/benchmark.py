@@ -0,0 +1,183 @@
+# Standard libraries
+from typing import Any, Optional, Union
+import asyncio
+import itertools
+import time
+
+# 3rd party libraries
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+# Code
+from src.events import EventRecord
+from src.lib.logger import RecordingLogger
+from .mongo import MongoSink
+from .types import WriteSettings
+
+# Constants
+BENCHMARK_CATEGORY = "swaps"
+BENCHMARK_EVENT_ID = "uniswap-v3-pool-swap"
+BENCHMARK_ADDRESS = "0x88e6a0c2ddd26feeb64f039a2c41296fcb3f5640"
+BENCHMARK_BLOCK_SECONDS = 12
+BENCHMARK_EVENTS_PER_BLOCK = 4
+
+
+class SinkBenchmark:
+    """
+    Benchmarks the throughput of the MongoDB sink under combinations
+    of the write settings, writing the same synthetic swaps with each
+    into a scratch database that is dropped before every run.
+    """
+
+    __logger: RecordingLogger
+    __database: AsyncIOMotorDatabase
+    __write_mode: str
+    __storage_layout: str
+
+    def __init__(
+        self,
+        logger: RecordingLogger,
+        database: AsyncIOMotorDatabase,
+        write_mode: str = "insert",
+        storage_layout: str = "documents",
+    ):
+        self.__logger = logger
+        self.__database = database
+        self.__write_mode = write_mode
+        self.__storage_layout = storage_layout
+
+    def run_synchronously(
+        self, records_count: int, combinations: list[WriteSettings]
+    ) -> list[dict[str, Any]]:
+        """
+        Runs the benchmark synchronously.
+
+        Args:
+            records_count: The number of records to write with each combination.
+            combinations: The combinations of the write settings.
+
+        Returns:
+            The throughput of each combination.
+        """
+        loop = asyncio.get_event_loop()
+        return loop.run_until_complete(
+            self.run_asynchronously(records_count, combinations)
+        )
+
+    async def run_asynchronously(
+        self, records_count: int, combinations: list[WriteSettings]
+    ) -> list[dict[str, Any]]:
+        """
+        Runs the benchmark asynchronously, writing the records in a single call
+        with each combination such that only the sink splits them into batches.
+
+        Args:
+            records_count: The number of records to write with each combination.
+            combinations: The combinations of the write settings.
+
+        Returns:
+            The throughput of each combination, in order.
+        """
+        records = self.get_records(records_count)
+        results: list[dict[str, Any]] = []
+
+        try:
+            for settings in combinations:
+                await self.__database.client.drop_database(self.__database.name)
+
+                sink = MongoSink(
+                    self.__database,
+                    self.__write_mode,
+                    storage_layout=self.__storage_layout,
+                    **settings,
+                )
+                await sink.open([BENCHMARK_CATEGORY])
+
+                start = time.perf_counter()
+                await sink.write(BENCHMARK_CATEGORY, records)
+                seconds = time.perf_counter() - start
+
+                results.append(
+                    {
+                        **settings,
+                        "records": records_count,
+                        "seconds": round(seconds, 3),
+                        "records_per_second": round(records_count / seconds),
+                    }
+                )
+                self.__logger.info(f"Benchmarked {results[-1]}")
+
+        finally:
+            await self.__database.client.drop_database(self.__database.name)
+
+        return results
+
+    @staticmethod
+    def get_combinations(
+        write_concerns: list[Union[int, str]],
+        journals: list[Optional[bool]],
+        orders: list[bool],
+        batch_sizes: list[int],
+    ) -> list[WriteSettings]:
+        """
+        Args:
+            write_concerns: The write concerns to benchmark.
+            journals: Whether to wait for the journal, or the server's default.
+            orders: Whether to write in order.
+            batch_sizes: The numbers of records per bulk write.
+
+        Returns:
+            Every combination of the write settings.
+        """
+        return [
+            {
+                "write_concern": write_concern,
+                "journal": journal,
+                "ordered": ordered,
+                "batch_size": batch_size,
+            }
+            for write_concern, journal, ordered, batch_size in itertools.product(
+                write_concerns, journals, orders, batch_sizes
+            )
+        ]
+
+    @staticmethod
+    def get_records(count: int) -> list[EventRecord]:
+        """
+        Generates synthetic swaps of a pool over consecutive blocks.
+
+        Args:
+            count: The number of records to generate.
+
+        Returns:
+            The records.
+        """
+        records = []
+
+        for i in range(count):
+            block_number, log_index = divmod(i, BENCHMARK_EVENTS_PER_BLOCK)
+            records.append(
+                EventRecord(
+                    BENCHMARK_EVENT_ID,
+                    f"0x{i:064x}",
+                    log_index,
+                    block_number,
+                    block_number * BENCHMARK_BLOCK_SECONDS,
+                    150000,
+                    20 * 10**9,
+                    3 * 10**15,
+                    "USDT",
+                    BENCHMARK_ADDRESS,
+                    [],
+                    "0x",
+                    {
+                        "symbol_0": "USDC",
+                        "symbol_1": "WETH",
+                        "amount_0": str(1000 + i),
+                        "amount_1": "-1",
+                        "swap_price_0": str(10**18 // (1000 + i)),
+                        "swap_price_1": str(1000 + i),
+                    },
+                )
+            )
+
+        return records
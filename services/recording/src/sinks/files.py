@@ -0,0 +1,183 @@
+# Standard libraries
+from typing import IO, Union
+import gzip
+import json
+import os
+
+# 3rd party libraries
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Code
+from src.events import EventRecord
+from src.export import EventsExporter, ExportSchemaResolver
+from src.export.schemas import BASE_FIELDS
+from .base import BaseSink
+
+# Constants
+# "ndjson" for gzipped json lines of the documents, "parquet" for typed columns
+FILE_FORMATS = ("ndjson", "parquet")
+FILE_EXTENSIONS = {"ndjson": "ndjson.gz", "parquet": "parquet"}
+FILE_SEGMENT_RECORDS = 100000
+NDJSON_COMPRESSION_LEVEL = 6
+PARQUET_COMPRESSION = "zstd"
+
+
+class FileSink(BaseSink):
+    """
+    Sink appending the records into local segment files per category and event,
+    starting a new segment every so many records.
+
+    Segments are named after their first record's block number and log index,
+    e.g., "swaps/uniswap-v3-pool-swap-000015000000-000012.ndjson.gz".
+    Parquet segments are only readable once closed, which flushing does.
+    """
+
+    __directory: str
+    __format: str
+    __segment_records: int
+    __segments: dict[tuple[str, str], Union[IO[str], pq.ParquetWriter]]
+    __segment_counts: dict[tuple[str, str], int]
+
+    def __init__(
+        self,
+        directory: str,
+        fmt: str = "ndjson",
+        segment_records: int = FILE_SEGMENT_RECORDS,
+    ):
+        if fmt not in FILE_FORMATS:
+            raise ValueError(f'"format" must be one of {list(FILE_FORMATS)}')
+
+        if segment_records < 1:
+            raise ValueError('"segment_records" must be positive')
+
+        self.__directory = directory
+        self.__format = fmt
+        self.__segment_records = segment_records
+        self.__segments = dict()
+        self.__segment_counts = dict()
+
+    async def write(self, category: str, records: list[EventRecord]) -> list[int]:
+        """
+        Appends the records into the current segments of their events.
+
+        Args:
+            category: The category of the records.
+            records: The records to write.
+
+        Returns:
+            The indices of all the records, as the files are only appended to.
+        """
+        records_by_event: dict[str, list[EventRecord]] = dict()
+        for record in records:
+            records_by_event.setdefault(record.event_id, []).append(record)
+
+        for event_id, event_records in records_by_event.items():
+            key = (category, event_id)
+
+            while event_records:
+                if key not in self.__segments:
+                    self.__open_segment(key, event_records[0])
+
+                room = self.__segment_records - self.__segment_counts[key]
+                self.__write_segment(key, event_records[:room])
+                self.__segment_counts[key] += len(event_records[:room])
+                event_records = event_records[room:]
+
+                if self.__segment_counts[key] >= self.__segment_records:
+                    self.__close_segment(key)
+
+        return list(range(len(records)))
+
+    async def flush(self) -> None:
+        """
+        Flushes the ndjson segments, or closes the parquet segments
+        such that their footers are written.
+        """
+        for key in list(self.__segments):
+            segment = self.__segments[key]
+
+            if isinstance(segment, pq.ParquetWriter):
+                self.__close_segment(key)
+            else:
+                segment.flush()
+
+    async def close(self) -> None:
+        """
+        Closes the segments.
+        """
+        for key in list(self.__segments):
+            self.__close_segment(key)
+
+    # ---------
+    # Helpers
+    # ---------
+
+    def __open_segment(self, key: tuple[str, str], first: EventRecord) -> None:
+        """
+        Opens a new segment file.
+
+        Args:
+            key: The category and event id of the segment.
+            first: The first record of the segment, to name it after.
+        """
+        category, event_id = key
+        os.makedirs(os.path.join(self.__directory, category), exist_ok=True)
+
+        name = f"{event_id}-{first.block_number:012d}-{first.log_index:06d}"
+        extension = FILE_EXTENSIONS[self.__format]
+        path = os.path.join(self.__directory, category, f"{name}.{extension}")
+
+        # Never overwrite the segments of a previous run starting at the same event
+        suffix = 0
+        while os.path.exists(path):
+            suffix += 1
+            path = os.path.join(
+                self.__directory, category, f"{name}-{suffix}.{extension}"
+            )
+
+        if self.__format == "parquet":
+            schema = ExportSchemaResolver.get_schema(event_id)
+            self.__segments[key] = pq.ParquetWriter(
+                path, schema, compression=PARQUET_COMPRESSION
+            )
+        else:
+            self.__segments[key] = gzip.open(
+                path, "wt", compresslevel=NDJSON_COMPRESSION_LEVEL
+            )
+
+        self.__segment_counts[key] = 0
+
+    def __write_segment(self, key: tuple[str, str], records: list[EventRecord]) -> None:
+        """
+        Writes records into a segment.
+
+        Args:
+            key: The category and event id of the segment.
+            records: The records to write.
+        """
+        segment = self.__segments[key]
+
+        if isinstance(segment, pq.ParquetWriter):
+            data_fields = [
+                field for field in segment.schema if field not in BASE_FIELDS
+            ]
+            rows = [
+                EventsExporter.flatten(record.to_document(), data_fields)
+                for record in records
+            ]
+            segment.write_table(pa.Table.from_pylist(rows, schema=segment.schema))
+        else:
+            segment.write(
+                "".join(json.dumps(record.to_document()) + "\n" for record in records)
+            )
+
+    def __close_segment(self, key: tuple[str, str]) -> None:
+        """
+        Closes a segment, such that the next records start a new one.
+
+        Args:
+            key: The category and event id of the segment.
+        """
+        self.__segments.pop(key).close()
+        self.__segment_counts.pop(key)
@@ -0,0 +1,199 @@
+# Standard libraries
+from typing import Optional, Union
+
+# 3rd party libraries
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo.write_concern import WriteConcern
+
+# Code
+from src.events import EventRecord
+from src.storage import (
+    CANDLES_COLLECTION,
+    GAS_COLLECTION,
+    SCHEMA_VERSIONS,
+    STORAGE_LAYOUTS,
+    WRITE_MODES,
+    RecordsWriter,
+    SwapCandlesAggregator,
+    TimeSeriesWriter,
+    TransactionGasAggregator,
+)
+from .base import BaseSink
+
+
+class MongoSink(BaseSink):
+    """
+    Sink writing the records into their category's collection,
+    along with their denormalized gas details and aggregated candles.
+
+    The write concern applies to all the writes, overriding the client's,
+    whereas the order only applies to the records' writes since the gas details
+    and candles are updated idempotently and commutatively.
+    """
+
+    __database: AsyncIOMotorDatabase
+    __write_mode: str
+    __schema_version: int
+    __storage_layout: str
+    __write_concern: Optional[WriteConcern]
+    __ordered: bool
+    __batch_size: Optional[int]
+
+    def __init__(
+        self,
+        database: AsyncIOMotorDatabase,
+        write_mode: str = "upsert",
+        schema_version: int = 1,
+        storage_layout: str = "documents",
+        write_concern: Optional[Union[int, str]] = None,
+        journal: Optional[bool] = None,
+        ordered: bool = False,
+        batch_size: Optional[int] = None,
+    ):
+        if write_mode not in WRITE_MODES:
+            raise ValueError(f'"write_mode" must be one of {list(WRITE_MODES)}')
+
+        if schema_version not in SCHEMA_VERSIONS:
+            raise ValueError(f'"schema_version" must be one of {list(SCHEMA_VERSIONS)}')
+
+        if storage_layout not in STORAGE_LAYOUTS:
+            raise ValueError(f'"storage_layout" must be one of {list(STORAGE_LAYOUTS)}')
+
+        # Unacknowledged writes do not tell which records were newly inserted
+        if write_concern == 0:
+            raise ValueError('"write_concern" must acknowledge the writes')
+
+        if batch_size is not None and batch_size < 1:
+            raise ValueError('"batch_size" must be positive')
+
+        self.__database = database
+        self.__write_mode = write_mode
+        self.__schema_version = schema_version
+        self.__storage_layout = storage_layout
+        self.__write_concern = (
+            None
+            if write_concern is None and journal is None
+            else WriteConcern(w=write_concern, j=journal)
+        )
+        self.__ordered = ordered
+        self.__batch_size = batch_size
+
+    async def open(self, categories: list[str]) -> None:
+        """
+        Creates the collections of the categories as time-series collections
+        if missing in the time-series layout.
+
+        Args:
+            categories: The categories to be written into.
+        """
+        if self.__storage_layout == "timeseries":
+            for category in categories:
+                await TimeSeriesWriter.ensure_collection(self.__database, category)
+
+    async def write(self, category: str, records: list[EventRecord]) -> list[int]:
+        """
+        Writes the records in batches of the batch size, if any.
+
+        Args:
+            category: The category of the records.
+            records: The records to write.
+
+        Returns:
+            The indices of the newly inserted records, in order.
+        """
+        batch_size = self.__batch_size or max(len(records), 1)
+        inserted: list[int] = []
+
+        for start in range(0, len(records), batch_size):
+            end = start + batch_size
+            batch_inserted = await self.__write_batch(category, records[start:end])
+            inserted.extend(start + i for i in batch_inserted)
+
+        return inserted
+
+    async def filter_written(
+        self, category: str, records: list[EventRecord]
+    ) -> list[EventRecord]:
+        """
+        Filters out the records already in their category's collection.
+
+        Args:
+            category: The category of the records.
+            records: The records to filter.
+
+        Returns:
+            The records not written before, in order.
+        """
+        collection = self.__get_collection(category)
+
+        if self.__storage_layout == "timeseries":
+            written = await TimeSeriesWriter.get_written(collection, records)
+        else:
+            written = await RecordsWriter.get_written(collection, records)
+
+        return [record for record in records if record.key not in written]
+
+    # ---------
+    # Helpers
+    # ---------
+
+    async def __write_batch(
+        self, category: str, records: list[EventRecord]
+    ) -> list[int]:
+        """
+        Writes a batch of records with the write mode, then their gas details,
+        and the candles of those newly inserted so repeats are not recounted.
+
+        Args:
+            category: The category of the records.
+            records: The records to write.
+
+        Returns:
+            The indices of the newly inserted records, in order.
+        """
+        collection = self.__get_collection(category)
+        inserted: list[int]
+
+        # Time-series collections only support inserts regardless of the mode
+        if self.__storage_layout == "timeseries":
+            inserted = await TimeSeriesWriter.write(
+                collection, records, self.__schema_version, self.__ordered
+            )
+        else:
+            inserted = await RecordsWriter.write(
+                collection,
+                records,
+                self.__write_mode,
+                self.__schema_version,
+                self.__ordered,
+            )
+
+        # Denormalize the gas details per transaction for point reads
+        gas_updates = TransactionGasAggregator.get_updates(records, category)
+        await self.__get_collection(GAS_COLLECTION).bulk_write(
+            gas_updates, ordered=False
+        )
+
+        # Aggregate only the newly inserted records so repeats are not recounted
+        candle_updates = SwapCandlesAggregator.get_updates(
+            [records[i] for i in inserted]
+        )
+        if candle_updates:
+            await self.__get_collection(CANDLES_COLLECTION).bulk_write(
+                candle_updates, ordered=False
+            )
+
+        return inserted
+
+    def __get_collection(self, name: str) -> AsyncIOMotorCollection:
+        """
+        Args:
+            name: The name of the collection.
+
+        Returns:
+            The collection, with the write concern if any.
+        """
+        if self.__write_concern is None:
+            return self.__database[name]
+
+        return self.__database.get_collection(name, write_concern=self.__write_concern)
@@ -0,0 +1,64 @@
+# Standard libraries
+from typing import Callable
+
+# 3rd party libraries
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+# Code
+from .base import BaseSink
+from .files import FILE_SEGMENT_RECORDS, FileSink
+from .mongo import MongoSink
+from .types import SinkConfig
+
+
+class SinkResolver:
+    """
+    Static class to resolve the storage sink from the sink config.
+    """
+
+    @staticmethod
+    def get_sink(
+        config: SinkConfig,
+        get_database: Callable[[], AsyncIOMotorDatabase],
+        write_mode: str = "upsert",
+        schema_version: int = 1,
+        storage_layout: str = "documents",
+    ) -> BaseSink:
+        """
+        Initializes the sink based on the config's type.
+
+        Args:
+            config: The sink config dictionary.
+            get_database: Gets the database for the "mongo" sink.
+            write_mode: The mode to write the records with, for the "mongo" sink.
+            schema_version: The schema version of the documents, for the "mongo" sink.
+            storage_layout: The layout of the collections, for the "mongo" sink.
+
+        Raises:
+            ValueError: If the sink type is not recognizable.
+
+        Returns:
+            The initialized sink instance.
+        """
+        sink_type = config.get("type", "mongo")
+
+        if sink_type == "mongo":
+            return MongoSink(
+                get_database(),
+                write_mode,
+                schema_version,
+                storage_layout,
+                config.get("write_concern"),
+                config.get("journal"),
+                config.get("ordered", False),
+                config.get("batch_size"),
+            )
+
+        if sink_type == "files":
+            return FileSink(
+                config["directory"],
+                config.get("format", "ndjson"),
+                config.get("segment_records", FILE_SEGMENT_RECORDS),
+            )
+
+        raise ValueError(f'Sink "{sink_type}" is not recognizable.')
@@ -0,0 +1,29 @@
+# Standard libraries
+from typing import Optional, TypedDict, Union
+
+
+class SinkConfig(TypedDict, total=False):
+    # "mongo" (default) or "files"
+    type: str
+    # Required for the "files" sink
+    directory: str
+    # "ndjson" (default) or "parquet", for the "files" sink
+    format: str
+    # The number of records per file, for the "files" sink
+    segment_records: int
+    # The write concern overriding the client's, e.g., 1 or "majority",
+    # and whether to wait for the journal, for the "mongo" sink
+    write_concern: Union[int, str]
+    journal: bool
+    # Whether to write the records in order (False by default), for the "mongo" sink
+    ordered: bool
+    # The number of records per bulk write (all by default), for the "mongo" sink
+    batch_size: int
+
+
+class WriteSettings(TypedDict):
+    write_concern: Union[int, str]
+    # Whether to wait for the journal, or the server's default if None
+    journal: Optional[bool]
+    ordered: bool
+    batch_size: int
@@ -0,0 +1,9 @@
+from .candles import CANDLES_COLLECTION, SwapCandlesAggregator
+from .client import DATABASE_COMPRESSORS, MongoClientFactory
+from .coverage import COVERAGE_COLLECTION, BlockRange, BlockRanges, CoverageLedger
+from .gas import GAS_COLLECTION, TransactionGasAggregator
+from .indexes import INDEXES_VERSION, IndexManager
+from .records import WRITE_MODES, RecordsWriter
+from .schema import SCHEMA_VERSIONS, DocumentSchema
+from .timeseries import STORAGE_LAYOUTS, TimeSeriesWriter
+from .types import DatabaseConfig
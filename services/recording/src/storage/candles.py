@@ -0,0 +1,178 @@
+# Standard libraries
+from typing import Any
+import decimal
+
+# 3rd party libraries
+from bson.decimal128 import Decimal128
+from pymongo import UpdateOne
+
+# Code
+from src.events import EventRecord
+from .schema import DECIMAL128_MAX_DIGITS
+
+# Constants
+CANDLES_COLLECTION = "swap_candles"
+CANDLE_GRANULARITIES: dict[str, int] = {
+    "1m": 60,
+    "5m": 300,
+    "1h": 3600,
+    "1d": 86400,
+}
+# Rounds the integers beyond the Decimal128 precision instead of raising,
+# as the candles must stay numeric to be updated with $min/$max/$inc
+CANDLES_DECIMAL_CONTEXT = decimal.Context(
+    prec=DECIMAL128_MAX_DIGITS,
+    rounding=decimal.ROUND_HALF_EVEN,
+    Emin=-6143,
+    Emax=6144,
+    clamp=1,
+    traps=[decimal.InvalidOperation, decimal.Overflow],
+)
+
+
+class SwapCandlesAggregator:
+    """
+    Static class to aggregate swap records into per-pool OHLCV candle upserts.
+
+    Each candle is updated incrementally with $min/$max/$inc so that the upserts
+    can be applied in any order, but must only be applied once per swap.
+    """
+
+    @classmethod
+    def get_updates(cls, records: list[EventRecord]) -> list[UpdateOne]:
+        """
+        Aggregates the swap records into one candle upsert per pool and bucket
+        of every granularity. Records without swap prices are skipped.
+
+        Args:
+            records: The newly written records.
+
+        Returns:
+            The list of candle upserts for a bulk write.
+        """
+        candles: dict[str, dict[str, Any]] = {}
+
+        for record in records:
+            if "swap_price_0" not in record.data:
+                continue
+
+            for granularity, seconds in CANDLE_GRANULARITIES.items():
+                bucket = record.timestamp - record.timestamp % seconds
+                key = f"{record.address}-{granularity}-{bucket}"
+
+                candle = candles.get(key)
+                if candle is None:
+                    candles[key] = cls.__new_candle(record, granularity, bucket)
+                else:
+                    cls.__merge_into(candle, record)
+
+        return [
+            UpdateOne({"_id": key}, cls.__to_update(candle), upsert=True)
+            for key, candle in candles.items()
+        ]
+
+    @staticmethod
+    def __new_candle(
+        record: EventRecord, granularity: str, bucket: int
+    ) -> dict[str, Any]:
+        """
+        Args:
+            record: The first swap record in the candle.
+            granularity: The candle's granularity.
+            bucket: The candle's starting timestamp.
+
+        Returns:
+            The candle aggregated from the single record.
+        """
+        sequence = record.block_number * 1_000_000 + record.log_index
+        price_0 = int(record.data["swap_price_0"])
+        price_1 = int(record.data["swap_price_1"])
+
+        return {
+            "address": record.address,
+            "granularity": granularity,
+            "bucket": bucket,
+            "symbol_0": record.data["symbol_0"],
+            "symbol_1": record.data["symbol_1"],
+            "open": (sequence, price_0, price_1),
+            "close": (sequence, price_0, price_1),
+            "high_0": price_0,
+            "high_1": price_1,
+            "low_0": price_0,
+            "low_1": price_1,
+            "volume_0": abs(int(record.data["amount_0"])),
+            "volume_1": abs(int(record.data["amount_1"])),
+            "count": 1,
+        }
+
+    @staticmethod
+    def __merge_into(candle: dict[str, Any], record: EventRecord) -> None:
+        """
+        Args:
+            candle: The candle to merge the record into.
+            record: The swap record to merge.
+        """
+        sequence = record.block_number * 1_000_000 + record.log_index
+        price_0 = int(record.data["swap_price_0"])
+        price_1 = int(record.data["swap_price_1"])
+
+        candle["open"] = min(candle["open"], (sequence, price_0, price_1))
+        candle["close"] = max(candle["close"], (sequence, price_0, price_1))
+        candle["high_0"] = max(candle["high_0"], price_0)
+        candle["high_1"] = max(candle["high_1"], price_1)
+        candle["low_0"] = min(candle["low_0"], price_0)
+        candle["low_1"] = min(candle["low_1"], price_1)
+        candle["volume_0"] += abs(int(record.data["amount_0"]))
+        candle["volume_1"] += abs(int(record.data["amount_1"]))
+        candle["count"] += 1
+
+    @staticmethod
+    def __to_update(candle: dict[str, Any]) -> dict[str, Any]:
+        """
+        Formats the aggregated candle into the incremental update document.
+        The open and close are sub-documents led by the event's sequence
+        such that $min/$max compare them by the sequence first. The values
+        beyond 34 significant digits are rounded to fit a Decimal128.
+
+        Args:
+            candle: The aggregated candle.
+
+        Returns:
+            The update document.
+        """
+
+        def to_decimal(value: int) -> Decimal128:
+            return Decimal128(CANDLES_DECIMAL_CONTEXT.create_decimal(value))
+
+        def price_point(point: tuple[int, int, int]) -> dict[str, Any]:
+            sequence, price_0, price_1 = point
+            return {
+                "sequence": sequence,
+                "price_0": to_decimal(price_0),
+                "price_1": to_decimal(price_1),
+            }
+
+        return {
+            "$setOnInsert": {
+                "address": candle["address"],
+                "granularity": candle["granularity"],
+                "bucket": candle["bucket"],
+                "symbol_0": candle["symbol_0"],
+                "symbol_1": candle["symbol_1"],
+            },
+            "$min": {
+                "open": price_point(candle["open"]),
+                "low_0": to_decimal(candle["low_0"]),
+                "low_1": to_decimal(candle["low_1"]),
+            },
+            "$max": {
+                "close": price_point(candle["close"]),
+                "high_0": to_decimal(candle["high_0"]),
+                "high_1": to_decimal(candle["high_1"]),
+            },
+            "$inc": {
+                "volume_0": to_decimal(candle["volume_0"]),
+                "volume_1": to_decimal(candle["volume_1"]),
+                "count": candle["count"],
+            },
+        }
@@ -0,0 +1,116 @@
+# Standard libraries
+from typing import Any, Optional
+import json
+import os
+
+# 3rd party libraries
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+
+# Code
+from .types import DatabaseConfig
+
+# Constants
+# "zstd" needs the zstandard package and "snappy" the python-snappy package
+DATABASE_COMPRESSORS = ("zstd", "snappy", "zlib")
+
+
+class MongoClientFactory:
+    """
+    Static class to get the database through a client shared by the process,
+    such that its connection pool is reused across the pipelines and tasks
+    instead of handshaking new connections for each.
+
+    Clients are keyed by their settings, and are closed together on shutdown.
+    """
+
+    __clients: dict[str, AsyncIOMotorClient] = {}
+
+    @staticmethod
+    def get_database(config: Optional[DatabaseConfig] = None) -> AsyncIOMotorDatabase:
+        """
+        Gets the database from the environment variables,
+        creating its client only if there is none of the same settings yet.
+
+        Args:
+            config: The settings of the client's connection pool, if any.
+
+        Raises:
+            ValueError: When any of the required environment variables is not
+                provided, or any of the settings is invalid.
+
+        Returns:
+            The database instance.
+        """
+        host = os.environ.get("DB_HOST")
+        port = os.environ.get("DB_PORT")
+        database = os.environ.get("DB_DATABASE")
+        user = os.environ.get("DB_USER")
+        password = os.environ.get("DB_PASSWORD")
+
+        if not all([host, port, database, user, password]):
+            raise ValueError(
+                "Environment variables for the database is incomplete. "
+                'Needs "DB_HOST", "DB_PORT", "DB_DATABASE", '
+                '"DB_USER", and "DB_PASSWORD"'
+            )
+
+        uri = f"mongodb://{user}:{password}@{host}:{port}"
+        options = MongoClientFactory.to_options(config or {})
+        key = json.dumps([uri, options], sort_keys=True)
+
+        if key not in MongoClientFactory.__clients:
+            MongoClientFactory.__clients[key] = AsyncIOMotorClient(uri, **options)
+
+        return MongoClientFactory.__clients[key][database]
+
+    @staticmethod
+    def close() -> None:
+        """
+        Closes the clients, releasing their connections.
+        """
+        for client in MongoClientFactory.__clients.values():
+            client.close()
+
+        MongoClientFactory.__clients.clear()
+
+    @staticmethod
+    def to_options(config: DatabaseConfig) -> dict[str, Any]:
+        """
+        Converts the database config into the client's keyword arguments.
+
+        Args:
+            config: The database config dictionary.
+
+        Raises:
+            ValueError: If any of the settings is invalid.
+
+        Returns:
+            The keyword arguments, leaving out the settings not given.
+        """
+        max_pool_size = config.get("max_pool_size")
+        min_pool_size = config.get("min_pool_size", 0)
+
+        if max_pool_size is not None and max_pool_size < 1:
+            raise ValueError('"max_pool_size" must be positive')
+
+        if min_pool_size < 0 or (
+            max_pool_size is not None and min_pool_size > max_pool_size
+        ):
+            raise ValueError('"min_pool_size" must be between 0 and "max_pool_size"')
+
+        compressors = config.get("compressors", [])
+        if any(compressor not in DATABASE_COMPRESSORS for compressor in compressors):
+            raise ValueError(
+                f'"compressors" must be any of {list(DATABASE_COMPRESSORS)}'
+            )
+
+        options = {
+            "maxPoolSize": max_pool_size,
+            "minPoolSize": config.get("min_pool_size"),
+            "maxIdleTimeMS": config.get("max_idle_time_ms"),
+            "compressors": ",".join(compressors) or None,
+            "w": config.get("write_concern"),
+            "journal": config.get("journal"),
+        }
+
+        return {name: value for name, value in options.items() if value is not None}
@@ -0,0 +1,189 @@
+# Standard libraries
+from typing import Any
+
+# 3rd party libraries
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+# Constants
+COVERAGE_COLLECTION = "block_coverage"
+COVERAGE_MAX_RETRIES = 10
+
+# The first and last blocks of a range, inclusive
+BlockRange = tuple[int, int]
+
+
+class BlockRanges:
+    """
+    Static class for the sets of inclusive block ranges,
+    kept as sorted lists of disjoint and non-adjacent ranges.
+    """
+
+    @staticmethod
+    def merge(ranges: list[BlockRange]) -> list[BlockRange]:
+        """
+        Args:
+            ranges: The ranges in any order, possibly overlapping.
+
+        Returns:
+            The sorted ranges, with the overlapping or adjacent ones merged.
+        """
+        merged: list[BlockRange] = []
+
+        for first, last in sorted(ranges):
+            if merged and first <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+            else:
+                merged.append((first, last))
+
+        return merged
+
+    @staticmethod
+    def subtract(
+        from_block: int, to_block: int, ranges: list[BlockRange]
+    ) -> list[BlockRange]:
+        """
+        Args:
+            from_block: The first block of the span.
+            to_block: The last block of the span.
+            ranges: The merged ranges to subtract from the span.
+
+        Returns:
+            The sorted sub-ranges of the span not in any of the ranges.
+        """
+        missing: list[BlockRange] = []
+        block = from_block
+
+        for first, last in ranges:
+            if last < block:
+                continue
+            if first > to_block:
+                break
+            if first > block:
+                missing.append((block, first - 1))
+            block = last + 1
+
+        if block <= to_block:
+            missing.append((block, to_block))
+
+        return missing
+
+
+class CoverageLedger:
+    """
+    Ledger of the block ranges whose events are fully recorded,
+    as a merged set of ranges per event id and contract address.
+
+    Updates are read-merge-writes guarded by a version of the document,
+    such that concurrent tasks and the stream never lose each other's ranges.
+    """
+
+    __collection: AsyncIOMotorCollection
+
+    def __init__(self, database: AsyncIOMotorDatabase):
+        self.__collection = database[COVERAGE_COLLECTION]
+
+    async def add(
+        self, event_id: str, address: str, from_block: int, to_block: int
+    ) -> bool:
+        """
+        Adds a range as recorded, merging it into the ranges recorded before.
+
+        Args:
+            event_id: The event id of the range.
+            address: The contract address of the range.
+            from_block: The first block of the range.
+            to_block: The last block of the range.
+
+        Returns:
+            Whether the range was added, as it is not after too many conflicts.
+        """
+        key = self.get_key(event_id, address)
+
+        for _ in range(COVERAGE_MAX_RETRIES):
+            document = await self.__collection.find_one({"_id": key})
+            version = document["version"] if document else 0
+            recorded = self.to_ranges(document)
+
+            ranges = BlockRanges.merge(recorded + [(from_block, to_block)])
+            if document and ranges == recorded:
+                return True
+
+            # Fails to upsert a duplicate key when the version moved on meanwhile
+            try:
+                await self.__collection.update_one(
+                    {"_id": key, "version": version},
+                    {
+                        "$set": {
+                            "event_id": event_id,
+                            "address": address.lower(),
+                            "ranges": [list(block_range) for block_range in ranges],
+                        },
+                        "$inc": {"version": 1},
+                    },
+                    upsert=True,
+                )
+                return True
+
+            except DuplicateKeyError:
+                continue
+
+        return False
+
+    async def get_ranges(self, event_id: str, address: str) -> list[BlockRange]:
+        """
+        Args:
+            event_id: The event id to get the ranges of.
+            address: The contract address to get the ranges of.
+
+        Returns:
+            The merged ranges recorded, in order.
+        """
+        document = await self.__collection.find_one(
+            {"_id": self.get_key(event_id, address)}
+        )
+
+        return self.to_ranges(document)
+
+    async def get_missing(
+        self, event_id: str, address: str, from_block: int, to_block: int
+    ) -> list[BlockRange]:
+        """
+        Args:
+            event_id: The event id of the span.
+            address: The contract address of the span.
+            from_block: The first block of the span.
+            to_block: The last block of the span.
+
+        Returns:
+            The sub-ranges of the span not recorded yet, in order.
+        """
+        ranges = await self.get_ranges(event_id, address)
+
+        return BlockRanges.subtract(from_block, to_block, ranges)
+
+    @staticmethod
+    def get_key(event_id: str, address: str) -> str:
+        """
+        Args:
+            event_id: The event id.
+            address: The contract address, in any case.
+
+        Returns:
+            The key of the ledger document.
+        """
+        return f"{event_id}-{address.lower()}"
+
+    @staticmethod
+    def to_ranges(document: Any) -> list[BlockRange]:
+        """
+        Args:
+            document: The ledger document, if any.
+
+        Returns:
+            The ranges of the document.
+        """
+        if not document:
+            return []
+
+        return [(first, last) for first, last in document["ranges"]]
@@ -0,0 +1,56 @@
+# Standard libraries
+from typing import Any
+
+# 3rd party libraries
+from pymongo import UpdateOne
+
+# Code
+from src.events import EventRecord
+
+# Constants
+GAS_COLLECTION = "transaction_gas"
+
+
+class TransactionGasAggregator:
+    """
+    Static class to denormalize the gas details of event records
+    into one compact document per transaction, keyed by the transaction hash.
+    """
+
+    @staticmethod
+    def get_updates(records: list[EventRecord], category: str) -> list[UpdateOne]:
+        """
+        Builds one gas upsert per transaction of the records.
+
+        The gas details are the same for all events of a transaction,
+        so the upserts are idempotent and can be re-applied on re-runs.
+
+        Args:
+            records: The written records.
+            category: The category the records were written into.
+
+        Returns:
+            The list of gas upserts for a bulk write.
+        """
+        transactions: dict[str, dict[str, Any]] = {}
+
+        for record in records:
+            transactions[record.transaction_hash] = {
+                "block_number": record.block_number,
+                "timestamp": record.timestamp,
+                "gas_used": str(record.gas_used),
+                "gas_price_wei": str(record.gas_price_wei),
+                "gas_price_quote": {
+                    "currency": record.quote_currency,
+                    "value": str(record.gas_price_quote_value),
+                },
+            }
+
+        return [
+            UpdateOne(
+                {"_id": transaction_hash},
+                {"$set": gas, "$addToSet": {"categories": category}},
+                upsert=True,
+            )
+            for transaction_hash, gas in transactions.items()
+        ]
@@ -0,0 +1,344 @@
+# Standard libraries
+from typing import Any, Optional
+import asyncio
+
+# 3rd party libraries
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+# Code
+from src.lib.logger import RecordingLogger
+from .candles import CANDLES_COLLECTION
+from .client import MongoClientFactory
+from .gas import GAS_COLLECTION
+from .timeseries import (
+    STORAGE_LAYOUTS,
+    TIMESERIES_META_FIELD,
+    TIMESERIES_TIME_FIELD,
+    TimeSeriesWriter,
+)
+from .types import DatabaseConfig, QueryShape
+
+# Constants
+# Bump whenever the managed indexes change such that they are re-applied
+INDEXES_VERSION = 2
+INDEX_VERSIONS_COLLECTION = "index_versions"
+EVENTS_ORDER = [("block_number", ASCENDING), ("log_index", ASCENDING)]
+
+# The indexes of each collection, matching the filters and sorts of the queries
+MANAGED_INDEXES: dict[str, list[IndexModel]] = {
+    "swaps": [
+        # Swaps of a pool in a block range, in events order (interface)
+        IndexModel([("event_id", ASCENDING), ("address", ASCENDING), *EVENTS_ORDER]),
+        # Swaps in a block range, in events order (interface and exports)
+        IndexModel([("event_id", ASCENDING), *EVENTS_ORDER]),
+        # Swaps in a time range (exports)
+        IndexModel([("event_id", ASCENDING), ("timestamp", ASCENDING)]),
+        # Swaps of a transaction (interface)
+        IndexModel([("transaction_hash", ASCENDING)]),
+        # Latest recorded block (interface's reorg horizon)
+        IndexModel(EVENTS_ORDER),
+        # Prices of a pool in a time range (swaps price source)
+        IndexModel([("address", ASCENDING), ("timestamp", ASCENDING)]),
+    ],
+    CANDLES_COLLECTION: [
+        IndexModel(
+            [("address", ASCENDING), ("granularity", ASCENDING), ("bucket", ASCENDING)]
+        ),
+    ],
+    # Point reads by the transaction hash as the id only
+    GAS_COLLECTION: [],
+}
+
+# The indexes of the event collections in the time-series layout,
+# which only supports indexes on the meta and time fields
+TIMESERIES_INDEXES: dict[str, list[IndexModel]] = {
+    "swaps": [
+        IndexModel(
+            [
+                (f"{TIMESERIES_META_FIELD}.event_id", ASCENDING),
+                (f"{TIMESERIES_META_FIELD}.address", ASCENDING),
+                (TIMESERIES_TIME_FIELD, ASCENDING),
+            ]
+        ),
+        IndexModel(
+            [
+                (f"{TIMESERIES_META_FIELD}.event_id", ASCENDING),
+                (TIMESERIES_TIME_FIELD, ASCENDING),
+            ]
+        ),
+    ],
+}
+
+# Representative queries of each access pattern, for the explain diagnostics,
+# also matching the series and time of the buckets in the time-series layout
+QUERY_SHAPES: dict[str, QueryShape] = {
+    "swaps-by-pool-and-blocks": {
+        "collection": "swaps",
+        "filter": {
+            "event_id": "uniswap-v3-pool-swap",
+            "address": "0x88e6a0c2ddd26feeb64f039a2c41296fcb3f5640",
+            "block_number": {"$gte": 0, "$lte": 2**62},
+        },
+        "sort": EVENTS_ORDER,
+    },
+    "swaps-by-blocks": {
+        "collection": "swaps",
+        "filter": {
+            "event_id": "uniswap-v3-pool-swap",
+            "block_number": {"$gte": 0, "$lte": 2**62},
+        },
+        "sort": EVENTS_ORDER,
+    },
+    "swaps-by-transaction": {
+        "collection": "swaps",
+        "filter": {"event_id": "uniswap-v3-pool-swap", "transaction_hash": "0x0"},
+        "sort": EVENTS_ORDER,
+    },
+    "swaps-latest-block": {
+        "collection": "swaps",
+        "filter": {},
+        "sort": [("block_number", DESCENDING)],
+    },
+    "swaps-prices-by-time": {
+        "collection": "swaps",
+        "filter": {
+            "event_id": "uniswap-v3-pool-swap",
+            "address": "0x88e6a0c2ddd26feeb64f039a2c41296fcb3f5640",
+            # Within the times of the time-series layout
+            "timestamp": {"$gte": 0, "$lte": 2**32},
+        },
+        "sort": [("timestamp", ASCENDING)],
+    },
+    "candles-by-pool-and-time": {
+        "collection": CANDLES_COLLECTION,
+        "filter": {
+            "address": "0x88e6a0c2ddd26feeb64f039a2c41296fcb3f5640",
+            "granularity": "1m",
+            "bucket": {"$gte": 0, "$lte": 2**62},
+        },
+        "sort": [("bucket", ASCENDING)],
+    },
+    "gas-by-transaction": {
+        "collection": GAS_COLLECTION,
+        "filter": {"_id": "0x0"},
+        "sort": [],
+    },
+}
+
+
+class IndexManager:
+    """
+    Ensures the database has exactly the managed indexes of each collection,
+    explains how the representative queries use them, and reports their sizes.
+    """
+
+    __logger: RecordingLogger
+    __database: AsyncIOMotorDatabase
+    __storage_layout: str
+
+    def __init__(
+        self,
+        logger: RecordingLogger,
+        storage_layout: str = "documents",
+        database_config: Optional[DatabaseConfig] = None,
+    ):
+        if storage_layout not in STORAGE_LAYOUTS:
+            raise ValueError(f'"storage_layout" must be one of {list(STORAGE_LAYOUTS)}')
+
+        self.__logger = logger
+        self.__database = MongoClientFactory.get_database(database_config)
+        self.__storage_layout = storage_layout
+
+    def ensure_synchronously(self) -> None:
+        """
+        Ensures the indexes synchronously.
+        """
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(self.ensure_asynchronously())
+
+    async def ensure_asynchronously(self) -> None:
+        """
+        Creates the missing managed indexes and drops the unmanaged ones
+        of every collection whose indexes are not at the current version
+        or layout yet.
+
+        The event collections missing in the time-series storage layout
+        are created as time-series collections first.
+        """
+        versions = self.__database[INDEX_VERSIONS_COLLECTION]
+
+        for collection_name, indexes in MANAGED_INDEXES.items():
+            layout = await self.__get_layout(collection_name)
+            if layout == "timeseries":
+                indexes = TIMESERIES_INDEXES[collection_name]
+
+            applied = await versions.find_one({"_id": collection_name})
+            if applied == {
+                "_id": collection_name,
+                "version": INDEXES_VERSION,
+                "layout": layout,
+            }:
+                continue
+
+            collection = self.__database[collection_name]
+
+            if indexes:
+                await collection.create_indexes(indexes)
+
+            managed = {"_id_"} | {index.document["name"] for index in indexes}
+            for name in await collection.index_information():
+                if name not in managed:
+                    self.__logger.info(f"Dropping index {collection_name}.{name}")
+                    await collection.drop_index(name)
+
+            await versions.update_one(
+                {"_id": collection_name},
+                {"$set": {"version": INDEXES_VERSION, "layout": layout}},
+                upsert=True,
+            )
+            self.__logger.info(
+                f"Indexes of {collection_name} at version {INDEXES_VERSION}"
+            )
+
+    def explain_synchronously(self) -> dict[str, dict[str, Any]]:
+        """
+        Explains the query shapes synchronously.
+
+        Returns:
+            The summaries of the query plans by the query shape names.
+        """
+        loop = asyncio.get_event_loop()
+        return loop.run_until_complete(self.explain_asynchronously())
+
+    async def explain_asynchronously(self) -> dict[str, dict[str, Any]]:
+        """
+        Explains the query shapes asynchronously, as queried in the layout
+        of their collections.
+
+        Returns:
+            The summaries of the query plans by the query shape names.
+        """
+        summaries = {}
+        layouts: dict[str, bool] = {}
+
+        for name, shape in QUERY_SHAPES.items():
+            collection_name = shape["collection"]
+            if collection_name not in layouts:
+                layouts[collection_name] = (
+                    collection_name in TIMESERIES_INDEXES
+                    and await TimeSeriesWriter.is_timeseries(
+                        self.__database, collection_name
+                    )
+                )
+
+            query, sort = shape["filter"], shape["sort"]
+            if layouts[collection_name]:
+                query = TimeSeriesWriter.to_series_query(query)
+                sort = [
+                    (TIMESERIES_TIME_FIELD if field == "timestamp" else field, order)
+                    for field, order in sort
+                ]
+
+            cursor = self.__database[collection_name].find(query)
+            if sort:
+                cursor = cursor.sort(sort)
+
+            explanation = await cursor.limit(1).explain()
+            summaries[name] = self.summarize(explanation)
+
+        return summaries
+
+    def stats_synchronously(self) -> dict[str, dict[str, Any]]:
+        """
+        Gets the storage statistics synchronously.
+
+        Returns:
+            The storage statistics by the collection names.
+        """
+        loop = asyncio.get_event_loop()
+        return loop.run_until_complete(self.stats_asynchronously())
+
+    async def stats_asynchronously(self) -> dict[str, dict[str, Any]]:
+        """
+        Gets the storage statistics of the managed collections asynchronously,
+        e.g., to compare the sizes of the documents' schema versions.
+
+        Returns:
+            The storage statistics by the collection names.
+        """
+        stats = {}
+
+        for collection_name in MANAGED_INDEXES:
+            result = await self.__database.command("collStats", collection_name)
+            stats[collection_name] = {
+                "count": result["count"],
+                "size": result["size"],
+                "average_document_size": result.get("avgObjSize", 0),
+                "storage_size": result["storageSize"],
+                "index_sizes": result["indexSizes"],
+                "total_index_size": result["totalIndexSize"],
+            }
+
+        return stats
+
+    @staticmethod
+    def summarize(explanation: dict[str, Any]) -> dict[str, Any]:
+        """
+        Summarizes an explain output into its winning plan's stages
+        and its execution statistics.
+
+        Args:
+            explanation: The explain output of a query.
+
+        Returns:
+            The summary, where an in-memory "SORT" or a "COLLSCAN" stage
+            means the query is not served by an index.
+        """
+        stages = []
+        plan = explanation["queryPlanner"]["winningPlan"]
+
+        while plan is not None:
+            stage = plan["stage"]
+            if "indexName" in plan:
+                stage = f"{stage}({plan['indexName']})"
+            stages.append(stage)
+            plan = plan.get("inputStage")
+
+        statistics = explanation.get("executionStats", {})
+
+        return {
+            "plan": " > ".join(stages),
+            "keys_examined": statistics.get("totalKeysExamined"),
+            "documents_examined": statistics.get("totalDocsExamined"),
+            "returned": statistics.get("nReturned"),
+        }
+
+    # ---------
+    # Helpers
+    # ---------
+
+    async def __get_layout(self, collection_name: str) -> str:
+        """
+        Gets the storage layout of a collection, creating the event collections
+        as time-series collections if missing in the time-series layout.
+
+        Args:
+            collection_name: The name of the collection.
+
+        Returns:
+            The storage layout of the collection.
+        """
+        if collection_name not in TIMESERIES_INDEXES:
+            return "documents"
+
+        if self.__storage_layout == "timeseries":
+            is_timeseries = await TimeSeriesWriter.ensure_collection(
+                self.__database, collection_name
+            )
+        else:
+            is_timeseries = await TimeSeriesWriter.is_timeseries(
+                self.__database, collection_name
+            )
+
+        return "timeseries" if is_timeseries else "documents"
@@ -0,0 +1,187 @@
+# Standard libraries
+from typing import Any, Iterable, Union
+
+# 3rd party libraries
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+# Code
+from src.events import EventRecord
+from .schema import DocumentSchema
+
+# Constants
+# "insert" for fresh backfills, "replace" for re-runs, and "upsert" to merge
+WRITE_MODES = ("insert", "replace", "upsert")
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+
+class RecordsWriter:
+    """
+    Static class to bulk write event records into their category's collection
+    with one of the write modes.
+    """
+
+    @staticmethod
+    async def write(
+        collection: AsyncIOMotorCollection,
+        records: list[EventRecord],
+        mode: str,
+        schema_version: int = 1,
+        ordered: bool = False,
+    ) -> list[int]:
+        """
+        Writes the records with a write mode:
+        - "insert" inserts them, and only upserts the duplicates.
+        - "replace" inserts them, and only replaces the duplicates whole.
+        - "upsert" sets their fields, inserting the missing ones.
+
+        Args:
+            collection: The collection of the records' category.
+            records: The records to write.
+            mode: The write mode.
+            schema_version: The schema version to encode the documents into.
+            ordered: Whether to write the records serially in order,
+                stopping at the first error, rather than in parallel.
+
+        Raises:
+            ValueError: If the write mode or schema version is unknown.
+
+        Returns:
+            The indices of the newly inserted records, in order.
+        """
+        keys = [record.key for record in records]
+        documents = [
+            DocumentSchema.encode(record.to_document(), schema_version)
+            for record in records
+        ]
+
+        if mode in ("insert", "replace"):
+            return await RecordsWriter.__insert_first(
+                collection, keys, documents, ordered, mode == "replace"
+            )
+
+        if mode != "upsert":
+            raise ValueError(f'"write_mode" must be one of {list(WRITE_MODES)}')
+
+        upserts = RecordsWriter.__get_upserts(keys, documents, range(len(records)))
+        result = await collection.bulk_write(upserts, ordered=ordered)
+
+        return sorted(result.upserted_ids)
+
+    @staticmethod
+    async def get_written(
+        collection: AsyncIOMotorCollection, records: list[EventRecord]
+    ) -> set[str]:
+        """
+        Looks up the keys of the records already written, through the id index.
+
+        Args:
+            collection: The collection of the records' category.
+            records: The records to look up.
+
+        Returns:
+            The keys written.
+        """
+        if not records:
+            return set()
+
+        written = await collection.distinct(
+            "_id", {"_id": {"$in": [record.key for record in records]}}
+        )
+
+        return set(written)
+
+    # ---------
+    # Helpers
+    # ---------
+
+    @staticmethod
+    async def __insert_first(
+        collection: AsyncIOMotorCollection,
+        keys: list[str],
+        documents: list[dict[str, Any]],
+        ordered: bool,
+        replace: bool,
+    ) -> list[int]:
+        """
+        Inserts the documents, upserting or replacing only those already written.
+
+        Args:
+            collection: The collection of the records' category.
+            keys: The keys of the records.
+            documents: The encoded documents of the records.
+            ordered: Whether to insert the documents serially in order.
+            replace: Whether to replace the documents already written whole
+                rather than set their fields.
+
+        Raises:
+            BulkWriteError: If any insert fails for other than a duplicate key.
+
+        Returns:
+            The indices of the newly inserted records, in order.
+        """
+        duplicates: list[int] = []
+        start = 0
+
+        while start < len(documents):
+            try:
+                await collection.insert_many(
+                    [
+                        {"_id": key, **document}
+                        for key, document in zip(keys[start:], documents[start:])
+                    ],
+                    ordered=ordered,
+                )
+                break
+
+            except BulkWriteError as e:
+                if e.details.get("writeConcernErrors"):
+                    raise
+
+                for error in e.details["writeErrors"]:
+                    if error["code"] != DUPLICATE_KEY_ERROR_CODE:
+                        raise
+                    duplicates.append(start + error["index"])
+
+                # Ordered inserts stop at the first duplicate, so resume after it
+                start = duplicates[-1] + 1 if ordered else len(documents)
+
+        if not duplicates:
+            return list(range(len(documents)))
+
+        operations: list[Union[ReplaceOne, UpdateOne]]
+        if replace:
+            operations = [
+                ReplaceOne({"_id": keys[i]}, documents[i], upsert=True)
+                for i in duplicates
+            ]
+        else:
+            operations = RecordsWriter.__get_upserts(keys, documents, duplicates)
+
+        result = await collection.bulk_write(operations, ordered=ordered)
+
+        # Those upserted were removed since the insert
+        written = set(duplicates).difference(duplicates[i] for i in result.upserted_ids)
+
+        return [i for i in range(len(documents)) if i not in written]
+
+    @staticmethod
+    def __get_upserts(
+        keys: list[str], documents: list[dict[str, Any]], indices: Iterable[int]
+    ) -> list[UpdateOne]:
+        """
+        Builds the upserts setting the fields of some of the records.
+
+        Args:
+            keys: The keys of the records.
+            documents: The encoded documents of the records.
+            indices: The indices of the records to upsert.
+
+        Returns:
+            The list of upserts for a bulk write.
+        """
+        return [
+            UpdateOne({"_id": keys[i]}, {"$set": documents[i]}, upsert=True)
+            for i in indices
+        ]
@@ -0,0 +1,169 @@
+# Standard libraries
+from decimal import Decimal
+from typing import Any
+import re
+
+# 3rd party libraries
+from bson.decimal128 import Decimal128
+
+# Code
+from src.events import ProcessedLog
+
+# Constants
+# 1 stores the hex and integer fields as strings, 2 stores them compactly
+SCHEMA_VERSIONS = (1, 2)
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+DECIMAL128_MAX_DIGITS = 34
+_INTEGER_PATTERN = re.compile(r"-?\d+")
+_HEX_PATTERN = re.compile(r"0x(?:[0-9a-fA-F]{2})*")
+
+
+class DocumentSchema:
+    """
+    Static class to encode event documents into a schema version
+    and to decode them back into the string form of the first version.
+
+    The second version stores the transaction hash, topics and raw data
+    as binary, and the integers as int64 or Decimal128 where they fit,
+    falling back to strings for the integers or hex strings that do not.
+    """
+
+    @staticmethod
+    def encode(document: ProcessedLog, version: int) -> dict[str, Any]:
+        """
+        Encodes an event document into a schema version.
+
+        Args:
+            document: The event document in the string form.
+            version: The schema version to encode into.
+
+        Raises:
+            ValueError: If the schema version is unknown.
+
+        Returns:
+            The encoded document.
+        """
+        if version not in SCHEMA_VERSIONS:
+            raise ValueError(f'"schema_version" must be one of {list(SCHEMA_VERSIONS)}')
+
+        if version == 1:
+            return dict(document)
+
+        return {
+            **document,
+            "schema_version": version,
+            "transaction_hash": DocumentSchema.encode_hex(document["transaction_hash"]),
+            "gas_used": DocumentSchema.encode_integer(int(document["gas_used"])),
+            "gas_price_wei": DocumentSchema.encode_integer(
+                int(document["gas_price_wei"])
+            ),
+            "gas_price_quote": {
+                "currency": document["gas_price_quote"]["currency"],
+                "value": DocumentSchema.encode_integer(
+                    int(document["gas_price_quote"]["value"])
+                ),
+            },
+            "topics": [
+                DocumentSchema.encode_hex(topic) for topic in document["topics"]
+            ],
+            "raw_data": DocumentSchema.encode_hex(document["raw_data"]),
+            "data": {
+                key: DocumentSchema.encode_integer(int(value))
+                if _INTEGER_PATTERN.fullmatch(value)
+                else value
+                for key, value in document["data"].items()
+            },
+        }
+
+    @staticmethod
+    def decode(document: dict[str, Any]) -> dict[str, Any]:
+        """
+        Decodes an event document of any schema version into the string form,
+        leaving out the fields it does not have (e.g., when projected).
+
+        Args:
+            document: The stored event document.
+
+        Returns:
+            The decoded document.
+        """
+        decoded = dict(document)
+        decoded.pop("schema_version", None)
+
+        for field in ("transaction_hash", "gas_used", "gas_price_wei", "raw_data"):
+            if field in decoded:
+                decoded[field] = DocumentSchema.decode_value(decoded[field])
+
+        if "gas_price_quote" in decoded:
+            decoded["gas_price_quote"] = {
+                key: DocumentSchema.decode_value(value) if key == "value" else value
+                for key, value in decoded["gas_price_quote"].items()
+            }
+
+        if "topics" in decoded:
+            decoded["topics"] = [
+                DocumentSchema.decode_value(topic) for topic in decoded["topics"]
+            ]
+
+        if "data" in decoded:
+            decoded["data"] = {
+                key: DocumentSchema.decode_value(value)
+                for key, value in decoded["data"].items()
+            }
+
+        return decoded
+
+    @staticmethod
+    def encode_integer(value: int) -> Any:
+        """
+        Encodes an integer into the most compact type it fits exactly.
+
+        Args:
+            value: The integer to encode.
+
+        Returns:
+            The int64, the Decimal128, or the decimal string if neither fits.
+        """
+        if INT64_MIN <= value <= INT64_MAX:
+            return value
+
+        if len(str(abs(value))) <= DECIMAL128_MAX_DIGITS:
+            return Decimal128(Decimal(value))
+
+        return str(value)
+
+    @staticmethod
+    def encode_hex(value: str) -> Any:
+        """
+        Encodes a hex string into binary.
+
+        Args:
+            value: The "0x"-prefixed hex string to encode.
+
+        Returns:
+            The binary, or the hex string if it is not of whole bytes.
+        """
+        if not _HEX_PATTERN.fullmatch(value):
+            return value
+
+        return bytes.fromhex(value[2:])
+
+    @staticmethod
+    def decode_value(value: Any) -> str:
+        """
+        Decodes an encoded integer or hex field back into its string form.
+
+        Args:
+            value: The stored value.
+
+        Returns:
+            The decimal string of integers, or the hex string of binaries.
+        """
+        if isinstance(value, bytes):
+            return f"0x{value.hex()}"
+
+        if isinstance(value, Decimal128):
+            return str(int(value.to_decimal()))
+
+        return str(value)
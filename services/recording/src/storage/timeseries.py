@@ -0,0 +1,226 @@
+# Standard libraries
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+# 3rd party libraries
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+
+# Code
+from src.events import EventRecord
+from .schema import DocumentSchema
+
+# Constants
+# "documents" stores one document per event, "timeseries" buckets them
+STORAGE_LAYOUTS = ("documents", "timeseries")
+TIMESERIES_TIME_FIELD = "time"
+TIMESERIES_META_FIELD = "meta"
+TIMESERIES_SERIES_FIELDS = ("event_id", "address")
+TIMESERIES_OPTIONS = {
+    "timeField": TIMESERIES_TIME_FIELD,
+    "metaField": TIMESERIES_META_FIELD,
+    "granularity": "seconds",
+}
+
+
+class TimeSeriesWriter:
+    """
+    Static class to write event records into time-series collections,
+    which store the events of a series (the event id and the contract address)
+    in compressed buckets of time instead of a document each.
+
+    The measurements keep the fields of the event documents as they are,
+    such that they are read as before, along with the time of the timestamp
+    and the series as the meta field for the buckets to be queried by.
+    """
+
+    @staticmethod
+    async def ensure_collection(database: AsyncIOMotorDatabase, name: str) -> bool:
+        """
+        Creates a time-series collection if it does not exist yet.
+
+        Args:
+            database: The database of the collection.
+            name: The name of the collection.
+
+        Returns:
+            Whether the collection is a time-series collection.
+        """
+        collections = await database.list_collections(filter={"name": name})
+        existing = await collections.to_list(1)
+
+        if not existing:
+            await database.create_collection(name, timeseries=TIMESERIES_OPTIONS)
+            return True
+
+        return bool(existing[0]["type"] == "timeseries")
+
+    @staticmethod
+    async def is_timeseries(database: AsyncIOMotorDatabase, name: str) -> bool:
+        """
+        Args:
+            database: The database of the collection.
+            name: The name of the collection.
+
+        Returns:
+            Whether the collection exists as a time-series collection.
+        """
+        collections = await database.list_collections(
+            filter={"name": name, "type": "timeseries"}
+        )
+
+        return bool(await collections.to_list(1))
+
+    @staticmethod
+    async def write(
+        collection: AsyncIOMotorCollection,
+        records: list[EventRecord],
+        schema_version: int = 1,
+        ordered: bool = False,
+    ) -> list[int]:
+        """
+        Inserts the records not written yet.
+
+        Time-series collections do not enforce unique keys nor support upserts,
+        so the keys already written within the records' time range are looked up
+        first such that re-runs do not duplicate the events.
+
+        Args:
+            collection: The time-series collection of the records' category.
+            records: The records to write.
+            schema_version: The schema version to encode the documents into.
+            ordered: Whether to insert the records serially in order.
+
+        Returns:
+            The indices of the newly inserted records, in order.
+        """
+        if not records:
+            return []
+
+        written = await TimeSeriesWriter.get_written(collection, records)
+        inserted = []
+        measurements = []
+
+        for i, record in enumerate(records):
+            # Also skip the repeats within the records
+            if record.key in written:
+                continue
+            written.add(record.key)
+
+            document = DocumentSchema.encode(record.to_document(), schema_version)
+            measurements.append(TimeSeriesWriter.to_measurement(record.key, document))
+            inserted.append(i)
+
+        if measurements:
+            await collection.insert_many(measurements, ordered=ordered)
+
+        return inserted
+
+    @staticmethod
+    async def get_written(
+        collection: AsyncIOMotorCollection, records: list[EventRecord]
+    ) -> set[str]:
+        """
+        Looks up the keys of the records already written,
+        within the records' time range for the buckets to be pruned.
+
+        Args:
+            collection: The time-series collection of the records' category.
+            records: The records to look up.
+
+        Returns:
+            The keys written.
+        """
+        if not records:
+            return set()
+
+        timestamps = [record.timestamp for record in records]
+        written = await collection.distinct(
+            "_id",
+            {
+                "_id": {"$in": [record.key for record in records]},
+                TIMESERIES_TIME_FIELD: {
+                    "$gte": TimeSeriesWriter.to_time(min(timestamps)),
+                    "$lte": TimeSeriesWriter.to_time(max(timestamps)),
+                },
+            },
+        )
+
+        return set(written)
+
+    @staticmethod
+    def to_measurement(key: str, document: dict[str, Any]) -> dict[str, Any]:
+        """
+        Converts an event document into a measurement of its series.
+
+        Args:
+            key: The unique key of the event.
+            document: The encoded event document.
+
+        Returns:
+            The measurement.
+        """
+        return {
+            "_id": key,
+            TIMESERIES_TIME_FIELD: TimeSeriesWriter.to_time(document["timestamp"]),
+            TIMESERIES_META_FIELD: {
+                field: document[field] for field in TIMESERIES_SERIES_FIELDS
+            },
+            **document,
+        }
+
+    @staticmethod
+    def to_series_query(
+        query: dict[str, Any],
+        from_timestamp: Optional[int] = None,
+        to_timestamp: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """
+        Adds the conditions on the meta and time fields to an events query,
+        such that only the buckets of the matching series and time range
+        are unpacked. The measurements keep the fields of the event documents,
+        so the original conditions still apply as they are.
+
+        Args:
+            query: The events query.
+            from_timestamp: The smallest timestamp of the events, if the query
+                is not on their timestamps, e.g., bounding the time of their blocks.
+            to_timestamp: The largest timestamp of the events, likewise.
+
+        Returns:
+            The events query with the series and time conditions.
+        """
+        series_query = dict(query)
+
+        for field in TIMESERIES_SERIES_FIELDS:
+            if isinstance(query.get(field), str):
+                series_query[f"{TIMESERIES_META_FIELD}.{field}"] = query[field]
+
+        time_query: dict[str, int] = query.get("timestamp", {})
+        if not time_query:
+            time_query = {
+                operator: timestamp
+                for operator, timestamp in (
+                    ("$gte", from_timestamp),
+                    ("$lte", to_timestamp),
+                )
+                if timestamp is not None
+            }
+
+        if time_query:
+            series_query[TIMESERIES_TIME_FIELD] = {
+                operator: TimeSeriesWriter.to_time(timestamp)
+                for operator, timestamp in time_query.items()
+            }
+
+        return series_query
+
+    @staticmethod
+    def to_time(timestamp: int) -> datetime:
+        """
+        Args:
+            timestamp: The unix timestamp in seconds.
+
+        Returns:
+            The time of the timestamp in UTC.
+        """
+        return datetime.fromtimestamp(timestamp, timezone.utc)
@@ -0,0 +1,22 @@
+# Standard libraries
+from typing import Any, TypedDict, Union
+
+
+class QueryShape(TypedDict):
+    collection: str
+    filter: dict[str, Any]
+    sort: list[tuple[str, int]]
+
+
+class DatabaseConfig(TypedDict, total=False):
+    # The connections of the pool, 100 and 0 by default
+    max_pool_size: int
+    min_pool_size: int
+    # How long an idle connection is kept in the pool, forever by default
+    max_idle_time_ms: int
+    # Any of "zstd", "snappy", and "zlib", in order of preference
+    compressors: list[str]
+    # The default write concern, e.g., 1 (default), "majority", or 0
+    write_concern: Union[int, str]
+    # Whether writes wait for the journal
+    journal: bool
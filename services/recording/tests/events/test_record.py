@@ -0,0 +1,62 @@
+# Code
+from src.events.record import EventRecord as Cls
+
+
+def get_instance():
+    return Cls(
+        event_id="event_id",
+        transaction_hash="0x123",
+        log_index=5,
+        block_number=123456,
+        timestamp=123456789,
+        gas_used=123456,
+        gas_price_wei=10**20,
+        gas_price_quote_value=10**30,
+        quote_currency="SGD",
+        address="0x456",
+        topics=["0x789"],
+        raw_data="0xabc",
+        data={"sender": "0x111"},
+    )
+
+
+def test_initialization_and_magics():
+    instance = get_instance()
+    assert instance.__repr__() == "EventRecord(event_id: 0x123-5)"
+
+
+def test_slotted():
+    # Should not carry a per-instance dictionary
+    assert not hasattr(get_instance(), "__dict__")
+
+
+def test_key():
+    assert get_instance().key == "0x123-5"
+
+
+def test_to_document():
+    # Large integers should only be stringified into the document
+    assert get_instance().to_document() == {
+        "event_id": "event_id",
+        "transaction_hash": "0x123",
+        "log_index": 5,
+        "block_number": 123456,
+        "timestamp": 123456789,
+        "gas_used": "123456",
+        "gas_price_wei": str(10**20),
+        "gas_price_quote": {"currency": "SGD", "value": str(10**30)},
+        "address": "0x456",
+        "topics": ["0x789"],
+        "raw_data": "0xabc",
+        "data": {"sender": "0x111"},
+    }
+
+
+def test_from_document():
+    instance = get_instance()
+
+    # Should convert the document back into the same record
+    record = Cls.from_document(instance.to_document())
+    assert all(
+        getattr(record, slot) == getattr(instance, slot) for slot in Cls.__slots__
+    )
@@ -0,0 +1,190 @@
+# Standard libraries
+from datetime import datetime, timezone
+from decimal import Decimal
+import os
+
+# 3rd party libraries
+from asynctest import CoroutineMock, MagicMock, patch
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+# Code
+from src.export.exporter import EventsExporter as Cls
+
+# Constants
+MOCKED_DOCUMENT = {
+    "event_id": "uniswap-v3-pool-swap",
+    "transaction_hash": "0x123",
+    "log_index": 1,
+    "block_number": 100,
+    "timestamp": 1000,
+    "address": "0xabc",
+    "gas_used": "21000",
+    "gas_price_wei": "30000000000",
+    "gas_price_quote": {"currency": "USDT", "value": "1234567"},
+    "data": {
+        "sender": "0x1",
+        "recipient": "0x2",
+        "symbol_0": "USDC",
+        "symbol_1": "WETH",
+        "amount_0": "-1000",
+        "amount_1": str(10**40),
+        "swap_price_0": "563684536609611",
+        "swap_price_1": "1774041920000000000000",
+    },
+}
+
+
+class MockedCursor:
+    def __init__(self, documents):
+        self.__documents = list(documents)
+
+    async def to_list(self, length):
+        batch = self.__documents[:length]
+        self.__documents = self.__documents[length:]
+        return batch
+
+
+@patch("src.export.exporter.MongoClientFactory")
+def get_instance(factory, documents=(), layout="documents"):
+    collection = factory.get_database()["swaps"]
+    collection.find().sort.return_value = MockedCursor(documents)
+    collection.find().allow_disk_use().sort.return_value = MockedCursor(documents)
+
+    # The collections are time-series ones in the time-series layout only
+    collections = [{"name": "swaps", "type": layout}] if layout == "timeseries" else []
+    factory.get_database().list_collections = CoroutineMock(
+        return_value=MockedCursor(collections)
+    )
+
+    return Cls(MagicMock()), collection
+
+
+def test_initialization_without_environment_variables():
+    with patch.dict(os.environ, {}, clear=True):
+        # Should raise a value error
+        with pytest.raises(ValueError):
+            Cls(MagicMock())
+
+
+QUERY_PARAMETERS = [
+    (
+        {"from_block": 1, "to_block": 2},
+        {"event_id": "e", "block_number": {"$gte": 1, "$lte": 2}},
+    ),
+    (
+        {"from_time": 1, "to_time": 2, "contract_address": "0xabc"},
+        {"event_id": "e", "timestamp": {"$gte": 1, "$lte": 2}, "address": "0xabc"},
+    ),
+]
+
+
+@pytest.mark.parametrize("kwargs,query", QUERY_PARAMETERS)
+def test_get_query(kwargs, query):
+    # Should filter by the given range
+    assert Cls.get_query("e", **kwargs) == query
+
+
+def test_get_query_without_range():
+    # Should raise a value error
+    with pytest.raises(ValueError):
+        Cls.get_query("e", from_block=1, to_time=2)
+
+
+READ_PARAMETERS = [
+    ("arrow", lambda path: pa.ipc.open_stream(pa.OSFile(str(path))).read_all()),
+    ("parquet", lambda path: pq.read_table(str(path))),
+]
+
+
+@pytest.mark.parametrize("fmt,read", READ_PARAMETERS)
+@patch("src.export.exporter.EXPORT_BATCH_SIZE", 2)
+def test_export(fmt, read, tmp_path):
+    instance, collection = get_instance(documents=3 * [MOCKED_DOCUMENT])
+    path = tmp_path / f"swaps.{fmt}"
+
+    exported = instance.export_synchronously(
+        "uniswap-v3-pool-swap", str(path), fmt, from_block=1, to_block=200
+    )
+
+    # Should query the range in (block_number, log_index) order
+    assert exported == 3
+    collection.find.assert_called_with(
+        {"event_id": "uniswap-v3-pool-swap", "block_number": {"$gte": 1, "$lte": 200}},
+        batch_size=2,
+    )
+    collection.find().sort.assert_called_with([("block_number", 1), ("log_index", 1)])
+
+    # Should write the events with the integers typed
+    table = read(path)
+    row = table.to_pylist()[0]
+    assert table.num_rows == 3
+    assert row["gas_price_wei"] == 30000000000
+    assert row["gas_price_quote_currency"] == "USDT"
+    assert row["amount_0"] == Decimal(-1000)
+    assert row["amount_1"] == Decimal(10**40)
+    assert row["symbol_1"] == "WETH"
+
+
+def test_export_in_timeseries_layout(tmp_path):
+    instance, collection = get_instance(
+        documents=[MOCKED_DOCUMENT], layout="timeseries"
+    )
+
+    exported = instance.export_synchronously(
+        "uniswap-v3-pool-swap",
+        str(tmp_path / "swaps.arrow"),
+        "arrow",
+        from_time=60,
+        to_time=120,
+    )
+
+    # Should also match the series and time range of the buckets
+    assert exported == 1
+    collection.find.assert_called_with(
+        {
+            "event_id": "uniswap-v3-pool-swap",
+            "timestamp": {"$gte": 60, "$lte": 120},
+            "meta.event_id": "uniswap-v3-pool-swap",
+            "time": {
+                "$gte": datetime(1970, 1, 1, 0, 1, tzinfo=timezone.utc),
+                "$lte": datetime(1970, 1, 1, 0, 2, tzinfo=timezone.utc),
+            },
+        },
+        batch_size=5000,
+    )
+
+    # Should sort the unindexed events order in memory
+    collection.find().allow_disk_use.assert_called_with(True)
+
+
+@pytest.mark.parametrize("amount", [10**76, -(10**76)])
+def test_export_beyond_the_decimal_precision(amount, tmp_path):
+    document = {**MOCKED_DOCUMENT, "data": {**MOCKED_DOCUMENT["data"]}}
+    document["data"]["amount_1"] = str(amount)
+    instance, _collection = get_instance(documents=[MOCKED_DOCUMENT, document])
+
+    # Should raise a value error naming the event and its field
+    with pytest.raises(ValueError, match='"0x123-1" has "amount_1" of 77 digits'):
+        instance.export_synchronously(
+            "uniswap-v3-pool-swap",
+            str(tmp_path / "swaps.arrow"),
+            "arrow",
+            from_block=1,
+            to_block=200,
+        )
+
+
+def test_export_with_unknown_format(tmp_path):
+    instance, _collection = get_instance()
+
+    # Should raise a value error
+    with pytest.raises(ValueError):
+        instance.export_synchronously(
+            "uniswap-v3-pool-swap",
+            str(tmp_path / "swaps"),
+            "xml",
+            from_block=1,
+            to_block=2,
+        )
@@ -0,0 +1,21 @@
+# 3rd party libraries
+import pyarrow as pa
+import pytest
+
+# Code
+from src.export.schemas import ExportSchemaResolver as Cls
+
+
+def test_get_schema():
+    schema = Cls.get_schema("uniswap-v3-pool-swap")
+
+    # Should append the event's data columns to the base columns
+    assert schema.names[:2] == ["transaction_hash", "log_index"]
+    assert schema.names[-1] == "swap_price_1"
+    assert schema.field("amount_0").type == pa.decimal256(76, 0)
+
+
+def test_get_schema_of_unknown_event():
+    # Should raise a value error
+    with pytest.raises(ValueError):
+        Cls.get_schema("unknown-event")
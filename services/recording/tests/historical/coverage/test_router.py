@@ -0,0 +1,68 @@
+# 3rd party libraries
+from asynctest import CoroutineMock, MagicMock, patch
+from fastapi.testclient import TestClient
+import pytest
+
+# Code
+from src.historical.app import app
+
+# The mocked app client
+client = TestClient(app)
+
+
+@patch("src.historical.coverage.router.MongoClientFactory")
+@patch("src.historical.coverage.router.CoverageLedger")
+def test_get_missing_ranges(ledger: MagicMock, _factory: MagicMock):
+    ledger().get_missing = CoroutineMock(return_value=[(100, 149), (300, 500)])
+
+    response = client.get(
+        "/api/rpc/v1/coverage/get_missing_ranges",
+        params={
+            "event_id": "event_id",
+            "contract_address": "0x123456789",
+            "from_block": 100,
+            "to_block": 500,
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "event_id": "event_id",
+        "contract_address": "0x123456789",
+        "from_block": 100,
+        "to_block": 500,
+        "missing_ranges": [[100, 149], [300, 500]],
+    }
+    ledger().get_missing.assert_awaited_once_with("event_id", "0x123456789", 100, 500)
+
+
+GET_MISSING_RANGES_BAD_PARAMETERS = [
+    # From block > To block
+    ("event_id", "0x123456789", 500, 100),
+    # Missing parameters
+    ("", "0x123456789", 100, 500),
+    ("event_id", "", 100, 500),
+    ("event_id", "0x123456789", -100, 500),
+    ("event_id", "0x123456789", 100, -500),
+]
+
+
+@pytest.mark.parametrize(
+    "event_id,contract_address,from_block,to_block", GET_MISSING_RANGES_BAD_PARAMETERS
+)
+@patch("src.historical.coverage.router.CoverageLedger")
+def test_get_missing_ranges_bad_request(
+    ledger: MagicMock, event_id, contract_address, from_block, to_block
+):
+    response = client.get(
+        "/api/rpc/v1/coverage/get_missing_ranges",
+        params={
+            "event_id": event_id,
+            "contract_address": contract_address,
+            "from_block": from_block,
+            "to_block": to_block,
+        },
+    )
+
+    assert response.status_code == 400
+    ledger.assert_not_called()
@@ -0,0 +1,37 @@
+# Code
+from src.historical.tasks.batch.helpers.columns import EventLogBatch as Cls
+
+# Constants
+MOCKED_EVENT_LOG = {
+    "address": "0x123",
+    "topics": ["0x123456789"],
+    "data": "0xa1b2c3d4e5",
+    "blockNumber": "0x123",
+    "timeStamp": "0x000001",
+    "gasPrice": "0x0ba43b7400",
+    "gasUsed": "0x456",
+    "logIndex": "0x12",
+    "transactionHash": "0x123456789",
+    "transactionIndex": "0x123",
+}
+
+
+def test_initialization_and_magics():
+    instance = Cls([MOCKED_EVENT_LOG] * 3)
+    assert len(instance) == 3
+    assert instance.__repr__() == "EventLogBatch(3 event logs)"
+
+
+def test_empty_batch_is_falsy():
+    assert not Cls([])
+
+
+def test_decoded_columns():
+    instance = Cls([MOCKED_EVENT_LOG, {**MOCKED_EVENT_LOG, "blockNumber": "0x124"}])
+
+    # Each hexadecimal field should be decoded into its own column
+    assert list(instance.block_numbers) == [0x123, 0x124]
+    assert list(instance.timestamps) == [1, 1]
+    assert list(instance.gas_prices) == [50_000_000_000] * 2
+    assert list(instance.gas_used) == [0x456] * 2
+    assert list(instance.log_indexes) == [0x12] * 2
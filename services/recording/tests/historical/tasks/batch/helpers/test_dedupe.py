@@ -0,0 +1,61 @@
+# Code
+from src.events import EventRecord
+from src.historical.tasks.batch.helpers.dedupe import SeenRecords as Cls
+
+
+def get_record(block_number, log_index=0):
+    """Helper to create a record of a block"""
+    return EventRecord(
+        "id",
+        f"0x{block_number}",
+        log_index,
+        block_number,
+        1,
+        1,
+        1,
+        1,
+        "SGD",
+        "0x",
+        [],
+        "0x",
+        {},
+    )
+
+
+def get_keys(records):
+    """Helper to get the keys of records"""
+    return [record.key for record in records]
+
+
+def test_filter():
+    instance = Cls()
+    records = [get_record(1), get_record(1, 1), get_record(2)]
+
+    # Should let the unseen records through, including repeats within them
+    assert get_keys(instance.filter(records + records[:1])) == get_keys(records)
+    assert len(instance) == 3
+
+    # Should drop those seen before
+    assert get_keys(instance.filter([get_record(1, 1), get_record(3)])) == ["0x3-0"]
+    assert len(instance) == 4
+
+
+def test_filter_evicts_behind_horizon():
+    instance = Cls(horizon_blocks=10)
+    instance.filter([get_record(1), get_record(5)])
+
+    # Should evict the blocks further behind the latest than the horizon
+    instance.filter([get_record(14)])
+    assert len(instance) == 2
+
+    # Should let the evicted records through again
+    assert get_keys(instance.filter([get_record(1)])) == ["0x1-0"]
+    assert len(instance) == 2
+
+
+def test_get_digest():
+    # Should be compact and stable
+    digest = Cls.get_digest("0x123-0")
+    assert digest == Cls.get_digest("0x123-0")
+    assert digest != Cls.get_digest("0x123-1")
+    assert digest < 2**64
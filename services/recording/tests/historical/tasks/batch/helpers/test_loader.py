@@ -8,6 +8,20 @@ import pytest
 # Code
 from src.historical.tasks.batch.helpers.loader import BatchLoader as Cls
 
+# Constants
+MOCKED_EVENT_LOG = {
+    "address": "0x123",
+    "topics": ["0x123456789"],
+    "data": "0xa1b2c3d4e5",
+    "blockNumber": "0x123",
+    "timeStamp": "0x000001",
+    "gasPrice": "0x123",
+    "gasUsed": "0x456",
+    "logIndex": "0x123",
+    "transactionHash": "0x123456789",
+    "transactionIndex": "0x123",
+}
+
 
 def test_initialization():
     # Simple initialization no-error check
@@ -23,11 +37,11 @@ async def test_start_loadingf(aiohttp):
     response.json = CoroutineMock(
         side_effect=[
             # Regular response
-            {"result": [{"data": "The data dictionary"}]},
+            {"result": [MOCKED_EVENT_LOG]},
             # Empty (no events in block range)
             {"result": []},
             # Regular response
-            {"result": [{"data": "The data dictionary"}]},
+            {"result": [MOCKED_EVENT_LOG]},
         ]
     )
     session_context.get = CoroutineMock(return_value=response)
@@ -52,8 +66,86 @@ async def test_start_loadingf(aiohttp):
     # once for first and third responses
     # (second was empty and skipped)
     # once at the end to denote the end
-    assert mocked_output_queue.put.mock_calls == [
-        call([{"data": "The data dictionary"}]),
-        call([{"data": "The data dictionary"}]),
-        call([]),
+    batches = [c.args[0] for c in mocked_output_queue.put.mock_calls]
+    assert [batch.event_logs for batch in batches] == [
+        [MOCKED_EVENT_LOG],
+        [MOCKED_EVENT_LOG],
+        [],
+    ]
+
+    # Should request adjacent block ranges without overlapping
+    uris = [c.args[0] for c in session_context.get.call_args_list]
+    assert [uri.split("&fromBlock=")[1] for uri in uris] == [
+        "1&toBlock=5",
+        "6&toBlock=10",
+        "11&toBlock=15",
+    ]
+
+    # The batches should be decoded at load time
+    assert list(batches[0].block_numbers) == [0x123]
+
+
+def mock_responses(aiohttp, results):
+    """Helper to mock the session responding with the results in turn"""
+    session_context = aiohttp.ClientSession().__aenter__.return_value
+    response = MagicMock()
+    response.json = CoroutineMock(side_effect=[{"result": r} for r in results])
+    session_context.get = CoroutineMock(return_value=response)
+    return session_context
+
+
+@pytest.mark.asyncio
+@patch("src.historical.tasks.batch.helpers.loader.asyncio.sleep", CoroutineMock())
+@patch("src.historical.tasks.batch.helpers.loader.ETHERSCAN_MAX_RESULTS", 2)
+@patch("src.historical.tasks.batch.helpers.loader.aiohttp")
+async def test_start_loading_truncated_results(aiohttp):
+    # The whole range and its first half are truncated
+    session_context = mock_responses(
+        aiohttp,
+        [
+            2 * [MOCKED_EVENT_LOG],
+            2 * [MOCKED_EVENT_LOG],
+            [MOCKED_EVENT_LOG],
+            [MOCKED_EVENT_LOG],
+            [MOCKED_EVENT_LOG],
+        ],
+    )
+    mocked_output_queue = MagicMock()
+    mocked_output_queue.put = CoroutineMock()
+
+    await Cls(MagicMock(), "api_key").start_loading(
+        mocked_output_queue, "contract_address", "topic", 1, 10, 10
+    )
+
+    # Should load the truncated ranges again in halves
+    uris = [c.args[0] for c in session_context.get.call_args_list]
+    assert [uri.split("&fromBlock=")[1] for uri in uris] == [
+        "1&toBlock=10",
+        "1&toBlock=5",
+        "1&toBlock=3",
+        "4&toBlock=5",
+        "6&toBlock=10",
     ]
+
+    # Should still put the whole range as one batch
+    batches = [c.args[0] for c in mocked_output_queue.put.mock_calls]
+    assert [len(batch.event_logs) for batch in batches] == [3, 0]
+
+
+@pytest.mark.asyncio
+@patch("src.historical.tasks.batch.helpers.loader.asyncio.sleep", CoroutineMock())
+@patch("src.historical.tasks.batch.helpers.loader.ETHERSCAN_MAX_RESULTS", 2)
+@patch("src.historical.tasks.batch.helpers.loader.aiohttp")
+async def test_start_loading_truncated_block(aiohttp):
+    # A single block is truncated
+    mock_responses(aiohttp, [2 * [MOCKED_EVENT_LOG], 2 * [MOCKED_EVENT_LOG]])
+    mocked_output_queue = MagicMock()
+    mocked_output_queue.put = CoroutineMock()
+
+    # Should fail before putting the truncated range to be recorded
+    with pytest.raises(ValueError):
+        await Cls(MagicMock(), "api_key").start_loading(
+            mocked_output_queue, "contract_address", "topic", 1, 2, 2
+        )
+
+    mocked_output_queue.put.assert_not_called()
@@ -6,7 +6,9 @@ from asynctest import MagicMock, CoroutineMock, patch, call
 import pytest
 
 # Code
+from src.historical.tasks.batch.helpers.columns import EventLogBatch
 from src.historical.tasks.batch.helpers.processor import BatchProcessor as Cls
+from src.pricing import BinancePriceSource
 
 # Constants
 MOCKED_EVENT_LOG = {
@@ -34,7 +36,7 @@ MOCKED_BINANCE_KLINE = [
 
 
 def get_instance():
-    return Cls(MagicMock(), "ETH", "SGD")
+    return Cls(MagicMock(), BinancePriceSource("ETH", "SGD"))
 
 
 def test_initialization():
@@ -71,7 +73,11 @@ async def test_start_processing(aiohttp):
     input_queue = MagicMock()
     input_batch = [{**MOCKED_EVENT_LOG, "timeStamp": hex(t * 1000)} for t in range(20)]
     input_queue.get = CoroutineMock(
-        side_effect=[input_batch[:10], input_batch[10:], []]
+        side_effect=[
+            EventLogBatch(input_batch[:10]),
+            EventLogBatch(input_batch[10:]),
+            EventLogBatch([]),
+        ]
     )
     output_queue = MagicMock()
     output_queue.put = CoroutineMock()
@@ -95,3 +101,49 @@ async def test_start_processing(aiohttp):
 
     # Should put into output 3 times for 2 non-empty + 1 empty inputs
     assert len(output_queue.put.mock_calls) == 3
+
+
+def make_kline(minute, close_price):
+    """Helper to create a minute kline in Binance's format"""
+    open_time = minute * 60_000
+    return [open_time, "0.0", "0.0", "0.0", close_price, "0.0", open_time + 59_999]
+
+
+def make_event_log(timestamp):
+    """Helper to create an event log at a timestamp"""
+    return {**MOCKED_EVENT_LOG, "timeStamp": hex(timestamp), "gasPrice": "0x1"}
+
+
+@pytest.mark.asyncio
+@patch("src.historical.tasks.batch.helpers.processor.aiohttp")
+async def test_start_processing_matches_prices_out_of_order(aiohttp):
+    # Setup the klines with a distinct price each minute
+    klines = [make_kline(minute, f"{minute}.5") for minute in range(10)]
+    mocked_binance_response = MagicMock()
+    mocked_binance_response.json = CoroutineMock(return_value=klines)
+    session_context = await aiohttp.ClientSession().__aenter__()
+    session_context.get = CoroutineMock(return_value=mocked_binance_response)
+
+    # Events in different minutes and out of order
+    input_queue = MagicMock()
+    input_queue.get = CoroutineMock(
+        side_effect=[
+            EventLogBatch([make_event_log(t) for t in [500, 70, 119, 120, 9999]]),
+            EventLogBatch([]),
+        ]
+    )
+    output_queue = MagicMock()
+    output_queue.put = CoroutineMock()
+
+    await get_instance().start_processing(input_queue, output_queue, "id", None)
+
+    # Each event should be priced with the kline it closed in
+    # (gas used * gas price = 0x456 * 1 so the quote is the price * 0x456)
+    records = output_queue.put.mock_calls[0].args[0]
+    assert [r.gas_price_quote_value for r in records] == [
+        85 * 0x456 // 10,  # minute 8
+        15 * 0x456 // 10,  # minute 1
+        15 * 0x456 // 10,  # minute 1
+        25 * 0x456 // 10,  # minute 2
+        95 * 0x456 // 10,  # beyond the klines so the latest one is used
+    ]
@@ -1,38 +1,130 @@
-# Standard libraries
-import json
-
 # 3rd party libraries
-from asynctest import MagicMock, CoroutineMock, patch, call
+from asynctest import MagicMock, CoroutineMock
 import pytest
 
 # Code
+from src.events import EventRecord
 from src.historical.tasks.batch.helpers.writer import BatchWriter as Cls
 
+# Constants
+MOCKED_DATA = [
+    EventRecord("event_id", "0x123", i, 123, 1, 1, 1, 1, "SGD", "0x456", [], "0x", {})
+    for i in range(20)
+]
+
 
-def get_instance():
-    """Helper to create an instance"""
-    return Cls(MagicMock(), "host", "port", "database", "user", "password")
+def get_sink():
+    """Helper to create a mocked sink"""
+    sink = MagicMock()
+    sink.open = CoroutineMock()
+    sink.write = CoroutineMock(return_value=[])
+    sink.filter_written = CoroutineMock(side_effect=lambda _category, r: r[1:])
+    sink.close = CoroutineMock()
+    return sink
 
 
 @pytest.mark.asyncio
-@patch("src.historical.tasks.batch.helpers.writer.AsyncIOMotorClient")
-async def test_start_writing(client):
-    # Setup the client
-    mocked_bulk_write = CoroutineMock()
-    client().__getitem__().__getitem__().bulk_write = mocked_bulk_write
+async def test_start_writing():
+    sink = get_sink()
 
     # Setup the mocked input queue (2 inputs of 10 events each, 1 empty)
-    mocked_data = {"value": "the data", "transaction_hash": "0x123", "log_index": "123"}
     input_queue = MagicMock()
     input_queue.get = CoroutineMock(
-        side_effect=[[mocked_data] * 10, [mocked_data] * 10, []]
+        side_effect=[MOCKED_DATA[:10], MOCKED_DATA[10:], []]
+    )
+
+    await Cls(MagicMock(), sink).start_writing(input_queue, "category")
+
+    # Should open the sink, write both inputs into it, then close it
+    sink.open.assert_awaited_once_with(["category"])
+    assert sink.write.await_count == 2
+    sink.write.assert_awaited_with("category", MOCKED_DATA[10:])
+    sink.close.assert_awaited_once()
+
+    # Should not look up the records written before unless skipping them
+    sink.filter_written.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_start_writing_drops_seen_records():
+    sink = get_sink()
+
+    # The inputs overlap by 5 events, and the last input is all seen
+    input_queue = MagicMock()
+    input_queue.get = CoroutineMock(
+        side_effect=[MOCKED_DATA[:10], MOCKED_DATA[5:15], MOCKED_DATA[:15], []]
     )
 
-    # Initialize the instance and register the category
-    instance = get_instance()
+    await Cls(MagicMock(), sink).start_writing(input_queue, "category")
+
+    # Should only write the events not seen yet
+    assert sink.write.await_count == 2
+    sink.write.assert_awaited_with("category", MOCKED_DATA[10:15])
+
+
+@pytest.mark.asyncio
+async def test_start_writing_skips_recorded():
+    sink = get_sink()
+
+    input_queue = MagicMock()
+    input_queue.get = CoroutineMock(
+        side_effect=[MOCKED_DATA[:10], MOCKED_DATA[10:11], []]
+    )
+
+    await Cls(MagicMock(), sink, True).start_writing(input_queue, "category")
+
+    # Should only write the events not recorded (all but the first of each)
+    sink.filter_written.assert_awaited_with("category", MOCKED_DATA[10:11])
+    sink.write.assert_awaited_once_with("category", MOCKED_DATA[1:10])
+
+
+@pytest.mark.asyncio
+async def test_start_writing_closes_on_failure():
+    sink = get_sink()
+    sink.write.side_effect = RuntimeError
+
+    input_queue = MagicMock()
+    input_queue.get = CoroutineMock(side_effect=[MOCKED_DATA[:1]])
+
+    with pytest.raises(RuntimeError):
+        await Cls(MagicMock(), sink).start_writing(input_queue, "category")
+
+    # Should still close the sink
+    sink.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_start_writing_notifies_observers():
+    input_queue = MagicMock()
+    input_queue.get = CoroutineMock(side_effect=[MOCKED_DATA[:10], []])
+
+    instance = Cls(MagicMock(), get_sink())
+    observer = MagicMock()
+    instance.add_write_observer(observer)
+
+    await instance.start_writing(input_queue, "category")
+
+    # Should notify the observer with each written batch
+    observer.assert_called_once_with(MOCKED_DATA[:10])
+
+
+@pytest.mark.asyncio
+async def test_start_writing_notifies_checkpoint_observers():
+    later = [
+        EventRecord(
+            "event_id", "0x789", 0, 150, 1, 1, 1, 1, "SGD", "0x456", [], "0x", {}
+        )
+    ]
+
+    # The second input is all seen, but its block is still checkpointed
+    input_queue = MagicMock()
+    input_queue.get = CoroutineMock(side_effect=[later, MOCKED_DATA[:10], later, []])
+
+    instance = Cls(MagicMock(), get_sink())
+    observer = CoroutineMock()
+    instance.add_checkpoint_observer(observer)
 
-    # Async iterator will raise RuntimeError: StopIteration
     await instance.start_writing(input_queue, "category")
 
-    # Should call the bulk write method 2 times
-    assert len(mocked_bulk_write.mock_calls) == 2
+    # Should checkpoint the last block of every input once written
+    assert [c.args for c in observer.await_args_list] == [(150,), (123,), (150,)]
@@ -16,7 +16,7 @@ MOCKED_ENVIRONMENT = {
     "DB_USER": "user",
     "DB_PASSWORD": "password",
     "DB_HOST": "host",
-    "DB_PORT": "port",
+    "DB_PORT": "27017",
 }
 
 
@@ -116,15 +116,20 @@ def test_record_synchronously(asyncio, _loader, _processor, _writer, _events_res
 
 
 @pytest.mark.asyncio
+@patch("src.historical.tasks.batch.recorder.CoverageLedger")
 @patch("src.historical.tasks.batch.recorder.EventsResolver")
 @patch("src.historical.tasks.batch.recorder.BatchWriter")
 @patch("src.historical.tasks.batch.recorder.BatchProcessor")
 @patch("src.historical.tasks.batch.recorder.BatchLoader")
-async def test_record_asynchronously(loader, processor, writer, events_resolver):
+async def test_record_asynchronously(
+    loader, processor, writer, events_resolver, ledger
+):
     # Mock the components
     loader().start_loading = CoroutineMock()
     processor().start_processing = CoroutineMock()
     writer().start_writing = CoroutineMock()
+    ledger().get_missing = CoroutineMock(return_value=[(123456, 654321)])
+    ledger().add = CoroutineMock(return_value=True)
 
     event_handler = MagicMock()
     event_handler.resolve_context_asynchronously = CoroutineMock()
@@ -152,17 +157,20 @@ async def test_record_asynchronously(loader, processor, writer, events_resolver)
 
 
 @pytest.mark.asyncio
+@patch("src.historical.tasks.batch.recorder.CoverageLedger")
 @patch("src.historical.tasks.batch.recorder.EventsResolver")
 @patch("src.historical.tasks.batch.recorder.BatchWriter")
 @patch("src.historical.tasks.batch.recorder.BatchProcessor")
 @patch("src.historical.tasks.batch.recorder.BatchLoader")
 async def test_record_asynchronously_without_handler(
-    loader, processor, writer, events_resolver
+    loader, processor, writer, events_resolver, ledger
 ):
     # Mock the components
     loader().start_loading = CoroutineMock()
     processor().start_processing = CoroutineMock()
     writer().start_writing = CoroutineMock()
+    ledger().get_missing = CoroutineMock(return_value=[(123456, 654321)])
+    ledger().add = CoroutineMock(return_value=True)
 
     events_resolver.get_handler.return_value = None
 
@@ -184,3 +192,172 @@ async def test_record_asynchronously_without_handler(
     loader().start_loading.assert_called_once()
     processor().start_processing.assert_called_once()
     writer().start_writing.assert_called_once()
+
+
+SWAPS_GAS_PRICING_CONFIG = {
+    "source": "swaps",
+    "gas_currency": "ETH",
+    "quote_currency": "USDC",
+    "pool_address": "0x123",
+    "price_field": "swap_price_1",
+    "decimals": 18,
+}
+
+
+@patch("src.historical.tasks.batch.recorder.MongoClientFactory")
+@patch("src.historical.tasks.batch.recorder.EventsResolver")
+@patch("src.historical.tasks.batch.recorder.BatchWriter")
+@patch("src.historical.tasks.batch.recorder.BatchProcessor")
+@patch("src.historical.tasks.batch.recorder.BatchLoader")
+def test_initialization_with_swaps_price_source(
+    _loader, _processor, writer, _events_resolver, factory
+):
+    with patch.dict(os.environ, MOCKED_ENVIRONMENT):
+        Cls(
+            MagicMock(),
+            {
+                "gas_pricing": SWAPS_GAS_PRICING_CONFIG,
+                "database": {"max_pool_size": 10},
+            },
+        )
+
+    # Should read the recorded swaps through the shared client with its settings
+    factory.get_database.assert_called_with({"max_pool_size": 10})
+
+    # Should keep the price source updated with the written records
+    writer().add_write_observer.assert_called()
+
+
+@patch("src.historical.tasks.batch.recorder.EventsResolver")
+@patch("src.historical.tasks.batch.recorder.BatchWriter")
+@patch("src.historical.tasks.batch.recorder.BatchProcessor")
+@patch("src.historical.tasks.batch.recorder.BatchLoader")
+def test_initialization_with_swaps_price_source_without_db_environment(
+    _loader, _processor, _writer, _events_resolver
+):
+    with patch.dict(
+        os.environ, {k: v for k, v in MOCKED_ENVIRONMENT.items() if "DB" not in k}
+    ):
+        with pytest.raises(ValueError):
+            Cls(MagicMock(), {"gas_pricing": SWAPS_GAS_PRICING_CONFIG})
+
+
+@pytest.mark.asyncio
+@patch("src.historical.tasks.batch.recorder.CoverageLedger")
+@patch("src.historical.tasks.batch.recorder.EventsResolver")
+@patch("src.historical.tasks.batch.recorder.BatchWriter")
+@patch("src.historical.tasks.batch.recorder.BatchProcessor")
+@patch("src.historical.tasks.batch.recorder.BatchLoader")
+async def test_record_asynchronously_only_missing_ranges(
+    loader, processor, writer, events_resolver, ledger
+):
+    loader().start_loading = CoroutineMock()
+    processor().start_processing = CoroutineMock()
+    ledger().get_missing = CoroutineMock(return_value=[(100, 199), (300, 449)])
+    ledger().add = CoroutineMock(side_effect=[True, True, True, False])
+    events_resolver.get_handler.return_value = None
+
+    logger = MagicMock()
+    with patch.dict(os.environ, MOCKED_ENVIRONMENT):
+        instance = Cls(
+            logger, {"gas_pricing": {"gas_currency": "ETH", "quote_currency": "SGD"}}
+        )
+
+    # Should checkpoint the batches as they are written
+    (checkpoint,) = writer().add_checkpoint_observer.call_args.args
+
+    async def write(_queue, _category):
+        await checkpoint(320)
+
+    writer().start_writing = CoroutineMock(side_effect=write)
+
+    await instance.record_asynchronously(
+        contract_address="0x123456",
+        event_id="event_id",
+        from_block=0,
+        to_block=500,
+    )
+
+    # Should only load the missing ranges
+    ledger().get_missing.assert_awaited_once_with("event_id", "0x123456", 0, 500)
+    assert [c.args[3:5] for c in loader().start_loading.call_args_list] == [
+        (100, 199),
+        (300, 449),
+    ]
+
+    # Should add up to the end of the written batch, and each range once recorded
+    assert [c.args for c in ledger().add.await_args_list] == [
+        ("event_id", "0x123456", 100, 199),
+        ("event_id", "0x123456", 100, 199),
+        ("event_id", "0x123456", 300, 349),
+        ("event_id", "0x123456", 300, 449),
+    ]
+
+    # Should warn about the range failing to be added
+    logger.warning.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch("src.historical.tasks.batch.recorder.CoverageLedger")
+@patch("src.historical.tasks.batch.recorder.EventsResolver")
+@patch("src.historical.tasks.batch.recorder.BatchWriter")
+@patch("src.historical.tasks.batch.recorder.BatchProcessor")
+@patch("src.historical.tasks.batch.recorder.BatchLoader")
+async def test_record_asynchronously_already_recorded(
+    loader, _processor, _writer, events_resolver, ledger
+):
+    ledger().get_missing = CoroutineMock(return_value=[])
+
+    with patch.dict(os.environ, MOCKED_ENVIRONMENT):
+        instance = get_instance()
+
+    await instance.record_asynchronously(
+        contract_address="0x123456",
+        event_id="event_id",
+        from_block=0,
+        to_block=500,
+    )
+
+    # Should not resolve the handler nor load anything
+    events_resolver.get_handler.assert_not_called()
+    loader().start_loading.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("src.historical.tasks.batch.recorder.CoverageLedger")
+@patch("src.historical.tasks.batch.recorder.EventsResolver")
+@patch("src.historical.tasks.batch.recorder.BatchWriter")
+@patch("src.historical.tasks.batch.recorder.BatchProcessor")
+@patch("src.historical.tasks.batch.recorder.BatchLoader")
+@pytest.mark.parametrize(
+    "config",
+    [{"coverage": False}, {"sink": {"type": "files", "directory": "records"}}],
+)
+async def test_record_asynchronously_without_coverage(
+    loader, processor, writer, events_resolver, ledger, config
+):
+    loader().start_loading = CoroutineMock()
+    processor().start_processing = CoroutineMock()
+    writer().start_writing = CoroutineMock()
+    events_resolver.get_handler.return_value = None
+
+    with patch.dict(os.environ, MOCKED_ENVIRONMENT):
+        instance = Cls(
+            MagicMock(),
+            {
+                "gas_pricing": {"gas_currency": "ETH", "quote_currency": "SGD"},
+                **config,
+            },
+        )
+
+    await instance.record_asynchronously(
+        contract_address="0x123456",
+        event_id="event_id",
+        from_block=0,
+        to_block=500,
+    )
+
+    # Should load the whole range without any ledger
+    ledger.assert_not_called()
+    writer().add_checkpoint_observer.assert_not_called()
+    assert loader().start_loading.call_args.args[3:5] == (0, 500)
@@ -0,0 +1,237 @@
+# Standard libraries
+import os
+import time
+
+# 3rd party libraries
+from asynctest import MagicMock, CoroutineMock, patch
+import pytest
+
+# Code
+from src.historical.tasks.gaps.scheduler import GapScheduler as Cls
+
+# Constants
+MOCKED_ENVIRONMENT = {"ETHERSCAN_API_KEY": "etherscan_api_key"}
+SUBSCRIPTIONS = [
+    {"event_id": "event_id", "contract_address": "0xABC"},
+    {"event_id": "event_id", "contract_address": "0xdef"},
+]
+
+# Clear the environment
+os.environ = {}
+
+
+def get_instance(factory, ledger_ranges, fills=(), **config):
+    """Helper to create an instance with a mocked ledger and pending fills"""
+    collection = MagicMock()
+    collection.find().to_list = CoroutineMock(return_value=list(fills))
+    collection.delete_one = CoroutineMock()
+    collection.insert_one = CoroutineMock()
+    factory.get_database.return_value = {"gap_fills": collection}
+
+    with patch.dict(os.environ, MOCKED_ENVIRONMENT):
+        with patch("src.historical.tasks.gaps.scheduler.CoverageLedger") as ledger:
+            ledger().get_ranges = CoroutineMock(
+                side_effect=lambda _event_id, address: ledger_ranges.get(address, [])
+            )
+            instance = Cls(MagicMock(), {"subscriptions": SUBSCRIPTIONS, **config})
+
+    return instance, collection
+
+
+def mock_head_block(aiohttp, head_block):
+    """Helper to mock the chain head returned by Etherscan"""
+    session = aiohttp.ClientSession().__aenter__.return_value
+    response = MagicMock()
+    response.json = CoroutineMock(return_value={"result": hex(head_block)})
+    session.get = CoroutineMock(return_value=response)
+
+
+@pytest.mark.parametrize(
+    "config",
+    [{"chunk_blocks": 0}, {"max_pending_chunks": 0}, {"confirmations": -1}],
+)
+@patch("src.historical.tasks.gaps.scheduler.MongoClientFactory")
+def test_initialization_with_invalid_config(factory, config):
+    with pytest.raises(ValueError):
+        get_instance(factory, {}, **config)
+
+
+@patch("src.historical.tasks.gaps.scheduler.MongoClientFactory")
+def test_initialization_without_etherscan_api_key_environment(factory):
+    with pytest.raises(ValueError):
+        Cls(MagicMock(), {"subscriptions": SUBSCRIPTIONS})
+
+
+def test_get_chunks():
+    ranges = [(1, 10), (20, 24)]
+
+    assert Cls.get_chunks("event_id", "0xabc", ranges, 4, 10) == [
+        ("event_id", "0xabc", 1, 4),
+        ("event_id", "0xabc", 5, 8),
+        ("event_id", "0xabc", 9, 10),
+        ("event_id", "0xabc", 20, 23),
+        ("event_id", "0xabc", 24, 24),
+    ]
+
+    # Should only split up to the maximum number of chunks
+    assert len(Cls.get_chunks("event_id", "0xabc", ranges, 4, 2)) == 2
+
+
+@pytest.mark.asyncio
+@patch("src.historical.tasks.gaps.scheduler.aiohttp")
+@patch("src.historical.tasks.gaps.scheduler.record_historical_events_task")
+@patch("src.historical.tasks.gaps.scheduler.MongoClientFactory")
+async def test_schedule_asynchronously(factory, task, aiohttp):
+    mock_head_block(aiohttp, 1064)
+    task.delay.return_value = "task_id"
+
+    # Both have a hole, the second recorded beyond the confirmations
+    instance, collection = get_instance(
+        factory,
+        {"0xabc": [(100, 199), (300, 900)], "0xdef": [(500, 600), (700, 1050)]},
+        chunk_blocks=50,
+        max_pending_chunks=3,
+        confirmations=64,
+    )
+
+    scheduled = await instance.schedule_asynchronously()
+
+    # Should take turns between the subscriptions from their oldest gaps,
+    # up to the head less the confirmations
+    assert scheduled == [
+        ("event_id", "0xabc", 200, 249),
+        ("event_id", "0xdef", 601, 650),
+        ("event_id", "0xabc", 250, 299),
+    ]
+    task.delay.assert_called_with("0xabc", "event_id", 250, 299)
+    assert task.delay.call_count == 3
+
+    # Should track the scheduled tasks as pending
+    fill = collection.insert_one.call_args.args[0]
+    assert fill["_id"] == "event_id-0xabc-250-299"
+    assert fill["task_id"] == "task_id"
+
+
+@pytest.mark.asyncio
+@patch("src.historical.tasks.gaps.scheduler.aiohttp")
+@patch("src.historical.tasks.gaps.scheduler.record_historical_events_task")
+@patch("src.historical.tasks.gaps.scheduler.MongoClientFactory")
+async def test_schedule_asynchronously_leaves_tail_to_live(factory, task, aiohttp):
+    mock_head_block(aiohttp, 1064)
+
+    # Quiet pools only recorded up to their latest events
+    instance, _collection = get_instance(
+        factory, {"0xabc": [(100, 500)], "0xdef": [(100, 900)]}
+    )
+
+    # Should not fill past the last recorded blocks, left to the live stream
+    assert await instance.schedule_asynchronously() == []
+    task.delay.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("src.historical.tasks.gaps.scheduler.aiohttp")
+@patch("src.historical.tasks.gaps.scheduler.worker")
+@patch("src.historical.tasks.gaps.scheduler.record_historical_events_task")
+@patch("src.historical.tasks.gaps.scheduler.MongoClientFactory")
+async def test_schedule_asynchronously_with_pending(factory, task, worker, aiohttp):
+    mock_head_block(aiohttp, 1064)
+
+    now = int(time.time())
+    fills = [
+        # Pending
+        {
+            "_id": "pending",
+            "event_id": "event_id",
+            "address": "0xabc",
+            "from_block": 200,
+            "to_block": 249,
+            "task_id": "pending",
+            "enqueued_at": now,
+        },
+        # Done
+        {"_id": "done", "task_id": "done", "enqueued_at": now},
+        # Lost
+        {"_id": "lost", "task_id": "lost", "enqueued_at": now - 7200},
+    ]
+    worker.AsyncResult.side_effect = lambda task_id: MagicMock(
+        ready=MagicMock(return_value=task_id == "done")
+    )
+
+    instance, collection = get_instance(
+        factory,
+        {"0xabc": [(100, 199), (300, 1000)]},
+        fills,
+        chunk_blocks=50,
+        max_pending_chunks=2,
+    )
+
+    scheduled = await instance.schedule_asynchronously()
+
+    # Should forget the done and lost tasks
+    deleted = [c.args[0] for c in collection.delete_one.await_args_list]
+    assert deleted == [{"_id": "done"}, {"_id": "lost"}]
+
+    # Should only schedule the gaps not pending, within the pending limit
+    assert scheduled == [("event_id", "0xabc", 250, 299)]
+
+
+@pytest.mark.asyncio
+@patch("src.historical.tasks.gaps.scheduler.aiohttp")
+@patch("src.historical.tasks.gaps.scheduler.worker")
+@patch("src.historical.tasks.gaps.scheduler.record_historical_events_task")
+@patch("src.historical.tasks.gaps.scheduler.MongoClientFactory")
+async def test_schedule_asynchronously_at_pending_limit(factory, task, worker, aiohttp):
+    worker.AsyncResult().ready.return_value = False
+    fill = {
+        "_id": "pending",
+        "event_id": "event_id",
+        "address": "0xabc",
+        "from_block": 200,
+        "to_block": 249,
+        "task_id": "pending",
+        "enqueued_at": int(time.time()),
+    }
+    instance, _collection = get_instance(factory, {}, [fill])
+
+    # Should not even look up the chain head
+    assert await instance.schedule_asynchronously() == []
+    aiohttp.ClientSession.assert_not_called()
+    task.delay.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("src.historical.tasks.gaps.scheduler.aiohttp")
+@patch("src.historical.tasks.gaps.scheduler.record_historical_events_task")
+@patch("src.historical.tasks.gaps.scheduler.MongoClientFactory")
+async def test_schedule_asynchronously_without_recorded_blocks(factory, task, aiohttp):
+    mock_head_block(aiohttp, 1064)
+
+    instance, _collection = get_instance(factory, {})
+    subscriptions = [{**SUBSCRIPTIONS[0], "from_block": 900}]
+
+    # Should not fill anything before the first block recorded
+    assert await instance.schedule_asynchronously() == []
+
+    # Unless filling from a given block
+    with patch.dict(os.environ, MOCKED_ENVIRONMENT):
+        with patch("src.historical.tasks.gaps.scheduler.CoverageLedger") as ledger:
+            ledger().get_ranges = CoroutineMock(return_value=[])
+            with_from_block = Cls(MagicMock(), {"subscriptions": subscriptions})
+
+    assert await with_from_block.schedule_asynchronously() == [
+        ("event_id", "0xabc", 900, 1000)
+    ]
+
+
+@patch("src.historical.tasks.gaps.scheduler.asyncio")
+@patch("src.historical.tasks.gaps.scheduler.MongoClientFactory")
+def test_schedule_synchronously(factory, asyncio):
+    instance, _collection = get_instance(factory, {})
+    instance.schedule_asynchronously = CoroutineMock()
+
+    instance.schedule_synchronously()
+
+    # Should call the asynchronous method through asyncio
+    instance.schedule_asynchronously.assert_called_once()
+    asyncio.get_event_loop().run_until_complete.assert_called_once()
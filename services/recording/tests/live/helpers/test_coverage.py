@@ -0,0 +1,100 @@
+# 3rd party libraries
+from asynctest import MagicMock, CoroutineMock, patch, call
+from pymongo.errors import AutoReconnect
+import pytest
+
+# Code
+from src.events import EventRecord
+from src.live.helpers.coverage import CoverageTracker as Cls
+
+
+def make_record(block_number, address="0xabc"):
+    """Helper to create a record of a block"""
+    return EventRecord(
+        "event_id", "0x1", 0, block_number, 1, 1, 1, 1, "SGD", address, [], "0x", {}
+    )
+
+
+def get_ledger(added=True):
+    """Helper to create a mocked ledger"""
+    ledger = MagicMock()
+    ledger.add = CoroutineMock(return_value=added)
+    return ledger
+
+
+@pytest.mark.asyncio
+async def test_checkpoint():
+    ledger = get_ledger()
+    instance = Cls(MagicMock(), ledger)
+
+    # Another contract's block is not processed until a later block arrives
+    instance.observe_records([make_record(100), make_record(100), make_record(103)])
+    instance.observe_records([make_record(105), make_record(50, "0xdef")])
+
+    # Postponed records of processed blocks do not rewind the tracking
+    instance.observe_records([make_record(101)])
+
+    await instance.checkpoint()
+
+    # Should add the blocks before the last one accepted
+    ledger.add.assert_awaited_once_with("event_id", "0xabc", 100, 104)
+
+    # Should not add the same ranges twice
+    await instance.checkpoint()
+    ledger.add.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_after_reset():
+    ledger = get_ledger()
+    instance = Cls(MagicMock(), ledger)
+
+    instance.observe_records([make_record(100), make_record(103)])
+    instance.reset()
+    instance.observe_records([make_record(110), make_record(112)])
+
+    await instance.checkpoint()
+
+    # Should not cover the blocks missed while disconnected
+    assert ledger.add.await_args_list == [
+        call("event_id", "0xabc", 100, 102),
+        call("event_id", "0xabc", 110, 111),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_keeps_failed_ranges():
+    ledger = get_ledger(added=False)
+    ledger.add.side_effect = [AutoReconnect(), False, True]
+    logger = MagicMock()
+    instance = Cls(logger, ledger)
+
+    instance.observe_records([make_record(100), make_record(103)])
+    await instance.checkpoint()
+    logger.warning.assert_called_once()
+
+    # Should merge the failed range with the ranges processed meanwhile
+    instance.observe_records([make_record(105)])
+    await instance.checkpoint()
+    await instance.checkpoint()
+
+    assert ledger.add.await_args_list == [
+        call("event_id", "0xabc", 100, 102),
+        call("event_id", "0xabc", 100, 104),
+        call("event_id", "0xabc", 100, 104),
+    ]
+
+
+@pytest.mark.asyncio
+@patch("src.live.helpers.coverage.asyncio.sleep", new_callable=CoroutineMock)
+async def test_checkpoint_forever(sleep):
+    sleep.side_effect = [None, RuntimeError]
+    ledger = get_ledger()
+    instance = Cls(MagicMock(), ledger)
+    instance.observe_records([make_record(100), make_record(103)])
+
+    with pytest.raises(RuntimeError):
+        await instance.checkpoint_forever()
+
+    # Should checkpoint after each sleep
+    ledger.add.assert_awaited_once_with("event_id", "0xabc", 100, 102)
@@ -124,6 +124,8 @@ async def test_listen_forever_with_retry(mocked_ws_connect):
     subscription_id = instance.add_event_subscription(
         "0xmocked_address", "mocked_topic"
     )
+    connect_observer = MagicMock()
+    instance.add_connect_observer(connect_observer)
 
     # Async iterator will raise RuntimeError: StopIteration
     with pytest.raises(RuntimeError):
@@ -138,3 +140,6 @@ async def test_listen_forever_with_retry(mocked_ws_connect):
             }
         ),
     ]
+
+    # Should notify the observer on connecting and on reconnecting
+    assert connect_observer.call_count == 2
@@ -8,6 +8,7 @@ import pytest
 
 # Code
 from src.live.helpers.processor import StreamProcessor as Cls
+from src.pricing import BinancePriceSource
 
 # Constants
 RPC_URI = "mocked_rpc_uri"
@@ -44,7 +45,7 @@ MOCKED_BINANCE_KLINE = [
 
 def get_instance():
     """Helper to create an instance"""
-    return Cls(MagicMock(), RPC_URI, GAS_CURRENCY, QUOTE_CURRENCY)
+    return Cls(MagicMock(), RPC_URI, BinancePriceSource(GAS_CURRENCY, QUOTE_CURRENCY))
 
 
 def test_register_event_id():
@@ -459,3 +460,57 @@ async def test_process_forever_retry_removed_transaction_receipt_query(session):
     # Should have called get on the session once to binance
     # (second input has same data which should be cached)
     session_context.get.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession")
+async def test_process_forever_without_price(session):
+    # Blocks and transactions not cached by the other tests
+    event_logs = [
+        {**MOCKED_EVENT_LOG, "blockHash": f"0xb10c{i}", "transactionHash": f"0x7{i}"}
+        for i in range(3)
+    ]
+    responses = []
+    for i in range(3):
+        block_response = MagicMock()
+        block_response.json = CoroutineMock(
+            return_value={"result": {"timestamp": hex(0x54321 + i)}}
+        )
+        receipt_response = MagicMock()
+        receipt_response.json = CoroutineMock(
+            return_value={"result": MOCKED_TRANSACTION_RECEIPT}
+        )
+        responses += [block_response, receipt_response]
+
+    session_context = await session().__aenter__()
+    session_context.post = CoroutineMock(side_effect=responses)
+
+    # No price at first, then a price, then none again
+    price_source = MagicMock(quote_currency=QUOTE_CURRENCY)
+    price_source.fetch_price = CoroutineMock(
+        side_effect=[ValueError("No price"), (2, 0), ValueError("No price")]
+    )
+
+    input_queue = MagicMock()
+    input_queue.get = CoroutineMock(
+        side_effect=[
+            {"subscription_id": "subscription_id_123", "event_log": event_log}
+            for event_log in event_logs
+        ]
+    )
+    output_queue = MagicMock()
+    output_queue.put = CoroutineMock()
+
+    logger = MagicMock()
+    instance = Cls(logger, RPC_URI, price_source)
+    instance.register_event_id("subscription_id_123", "event_id_123")
+
+    # Async iterator will raise RuntimeError: StopIteration
+    with pytest.raises(RuntimeError):
+        await instance.process_forever(input_queue, output_queue)
+
+    # Should keep recording with a zero quote, then the last price fetched
+    records = [c.args[0]["data"] for c in output_queue.put.mock_calls]
+    gas = 0x123 * 0x456
+    assert [r.gas_price_quote_value for r in records] == [0, 2 * gas, 2 * gas]
+    assert logger.warning.call_count == 2
@@ -0,0 +1,120 @@
+# Standard libraries
+import os
+
+# 3rd party libraries
+import pytest
+
+# Code
+from src.live.helpers.spool import WriteAheadSpool as Cls
+
+# Constants
+# Room for the header, two entries of 8 bytes, and the ending zero length
+SEGMENT_BYTES = 8 + 2 * (8 + 8) + 8
+
+
+def test_initialization_with_too_small_segments(tmp_path):
+    # Should raise a value error
+    with pytest.raises(ValueError):
+        Cls(str(tmp_path), 16)
+
+
+def test_append_read_and_acknowledge(tmp_path):
+    spool = Cls(str(tmp_path), SEGMENT_BYTES)
+    assert spool.is_empty
+
+    for i in range(5):
+        spool.append(f"entry-{i}".encode())
+
+    # Should start new segments for the entries not fitting the current one
+    assert len(spool) == 3
+    assert not spool.is_empty
+
+    # Should read the earliest entries across the segments without consuming them
+    entries, position = spool.read(3)
+    assert entries == [b"entry-0", b"entry-1", b"entry-2"]
+    assert spool.read(3)[0] == entries
+
+    # Should only read the entries after those acknowledged
+    spool.acknowledge(position)
+    entries, position = spool.read(10)
+    assert entries == [b"entry-3", b"entry-4"]
+
+    # Should remove the segments whose entries are all acknowledged
+    spool.acknowledge(position)
+    assert spool.is_empty
+    assert spool.read(10)[0] == []
+    assert len(spool) == 1
+    assert len(os.listdir(tmp_path)) == 1
+
+    spool.close()
+
+
+def test_append_larger_than_segment(tmp_path):
+    spool = Cls(str(tmp_path), SEGMENT_BYTES)
+
+    spool.append(b"small")
+    spool.append(b"x" * 100)
+    spool.append(b"small")
+
+    # Should fit the larger entry into a larger segment of its own
+    assert len(spool) == 3
+    assert spool.read(10)[0] == [b"small", b"x" * 100, b"small"]
+
+    spool.close()
+
+
+def test_reopen(tmp_path):
+    spool = Cls(str(tmp_path), SEGMENT_BYTES)
+    for i in range(3):
+        spool.append(f"entry-{i}".encode())
+
+    _entries, position = spool.read(1)
+    spool.acknowledge(position)
+    spool.close()
+
+    # Should read the unacknowledged entries back, and keep appending after them
+    spool = Cls(str(tmp_path), SEGMENT_BYTES)
+    spool.append(b"entry-3")
+    assert spool.read(10)[0] == [b"entry-1", b"entry-2", b"entry-3"]
+
+    spool.close()
+
+
+def test_reopen_after_torn_entry(tmp_path):
+    spool = Cls(str(tmp_path), SEGMENT_BYTES)
+    spool.append(b"entry-0")
+    spool.append(b"entry-1")
+    spool.close()
+
+    # Tear the last entry as if it were being written during a crash
+    path = os.path.join(tmp_path, os.listdir(tmp_path)[0])
+    with open(path, "r+b") as f:
+        f.seek(8 + 15 + 8 + 6)
+        f.write(b"?")
+
+    # Should end the segment before the torn entry, and append in its place
+    spool = Cls(str(tmp_path), SEGMENT_BYTES)
+    assert spool.read(10)[0] == [b"entry-0"]
+    spool.append(b"entry-2")
+    assert spool.read(10)[0] == [b"entry-0", b"entry-2"]
+
+    spool.close()
+
+
+def test_reopen_after_torn_length(tmp_path):
+    spool = Cls(str(tmp_path), SEGMENT_BYTES)
+    spool.append(b"entry-0")
+    spool.close()
+
+    # Tear the length of the entry past the end of the segment
+    path = os.path.join(tmp_path, os.listdir(tmp_path)[0])
+    with open(path, "r+b") as f:
+        f.seek(8)
+        f.write(b"\xff")
+
+    # Should end the segment before the torn entry
+    spool = Cls(str(tmp_path), SEGMENT_BYTES)
+    assert spool.is_empty
+    assert spool.read(10)[0] == []
+
+    spool.close()
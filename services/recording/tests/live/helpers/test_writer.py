@@ -1,53 +1,133 @@
 # Standard libraries
+import asyncio
 import json
 
 # 3rd party libraries
 from asynctest import MagicMock, CoroutineMock, patch
+from pymongo.errors import AutoReconnect
 import pytest
 
 # Code
+from src.events import EventRecord
 from src.live.helpers.writer import StreamWriter as Cls
 
+# Constants
+MOCKED_DATA = EventRecord(
+    "event_id", "0x123", 123, 1, 60, 1, 1, 1, "SGD", "0x456", [], "0x", {}
+)
+SPOOLED_DATA = json.dumps(
+    {"category": "swaps", "document": MOCKED_DATA.to_document()}
+).encode()
 
-def get_instance():
-    """Helper to create an instance"""
-    return Cls(MagicMock(), "host", "port", "database", "user", "password")
 
+def get_sink():
+    """Helper to create a mocked sink"""
+    sink = MagicMock()
+    sink.open = CoroutineMock()
+    sink.write = CoroutineMock(return_value=[0])
+    sink.flush = CoroutineMock()
+    sink.close = CoroutineMock()
+    return sink
 
-@patch("src.live.helpers.writer.AsyncIOMotorClient")
-def test_register_category(_client):
-    instance = get_instance()
+
+def cancel_pending_tasks():
+    """Helper to stop the writer's other loop once one has raised"""
+    for task in asyncio.all_tasks():
+        if task is not asyncio.current_task():
+            task.cancel()
+
+
+def test_register_category():
+    instance = Cls(MagicMock(), get_sink())
     instance.register_category(0, "category_0")
     instance.register_category(1, "category_1")
     instance.register_category(2, "category_2")
 
 
 @pytest.mark.asyncio
-@patch("src.live.helpers.writer.AsyncIOMotorClient")
-async def test_write_forever(client):
-    # Setup the client
-    mocked_update_one = CoroutineMock()
-    client().__getitem__().__getitem__().update_one = mocked_update_one
+async def test_write_forever():
+    sink = get_sink()
 
     # Setup the input queue
-    mocked_data = {"value": "the data", "transaction_hash": "0x123", "log_index": 123}
     input_queue = MagicMock()
     input_queue.get = CoroutineMock(
-        side_effect=[
-            {
-                "subscription_id": 0,
-                "data": mocked_data,
-            }
-        ]
+        side_effect=2 * [{"subscription_id": 1, "data": MOCKED_DATA}]
     )
+    input_queue.empty.side_effect = [False, True]
 
-    # Initialize the instance and register the category
-    instance = get_instance()
+    # Initialize the instance and register the categories
+    instance = Cls(MagicMock(), sink)
     instance.register_category(0, "category")
+    instance.register_category(1, "category")
+    observer = MagicMock()
+    instance.add_write_observer(observer)
+    accept_observer = MagicMock()
+    instance.add_accept_observer(accept_observer)
 
     # Async iterator will raise RuntimeError: StopIteration
     with pytest.raises(RuntimeError):
         await instance.write_forever(input_queue)
 
-    # Should call the update one method
-    mocked_update_one.assert_called()
+    # Should open the sink for the categories, and write the record into it
+    sink.open.assert_awaited_once_with(["category"])
+    sink.write.assert_awaited_with("category", [MOCKED_DATA])
+    assert sink.write.await_count == 2
+
+    # Should flush the sink once caught up only
+    sink.flush.assert_awaited_once()
+
+    # Should close the sink once stopped
+    sink.close.assert_awaited_once()
+
+    # Should notify the observers with the written records
+    observer.assert_called_with([MOCKED_DATA])
+    assert observer.call_count == 2
+    accept_observer.assert_called_with([MOCKED_DATA])
+    assert accept_observer.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch("src.live.helpers.writer.asyncio.sleep", new_callable=CoroutineMock)
+async def test_write_forever_with_spool(sleep):
+    # The records fail to be written once
+    sink = get_sink()
+    sink.write.side_effect = [AutoReconnect(), [0]]
+
+    # The spool is empty until the record is appended
+    spool = MagicMock()
+    spool.read.side_effect = [
+        ([], (0, 8)),
+        ([SPOOLED_DATA], (0, 100)),
+        ([SPOOLED_DATA], (0, 100)),
+        RuntimeError,
+    ]
+
+    input_queue = asyncio.Queue()
+    asyncio.get_event_loop().call_later(
+        0.01, input_queue.put_nowait, {"subscription_id": 0, "data": MOCKED_DATA}
+    )
+
+    instance = Cls(MagicMock(), sink, spool)
+    instance.register_category(0, "swaps")
+    observer = MagicMock()
+    instance.add_write_observer(observer)
+    accept_observer = MagicMock()
+    instance.add_accept_observer(accept_observer)
+
+    with pytest.raises(RuntimeError):
+        await instance.write_forever(input_queue)
+    cancel_pending_tasks()
+
+    # Should append the record with its category to the spool
+    assert json.loads(spool.append.call_args.args[0]) == json.loads(SPOOLED_DATA)
+
+    # Should retry after a backoff, then only acknowledge the flushed records
+    sleep.assert_awaited_once_with(1)
+    sink.flush.assert_awaited_once()
+    spool.acknowledge.assert_called_once_with((0, 100))
+    assert sink.write.await_count == 2
+    assert [r.key for r in sink.write.call_args.args[1]] == ["0x123-123"]
+    assert [r.key for r in observer.call_args.args[0]] == ["0x123-123"]
+
+    # Should notify the accept observer once spooled rather than written
+    accept_observer.assert_called_once_with([MOCKED_DATA])
@@ -16,7 +16,7 @@ MOCKED_ENVIRONMENT = {
     "DB_USER": "user",
     "DB_PASSWORD": "password",
     "DB_HOST": "host",
-    "DB_PORT": "port",
+    "DB_PORT": "27017",
 }
 
 # Clear the environment
@@ -151,13 +151,14 @@ def test_start_synchronously(_listener, _processor, _writer, _events_resolver, a
 
 
 @pytest.mark.asyncio
+@patch("src.live.stream.CoverageTracker")
 @patch("src.live.stream.asyncio")
 @patch("src.live.stream.EventsResolver")
 @patch("src.live.stream.StreamWriter")
 @patch("src.live.stream.StreamProcessor")
 @patch("src.live.stream.StreamListener")
 async def test_start_asynchronously(
-    listener, processor, writer, _events_resolver, asyncio
+    listener, processor, writer, _events_resolver, asyncio, coverage_tracker
 ):
     """ """
     with patch.dict(os.environ, MOCKED_ENVIRONMENT):
@@ -178,4 +179,141 @@ async def test_start_asynchronously(
             listener().listen_forever(),
             processor().process_forever(),
             writer().write_forever(),
+            coverage_tracker().checkpoint_forever(),
         )
+
+    # Should track the blocks accepted by the writer, anew on reconnecting
+    writer().add_accept_observer.assert_called_with(coverage_tracker().observe_records)
+    listener().add_connect_observer.assert_called_with(coverage_tracker().reset)
+
+
+@pytest.mark.asyncio
+@patch("src.live.stream.CoverageTracker")
+@patch("src.live.stream.asyncio")
+@patch("src.live.stream.EventsResolver")
+@patch("src.live.stream.StreamWriter")
+@patch("src.live.stream.StreamProcessor")
+@patch("src.live.stream.StreamListener")
+@pytest.mark.parametrize(
+    "coverage_config",
+    [{"coverage": False}, {"sink": {"type": "files", "directory": "records"}}],
+)
+async def test_start_asynchronously_without_coverage(
+    listener,
+    processor,
+    writer,
+    _events_resolver,
+    asyncio,
+    coverage_tracker,
+    coverage_config,
+):
+    config = {
+        "gas_pricing": {"gas_currency": "ETH", "quote_currency": "SGD"},
+        "subscriptions": [],
+        **coverage_config,
+    }
+    with patch.dict(os.environ, MOCKED_ENVIRONMENT):
+        instance = Cls(MagicMock(), config)
+
+    asyncio.gather = CoroutineMock()
+    await instance.start_asynchronously()
+
+    # Should neither track nor checkpoint the coverage
+    coverage_tracker.assert_not_called()
+    writer().add_accept_observer.assert_not_called()
+    asyncio.gather.assert_called_with(
+        listener().listen_forever(),
+        processor().process_forever(),
+        writer().write_forever(),
+    )
+
+
+SWAPS_GAS_PRICING_CONFIG = {
+    "source": "swaps",
+    "gas_currency": "ETH",
+    "quote_currency": "USDC",
+    "pool_address": "0x123",
+    "price_field": "swap_price_1",
+    "decimals": 18,
+}
+
+
+@patch("src.live.stream.MongoClientFactory")
+@patch("src.live.stream.EventsResolver")
+@patch("src.live.stream.StreamWriter")
+@patch("src.live.stream.StreamProcessor")
+@patch("src.live.stream.StreamListener")
+def test_initialization_with_swaps_price_source(
+    _listener, _processor, writer, _events_resolver, factory
+):
+    config = {
+        "gas_pricing": SWAPS_GAS_PRICING_CONFIG,
+        "subscriptions": [],
+        "database": {"max_pool_size": 10},
+    }
+
+    with patch.dict(os.environ, MOCKED_ENVIRONMENT):
+        Cls(MagicMock(), config)
+
+    # Should read the recorded swaps through the shared client with its settings
+    factory.get_database.assert_called_with({"max_pool_size": 10})
+
+    # Should keep the price source updated with the written records
+    writer().add_write_observer.assert_called()
+
+
+@patch("src.live.stream.EventsResolver")
+@patch("src.live.stream.StreamWriter")
+@patch("src.live.stream.StreamProcessor")
+@patch("src.live.stream.StreamListener")
+def test_initialization_with_swaps_price_source_without_db_environment(
+    _listener, _processor, _writer, _events_resolver
+):
+    config = {"gas_pricing": SWAPS_GAS_PRICING_CONFIG, "subscriptions": []}
+
+    with patch.dict(
+        os.environ, {k: v for k, v in MOCKED_ENVIRONMENT.items() if "DB" not in k}
+    ):
+        with pytest.raises(ValueError):
+            Cls(MagicMock(), config)
+
+
+@patch("src.live.stream.WriteAheadSpool")
+@patch("src.live.stream.EventsResolver")
+@patch("src.live.stream.StreamWriter")
+@patch("src.live.stream.StreamProcessor")
+@patch("src.live.stream.StreamListener")
+def test_initialization_with_spool(
+    _listener, _processor, writer, _events_resolver, spool
+):
+    config = {
+        "gas_pricing": {"gas_currency": "ETH", "quote_currency": "SGD"},
+        "subscriptions": [],
+        "spool_directory": "spool",
+    }
+
+    with patch.dict(os.environ, MOCKED_ENVIRONMENT):
+        Cls(MagicMock(), config)
+
+    # Should spool the records into the directory before writing them
+    spool.assert_called_once_with("spool")
+    assert writer.call_args.args[-1] == spool()
+
+
+@patch("src.live.stream.EventsResolver")
+@patch("src.live.stream.StreamWriter")
+@patch("src.live.stream.StreamProcessor")
+@patch("src.live.stream.StreamListener")
+def test_initialization_with_parquet_files_sink(
+    _listener, _processor, _writer, _events_resolver
+):
+    config = {
+        "gas_pricing": {"gas_currency": "ETH", "quote_currency": "SGD"},
+        "subscriptions": [],
+        "sink": {"type": "files", "directory": "records", "format": "parquet"},
+    }
+
+    # Should not write parquet segments only readable once closed
+    with patch.dict(os.environ, MOCKED_ENVIRONMENT):
+        with pytest.raises(ValueError):
+            Cls(MagicMock(), config)
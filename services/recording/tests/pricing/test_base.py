@@ -0,0 +1,32 @@
+# 3rd party libraries
+from asynctest import MagicMock
+import pytest
+
+# Code
+from src.pricing.base import BasePriceSource
+
+
+class SubClass(BasePriceSource):
+    async def fetch_prices(self, session, timestamps):
+        return [(timestamp, 2) for timestamp in timestamps]
+
+
+def test_abstract_class_uninstantiable():
+    with pytest.raises(TypeError):
+        BasePriceSource("SGD")
+
+
+def test_sub_class_initialization():
+    instance = SubClass("SGD")
+    assert instance.quote_currency == "SGD"
+    assert instance.__repr__() == "SubClass quoted in SGD"
+    assert instance.__str__() == "SubClass quoted in SGD"
+
+
+@pytest.mark.asyncio
+async def test_fetch_price_from_fetch_prices():
+    assert await SubClass("SGD").fetch_price(MagicMock(), 123) == (123, 2)
+
+
+def test_observe_records_does_nothing():
+    SubClass("SGD").observe_records([MagicMock()])
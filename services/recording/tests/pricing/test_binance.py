@@ -0,0 +1,92 @@
+# 3rd party libraries
+from asynctest import MagicMock, CoroutineMock, patch
+import pytest
+
+# Code
+from src.pricing.binance import BinancePriceSource as Cls
+
+
+def get_instance():
+    return Cls("ETH", "SGD")
+
+
+def make_kline(minute, close_price):
+    """Helper to create a minute kline in Binance's format"""
+    open_time = minute * 60_000
+    return [open_time, "0.0", "0.0", "0.0", close_price, "0.0", open_time + 59_999]
+
+
+def make_session(*pages):
+    """Helper to create a session returning the pages of klines"""
+    response = MagicMock()
+    response.json = CoroutineMock(side_effect=list(pages))
+    session = MagicMock()
+    session.get = CoroutineMock(return_value=response)
+    return session
+
+
+def test_initialization():
+    instance = get_instance()
+    assert instance.gas_currency == "ETH"
+    assert instance.quote_currency == "SGD"
+
+
+@pytest.mark.asyncio
+async def test_fetch_prices_out_of_order():
+    session = make_session([make_kline(minute, f"{minute}.5") for minute in range(10)])
+
+    prices = await get_instance().fetch_prices(session, [500, 70, 119, 120, 9999])
+
+    # Each timestamp should be priced with the kline it closed in
+    assert prices == [
+        (85, 1),  # minute 8
+        (15, 1),  # minute 1
+        (15, 1),  # minute 1
+        (25, 1),  # minute 2
+        (95, 1),  # beyond the klines so the latest one is used
+    ]
+
+    # Should fetch from the minute before the earliest timestamp
+    assert "startTime=10000&endTime=9999000&" in session.get.mock_calls[0].args[0]
+
+
+@pytest.mark.asyncio
+@patch("src.pricing.binance.KLINES_LIMIT", 5)
+async def test_fetch_prices_paginates_klines():
+    klines = [make_kline(minute, "1.0") for minute in range(12)]
+    session = make_session(klines[:5], klines[5:10], klines[10:])
+
+    prices = await get_instance().fetch_prices(session, [60, 700])
+
+    assert prices == [(10, 1), (10, 1)]
+
+    # Should fetch the pages until the range is covered
+    assert len(session.get.mock_calls) == 3
+
+    # Each page should continue after the previous page's last close time
+    assert "startTime=300000&" in session.get.mock_calls[1].args[0]
+    assert "startTime=600000&" in session.get.mock_calls[2].args[0]
+
+
+@pytest.mark.asyncio
+@patch("src.pricing.binance.KLINES_LIMIT", 2)
+async def test_fetch_prices_stops_once_covered():
+    session = make_session([make_kline(0, "1.0"), make_kline(1, "2.0")])
+
+    # A full page whose last close time covers the range needs no further page
+    assert await get_instance().fetch_prices(session, [60, 61]) == [(20, 1)] * 2
+    session.get.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_fetch_prices_without_klines():
+    with pytest.raises(ValueError):
+        await get_instance().fetch_prices(make_session([]), [123])
+
+
+@pytest.mark.asyncio
+async def test_fetch_price():
+    session = make_session([make_kline(0, "1234.5678")])
+
+    assert await get_instance().fetch_price(session, 123) == (12345678, 4)
+    assert "endTime=123000&limit=1" in session.get.mock_calls[0].args[0]
@@ -0,0 +1,64 @@
+# 3rd party libraries
+from asynctest import MagicMock, patch
+import pytest
+
+# Code
+from src.pricing import BinancePriceSource, SwapsPriceSource
+from src.pricing.resolver import PriceSourceResolver as Cls
+
+
+def test_get_binance_price_source_by_default():
+    get_database = MagicMock()
+    config = {"gas_currency": "ETH", "quote_currency": "SGD"}
+
+    source = Cls.get_price_source(config, get_database)
+
+    assert isinstance(source, BinancePriceSource)
+    assert source.quote_currency == "SGD"
+
+    # Should not need the database
+    get_database.assert_not_called()
+
+
+def test_get_swaps_price_source():
+    get_database = MagicMock()
+    config = {
+        "source": "swaps",
+        "gas_currency": "ETH",
+        "quote_currency": "USDC",
+        "pool_address": "0x123",
+        "price_field": "swap_price_1",
+        "decimals": 18,
+    }
+
+    source = Cls.get_price_source(config, get_database)
+
+    assert isinstance(source, SwapsPriceSource)
+    assert source.quote_currency == "USDC"
+
+    # Should read from the swaps collection
+    get_database().__getitem__.assert_called_with("swaps")
+
+
+@patch("src.pricing.resolver.SwapsPriceSource")
+def test_get_swaps_price_source_in_timeseries_layout(source):
+    config = {
+        "source": "swaps",
+        "gas_currency": "ETH",
+        "quote_currency": "USDC",
+        "pool_address": "0x123",
+        "price_field": "swap_price_1",
+        "decimals": 18,
+    }
+
+    Cls.get_price_source(config, MagicMock(), "timeseries")
+
+    # Should read the recorded swaps in their layout
+    assert source.call_args.kwargs["storage_layout"] == "timeseries"
+
+
+def test_get_unrecognizable_price_source():
+    config = {"source": "unknown", "gas_currency": "ETH", "quote_currency": "SGD"}
+
+    with pytest.raises(ValueError):
+        Cls.get_price_source(config, MagicMock())
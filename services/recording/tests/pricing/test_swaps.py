@@ -0,0 +1,240 @@
+# Standard libraries
+from datetime import datetime, timezone
+
+# 3rd party libraries
+from asynctest import MagicMock
+import pytest
+
+# Code
+from src.events import EventRecord
+from src.pricing.swaps import SwapsPriceSource as Cls
+
+# Constants
+POOL_ADDRESS = "0x88e6A0c2dDD26FEEb64F039a2c41296FcB3f5640"
+
+
+class MockedCursor:
+    """Helper to mock an asynchronous cursor over the documents"""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, *_args):
+        return self
+
+    async def to_list(self, _length):
+        return self.documents
+
+
+def make_document(timestamp, price):
+    return {"timestamp": timestamp, "data": {"swap_price_1": str(price)}}
+
+
+def make_record(timestamp, price, address=POOL_ADDRESS.lower()):
+    return EventRecord(
+        "uniswap-v3-pool-swap",
+        "0x1",
+        0,
+        1,
+        timestamp,
+        1,
+        1,
+        1,
+        "USDT",
+        address,
+        [],
+        "0x",
+        {"swap_price_1": str(price)},
+    )
+
+
+def get_instance(*pages, storage_layout="documents"):
+    collection = MagicMock()
+    collection.find.side_effect = [MockedCursor(page) for page in pages]
+    instance = Cls(
+        collection,
+        POOL_ADDRESS,
+        "swap_price_1",
+        18,
+        "USDC",
+        storage_layout=storage_layout,
+    )
+    return instance, collection
+
+
+@pytest.mark.asyncio
+async def test_fetch_prices_loads_and_matches_buckets():
+    instance, collection = get_instance(
+        [
+            make_document(0, 100),
+            make_document(30, 110),
+            make_document(20, 105),  # Older within the same bucket
+            make_document(130, 120),
+        ]
+    )
+
+    prices = await instance.fetch_prices(MagicMock(), [150, 59, 90, 3700])
+
+    # Should use the latest price of the latest bucket at or before each timestamp
+    assert prices == [(120, 18), (110, 18), (110, 18), (120, 18)]
+
+    # Should query the pool's range looking back for the preceding price
+    query, projection = collection.find.mock_calls[0].args
+    assert query == {
+        "event_id": "uniswap-v3-pool-swap",
+        "address": POOL_ADDRESS.lower(),
+        "timestamp": {"$gte": 59 - 3600, "$lte": 3700},
+    }
+    assert projection == {"_id": 0, "timestamp": 1, "data.swap_price_1": 1}
+
+
+@pytest.mark.asyncio
+async def test_fetch_prices_in_timeseries_layout():
+    instance, collection = get_instance(
+        [make_document(60, 100)], storage_layout="timeseries"
+    )
+
+    assert await instance.fetch_prices(MagicMock(), [120]) == [(100, 18)]
+
+    # Should also match the pool's series and the time range of the buckets
+    query, _projection = collection.find.mock_calls[0].args
+    assert query == {
+        "event_id": "uniswap-v3-pool-swap",
+        "address": POOL_ADDRESS.lower(),
+        "timestamp": {"$gte": 120 - 3600, "$lte": 120},
+        "meta.event_id": "uniswap-v3-pool-swap",
+        "meta.address": POOL_ADDRESS.lower(),
+        "time": {
+            "$gte": datetime(1969, 12, 31, 23, 2, tzinfo=timezone.utc),
+            "$lte": datetime(1970, 1, 1, 0, 2, tzinfo=timezone.utc),
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_fetch_prices_before_the_earliest_bucket():
+    instance, _ = get_instance([make_document(600, 100), make_document(700, 200)])
+
+    # Should not fall forward onto a later price
+    with pytest.raises(ValueError):
+        await instance.fetch_prices(MagicMock(), [10, 650])
+
+
+@pytest.mark.asyncio
+async def test_fetch_prices_beyond_the_lookback():
+    instance, _ = get_instance([make_document(600, 100)])
+
+    # Should match within the lookback
+    assert await instance.fetch_prices(MagicMock(), [4200]) == [(100, 18)]
+
+    # Should not match a price older than the lookback
+    with pytest.raises(ValueError):
+        await instance.fetch_prices(MagicMock(), [4201])
+
+
+@pytest.mark.asyncio
+async def test_fetch_prices_reuses_loaded_range():
+    instance, collection = get_instance(
+        [make_document(1000, 100)], [make_document(5000, 200)]
+    )
+
+    await instance.fetch_prices(MagicMock(), [1000, 2000])
+
+    # Within the loaded range (or a bucket beyond it) should not query again
+    assert await instance.fetch_prices(MagicMock(), [1500, 2050]) == [(100, 18)] * 2
+    assert len(collection.find.mock_calls) == 1
+
+    # Beyond the loaded range should query again and extend the range
+    assert await instance.fetch_prices(MagicMock(), [5000]) == [(200, 18)]
+    assert len(collection.find.mock_calls) == 2
+    assert await instance.fetch_prices(MagicMock(), [1500, 5000]) == [
+        (100, 18),
+        (200, 18),
+    ]
+    assert len(collection.find.mock_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_prices_with_disjoint_ranges():
+    instance, collection = get_instance(
+        [make_document(10000, 100)], [make_document(100000, 200)], []
+    )
+
+    await instance.fetch_prices(MagicMock(), [10000])
+    await instance.fetch_prices(MagicMock(), [100000])
+
+    # The disjoint range replaces the loaded range
+    await instance.fetch_prices(MagicMock(), [10000])
+    assert len(collection.find.mock_calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_fetch_prices_without_recorded_swaps():
+    instance, _ = get_instance([])
+
+    with pytest.raises(ValueError):
+        await instance.fetch_prices(MagicMock(), [123])
+
+
+@pytest.mark.asyncio
+async def test_observe_records_keeps_index_fresh():
+    instance, collection = get_instance([make_document(1000, 100)])
+
+    # Observing before anything is loaded only indexes the price
+    instance.observe_records([make_record(900, 90)])
+
+    await instance.fetch_prices(MagicMock(), [1000])
+
+    # Should index only the pool's records with the price field
+    instance.observe_records(
+        [
+            make_record(1050, 110),
+            make_record(1200, 999, address="0xother"),
+            EventRecord(
+                "id",
+                "0x1",
+                0,
+                1,
+                1300,
+                1,
+                1,
+                1,
+                "USDT",
+                POOL_ADDRESS,
+                [],
+                "0x",
+                {},
+            ),
+        ]
+    )
+
+    # The observed records extend the loaded range so no query is needed
+    assert await instance.fetch_prices(MagicMock(), [950, 1100]) == [
+        (90, 18),
+        (110, 18),
+    ]
+    assert len(collection.find.mock_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_observe_records_does_not_extend_across_gaps():
+    instance, collection = get_instance(
+        [make_document(1000, 100)], [make_document(3000, 300)]
+    )
+    await instance.fetch_prices(MagicMock(), [1000])
+
+    # A record far past the loaded range, e.g., of a backfill
+    instance.observe_records([make_record(5000, 500)])
+
+    # Should load the gap rather than match the stale price
+    assert await instance.fetch_prices(MagicMock(), [3000]) == [(300, 18)]
+    assert len(collection.find.mock_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_prices_skips_zero_prices():
+    instance, _ = get_instance([make_document(600, 100), make_document(630, 0)])
+    instance.observe_records([make_record(700, 0)])
+
+    # Should not quote with the prices of empty swaps
+    assert await instance.fetch_prices(MagicMock(), [650, 700]) == [(100, 18)] * 2
@@ -0,0 +1,33 @@
+# 3rd party libraries
+from asynctest import MagicMock
+import pytest
+
+# Code
+from src.sinks.base import BaseSink
+
+
+class SubClass(BaseSink):
+    async def write(self, category, records):
+        return list(range(len(records)))
+
+
+def test_abstract_class_uninstantiable():
+    with pytest.raises(TypeError):
+        BaseSink()
+
+
+def test_sub_class_initialization():
+    instance = SubClass()
+    assert instance.__repr__() == "SubClass"
+    assert instance.__str__() == "SubClass"
+
+
+@pytest.mark.asyncio
+async def test_defaults_do_nothing():
+    instance = SubClass()
+    await instance.open(["swaps"])
+    records = [MagicMock()]
+    assert await instance.filter_written("swaps", records) == records
+    assert await instance.write("swaps", records) == [0]
+    await instance.flush()
+    await instance.close()
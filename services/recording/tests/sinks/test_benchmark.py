@@ -0,0 +1,97 @@
+# 3rd party libraries
+from asynctest import MagicMock, CoroutineMock, patch
+import pytest
+
+# Code
+from src.sinks.benchmark import SinkBenchmark as Cls
+
+# Constants
+SETTINGS = {"write_concern": 1, "journal": None, "ordered": False, "batch_size": 10}
+
+
+def get_database():
+    """Helper to create a mocked scratch database"""
+    database = MagicMock()
+    database.name = "database_benchmark"
+    database.client.drop_database = CoroutineMock()
+    return database
+
+
+def test_get_combinations():
+    combinations = Cls.get_combinations([1, "majority"], [None], [False, True], [10])
+
+    # Should combine every setting
+    assert len(combinations) == 4
+    assert combinations[0] == SETTINGS
+    assert combinations[-1] == {
+        "write_concern": "majority",
+        "journal": None,
+        "ordered": True,
+        "batch_size": 10,
+    }
+
+
+def test_get_records():
+    records = Cls.get_records(10)
+
+    # Should generate distinct swaps over consecutive blocks
+    assert len({record.key for record in records}) == 10
+    assert [record.block_number for record in records[3:6]] == [0, 1, 1]
+    assert all("swap_price_1" in record.data for record in records)
+
+    # Should price them as integers like the recorded swaps
+    assert all(record.data["swap_price_0"].isdigit() for record in records)
+
+
+@patch("src.sinks.benchmark.MongoSink")
+def test_run(sink):
+    sink.return_value.open = CoroutineMock()
+    sink.return_value.write = CoroutineMock()
+    database = get_database()
+
+    results = Cls(MagicMock(), database).run_synchronously(
+        100, [SETTINGS, {**SETTINGS, "ordered": True}]
+    )
+
+    # Should write all the records with each combination's settings
+    assert sink.return_value.write.await_count == 2
+    assert len(sink.return_value.write.call_args.args[1]) == 100
+    assert sink.call_args.kwargs["ordered"] is True
+    assert sink.call_args.kwargs["storage_layout"] == "documents"
+
+    # Should report the throughput of each
+    assert [result["ordered"] for result in results] == [False, True]
+    assert all(result["records_per_second"] > 0 for result in results)
+
+    # Should drop the scratch database before each run and after all
+    database.client.drop_database.assert_awaited_with("database_benchmark")
+    assert database.client.drop_database.await_count == 3
+
+
+@pytest.mark.asyncio
+@patch("src.sinks.benchmark.MongoSink")
+async def test_run_drops_after_failure(sink):
+    sink.return_value.open = CoroutineMock(side_effect=RuntimeError)
+    database = get_database()
+
+    with pytest.raises(RuntimeError):
+        await Cls(MagicMock(), database).run_asynchronously(10, [SETTINGS])
+
+    # Should still drop the scratch database
+    assert database.client.drop_database.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_run_with_mongo_sink():
+    database = get_database()
+    collection = database.get_collection.return_value
+    collection.insert_many = CoroutineMock()
+    collection.bulk_write = CoroutineMock()
+
+    # Should write the records through the sink, aggregating them into candles
+    results = await Cls(MagicMock(), database).run_asynchronously(10, [SETTINGS])
+
+    assert results[0]["records"] == 10
+    collection.insert_many.assert_awaited_once()
+    candle_updates = collection.bulk_write.call_args.args[0]
+    assert sum(u._doc["$inc"]["count"] for u in candle_updates) == 4 * 10
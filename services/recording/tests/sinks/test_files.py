@@ -0,0 +1,110 @@
+# Standard libraries
+import gzip
+import json
+import os
+
+# 3rd party libraries
+import pyarrow.parquet as pq
+import pytest
+
+# Code
+from src.events import EventRecord
+from src.sinks.files import FileSink as Cls
+
+# Constants
+SWAP_DATA = {
+    "sender": "0xa",
+    "recipient": "0xb",
+    "symbol_0": "USDC",
+    "symbol_1": "WETH",
+    "amount_0": "100",
+    "amount_1": "-1",
+    "swap_price_0": "1",
+    "swap_price_1": str(10**40),
+}
+RECORDS = [
+    EventRecord(
+        "uniswap-v3-pool-swap",
+        "0x1",
+        i,
+        10 + i,
+        60,
+        1,
+        1,
+        1,
+        "SGD",
+        "0x",
+        [],
+        "0x",
+        SWAP_DATA,
+    )
+    for i in range(5)
+]
+
+
+INVALID_SETTINGS_PARAMETERS = [("csv", 10), ("ndjson", 0)]
+
+
+@pytest.mark.parametrize("fmt,segment_records", INVALID_SETTINGS_PARAMETERS)
+def test_initialization_with_invalid_settings(tmp_path, fmt, segment_records):
+    # Should raise a value error
+    with pytest.raises(ValueError):
+        Cls(str(tmp_path), fmt, segment_records)
+
+
+@pytest.mark.asyncio
+async def test_write_ndjson(tmp_path):
+    sink = Cls(str(tmp_path), "ndjson", 2)
+
+    # Should write all the records
+    assert await sink.write("swaps", RECORDS[:3]) == [0, 1, 2]
+    await sink.flush()
+    assert await sink.write("swaps", RECORDS[3:]) == [0, 1]
+    await sink.close()
+
+    # Should start a new segment every 2 records, named after its first record
+    names = sorted(os.listdir(tmp_path / "swaps"))
+    assert names == [
+        f"uniswap-v3-pool-swap-{10 + i:012d}-{i:06d}.ndjson.gz" for i in (0, 2, 4)
+    ]
+
+    documents = []
+    for name in names:
+        with gzip.open(tmp_path / "swaps" / name, "rt") as f:
+            documents.extend(json.loads(line) for line in f)
+
+    assert documents == [record.to_document() for record in RECORDS]
+
+
+@pytest.mark.asyncio
+async def test_write_parquet(tmp_path):
+    sink = Cls(str(tmp_path), "parquet")
+
+    await sink.write("swaps", RECORDS[:2])
+    await sink.write("swaps", RECORDS[2:])
+
+    # Should only write the footer once flushed
+    await sink.flush()
+    await sink.close()
+
+    (name,) = os.listdir(tmp_path / "swaps")
+    table = pq.read_table(tmp_path / "swaps" / name)
+
+    # Should write the typed columns of the event
+    assert table.num_rows == 5
+    assert table.column("log_index").to_pylist() == list(range(5))
+    assert table.column("swap_price_1").to_pylist()[0] == 10**40
+
+
+@pytest.mark.asyncio
+async def test_write_without_overwriting(tmp_path):
+    for _ in range(2):
+        sink = Cls(str(tmp_path))
+        await sink.write("swaps", RECORDS[:1])
+        await sink.close()
+
+    # Should write the segments of each run starting at the same record
+    assert sorted(os.listdir(tmp_path / "swaps")) == [
+        "uniswap-v3-pool-swap-000000000010-000000-1.ndjson.gz",
+        "uniswap-v3-pool-swap-000000000010-000000.ndjson.gz",
+    ]
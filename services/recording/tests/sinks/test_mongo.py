@@ -0,0 +1,182 @@
+# 3rd party libraries
+from asynctest import MagicMock, CoroutineMock, patch
+from pymongo.errors import BulkWriteError
+import pytest
+
+# Code
+from src.events import EventRecord
+from src.sinks.mongo import MongoSink as Cls
+
+# Constants
+SWAP_DATA = {
+    "symbol_0": "USDC",
+    "symbol_1": "WETH",
+    "amount_0": "100",
+    "amount_1": "-1",
+    "swap_price_0": "1",
+    "swap_price_1": "100",
+}
+RECORDS = [
+    EventRecord("id", tx, 0, 1, 60, 1, 1, 1, "SGD", "0x", [], "0x", SWAP_DATA)
+    for tx in ["0x1", "0x2"]
+]
+
+INVALID_SETTINGS_PARAMETERS = [
+    ("merge", 1, "documents"),
+    ("insert", 3, "documents"),
+    ("insert", 1, "buckets"),
+]
+
+
+@pytest.mark.parametrize(
+    "write_mode,schema_version,storage_layout", INVALID_SETTINGS_PARAMETERS
+)
+def test_initialization_with_invalid_settings(
+    write_mode, schema_version, storage_layout
+):
+    # Should raise a value error
+    with pytest.raises(ValueError):
+        Cls(MagicMock(), write_mode, schema_version, storage_layout)
+
+
+@pytest.mark.parametrize("write_concern,batch_size", [(0, None), (1, 0)])
+def test_initialization_with_invalid_write_settings(write_concern, batch_size):
+    # Should raise a value error
+    with pytest.raises(ValueError):
+        Cls(MagicMock(), write_concern=write_concern, batch_size=batch_size)
+
+
+@pytest.mark.asyncio
+async def test_write_aggregates_inserted_swaps_into_candles():
+    # Only the second record is newly inserted
+    database = MagicMock()
+    bulk_write = CoroutineMock(return_value=MagicMock(upserted_ids={1: "0x2-0"}))
+    database.__getitem__().bulk_write = bulk_write
+
+    assert await Cls(database).write("swaps", RECORDS) == [1]
+
+    # Should write the records, their gas, then the candles of the inserted record
+    assert bulk_write.call_count == 3
+    gas_updates = bulk_write.call_args_list[1].args[0]
+    assert [u._filter["_id"] for u in gas_updates] == ["0x1", "0x2"]
+    candle_updates = bulk_write.call_args_list[2].args[0]
+    assert len(candle_updates) == 4
+    assert all(u._doc["$inc"]["count"] == 1 for u in candle_updates)
+
+
+@pytest.mark.asyncio
+async def test_write_inserts_first():
+    # The first record was already written
+    database = MagicMock()
+    database.__getitem__().insert_many = CoroutineMock(
+        side_effect=BulkWriteError(
+            {"writeErrors": [{"index": 0, "code": 11000}], "writeConcernErrors": []}
+        )
+    )
+    bulk_write = CoroutineMock(return_value=MagicMock(upserted_ids={}))
+    database.__getitem__().bulk_write = bulk_write
+
+    assert await Cls(database, "insert").write("swaps", RECORDS) == [1]
+
+    # Should upsert the duplicate, write the gas, then the candles
+    assert [u._filter["_id"] for u in bulk_write.call_args_list[0].args[0]] == ["0x1-0"]
+    assert bulk_write.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_write_with_compact_schema():
+    database = MagicMock()
+    bulk_write = CoroutineMock(return_value=MagicMock(upserted_ids={}))
+    database.__getitem__().bulk_write = bulk_write
+
+    record = EventRecord(
+        "event_id", "0x1234", 123, 1, 1, 1, 1, 1, "SGD", "0x456", [], "0x", {}
+    )
+    await Cls(database, "upsert", 2).write("category", [record])
+
+    # Should write the document in the compact schema
+    document = bulk_write.call_args_list[0].args[0][0]._doc["$set"]
+    assert document["schema_version"] == 2
+    assert document["transaction_hash"] == b"\x12\x34"
+
+
+@pytest.mark.asyncio
+@patch("src.sinks.mongo.TimeSeriesWriter")
+async def test_timeseries(timeseries_writer):
+    timeseries_writer.ensure_collection = CoroutineMock(return_value=True)
+    timeseries_writer.write = CoroutineMock(return_value=[])
+    database = MagicMock()
+    bulk_write = CoroutineMock()
+    database.__getitem__().bulk_write = bulk_write
+
+    instance = Cls(database, "replace", 2, "timeseries")
+    await instance.open(["swaps"])
+
+    # Should ensure the time-series collection and insert the records into it
+    timeseries_writer.ensure_collection.assert_awaited_once_with(database, "swaps")
+    assert await instance.write("swaps", RECORDS) == []
+    assert timeseries_writer.write.call_args.args[1:] == (RECORDS, 2, False)
+
+    # Should only write the gas details without any newly inserted record
+    assert bulk_write.call_count == 1
+
+
+@pytest.mark.asyncio
+@patch("src.sinks.mongo.TimeSeriesWriter")
+async def test_open_documents(timeseries_writer):
+    timeseries_writer.ensure_collection = CoroutineMock()
+
+    await Cls(MagicMock()).open(["swaps"])
+
+    # Should not create any collection
+    timeseries_writer.ensure_collection.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_write_in_batches():
+    # Only the record of the second batch is newly inserted
+    database = MagicMock()
+    bulk_write = CoroutineMock(
+        side_effect=[
+            MagicMock(upserted_ids={}),
+            None,
+            MagicMock(upserted_ids={0: "0x2-0"}),
+            None,
+            None,
+        ]
+    )
+    database.get_collection().bulk_write = bulk_write
+
+    instance = Cls(
+        database, write_concern="majority", journal=True, ordered=True, batch_size=1
+    )
+
+    # Should return the indices within all the records
+    assert await instance.write("swaps", RECORDS) == [1]
+
+    # Should write each batch with its gas, and the candles of the second only
+    assert bulk_write.call_count == 5
+    assert [u._filter["_id"] for u in bulk_write.call_args_list[2].args[0]] == ["0x2-0"]
+    assert len(bulk_write.call_args_list[4].args[0]) == 4
+
+    # Should write in order with the write concern
+    assert bulk_write.call_args_list[0].kwargs == {"ordered": True}
+    write_concern = database.get_collection.call_args.kwargs["write_concern"]
+    assert write_concern.document == {"w": "majority", "j": True}
+
+
+FILTER_WRITTEN_PARAMETERS = ["documents", "timeseries"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage_layout", FILTER_WRITTEN_PARAMETERS)
+async def test_filter_written(storage_layout):
+    # The first record was already written
+    database = MagicMock()
+    database.__getitem__().distinct = CoroutineMock(return_value=["0x1-0"])
+
+    instance = Cls(database, storage_layout=storage_layout)
+
+    # Should only keep the records not written
+    assert await instance.filter_written("swaps", RECORDS) == RECORDS[1:]
+    database.__getitem__().distinct.assert_awaited_once()
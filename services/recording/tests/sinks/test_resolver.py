@@ -0,0 +1,37 @@
+# 3rd party libraries
+from asynctest import MagicMock
+import pytest
+
+# Code
+from src.sinks import FileSink, MongoSink
+from src.sinks.resolver import SinkResolver as Cls
+
+
+def test_get_mongo_sink_by_default():
+    get_database = MagicMock()
+
+    config = {"write_concern": "majority", "ordered": True, "batch_size": 100}
+
+    sink = Cls.get_sink(config, get_database, "insert", 2, "timeseries")
+
+    # Should write into the database
+    assert isinstance(sink, MongoSink)
+    get_database.assert_called_once()
+
+
+def test_get_files_sink(tmp_path):
+    get_database = MagicMock()
+    config = {"type": "files", "directory": str(tmp_path), "format": "parquet"}
+
+    sink = Cls.get_sink(config, get_database)
+
+    assert isinstance(sink, FileSink)
+
+    # Should not need the database
+    get_database.assert_not_called()
+
+
+def test_get_unknown_sink():
+    # Should raise a value error
+    with pytest.raises(ValueError):
+        Cls.get_sink({"type": "unknown"}, MagicMock())
@@ -0,0 +1,104 @@
+# 3rd party libraries
+from bson.decimal128 import Decimal128
+
+# Code
+from src.events import EventRecord
+from src.storage.candles import SwapCandlesAggregator as Cls
+
+
+def make_swap(timestamp, block_number, log_index, price_0, price_1, amount_0):
+    """Helper to create a swap record"""
+    return EventRecord(
+        "uniswap-v3-pool-swap",
+        "0x1",
+        log_index,
+        block_number,
+        timestamp,
+        1,
+        1,
+        1,
+        "USDT",
+        "0xpool",
+        [],
+        "0x",
+        {
+            "symbol_0": "USDC",
+            "symbol_1": "WETH",
+            "amount_0": str(amount_0),
+            "amount_1": str(-amount_0 * 2),
+            "swap_price_0": str(price_0),
+            "swap_price_1": str(price_1),
+        },
+    )
+
+
+def d(value):
+    return Decimal128(str(value))
+
+
+def test_get_updates_skips_records_without_swap_prices():
+    record = EventRecord("id", "0x1", 0, 1, 1, 1, 1, 1, "USDT", "0x", [], "0x", {})
+    assert Cls.get_updates([record]) == []
+
+
+def test_get_updates_one_per_granularity():
+    updates = Cls.get_updates([make_swap(3661, 10, 0, 5, 7, 100)])
+
+    assert [update._filter for update in updates] == [
+        {"_id": "0xpool-1m-3660"},
+        {"_id": "0xpool-5m-3600"},
+        {"_id": "0xpool-1h-3600"},
+        {"_id": "0xpool-1d-0"},
+    ]
+    assert all(update._upsert for update in updates)
+
+
+def test_get_updates_aggregates_within_bucket():
+    # Out of order swaps within the same minute
+    updates = Cls.get_updates(
+        [
+            make_swap(61, 11, 3, 30, 3, -100),
+            make_swap(62, 10, 5, 10, 1, 200),
+            make_swap(119, 11, 1, 20, 2, 300),
+        ]
+    )
+
+    assert updates[0]._filter == {"_id": "0xpool-1m-60"}
+    assert updates[0]._doc == {
+        "$setOnInsert": {
+            "address": "0xpool",
+            "granularity": "1m",
+            "bucket": 60,
+            "symbol_0": "USDC",
+            "symbol_1": "WETH",
+        },
+        "$min": {
+            # Opened by the earliest swap by block and log index
+            "open": {"sequence": 10_000_005, "price_0": d(10), "price_1": d(1)},
+            "low_0": d(10),
+            "low_1": d(1),
+        },
+        "$max": {
+            # Closed by the latest swap by block and log index
+            "close": {"sequence": 11_000_003, "price_0": d(30), "price_1": d(3)},
+            "high_0": d(30),
+            "high_1": d(3),
+        },
+        "$inc": {"volume_0": d(600), "volume_1": d(1200), "count": 3},
+    }
+
+
+def test_get_updates_rounds_beyond_decimal128_precision():
+    price = 10**40 + 123
+    update = Cls.get_updates([make_swap(61, 10, 0, price, 1, -(10**36) - 1)])[0]
+
+    # Should round to 34 significant digits rather than raise
+    assert update._doc["$max"]["high_0"] == Decimal128(
+        "1.000000000000000000000000000000000E+40"
+    )
+    assert update._doc["$inc"]["volume_0"] == Decimal128(
+        "1.000000000000000000000000000000000E+36"
+    )
+    assert update._doc["$inc"]["volume_1"] == Decimal128(
+        "2.000000000000000000000000000000000E+36"
+    )
@@ -0,0 +1,131 @@
+# 3rd party libraries
+from asynctest import CoroutineMock, MagicMock
+from pymongo.errors import DuplicateKeyError
+import pytest
+
+# Code
+from src.storage.coverage import (
+    COVERAGE_COLLECTION,
+    COVERAGE_MAX_RETRIES,
+    BlockRanges,
+    CoverageLedger as Cls,
+)
+
+
+MERGE_PARAMETERS = [
+    ([], []),
+    ([(5, 9)], [(5, 9)]),
+    # Unsorted and overlapping
+    ([(20, 30), (1, 10), (5, 12)], [(1, 12), (20, 30)]),
+    # Adjacent
+    ([(1, 10), (11, 20)], [(1, 20)]),
+    # Contained
+    ([(1, 100), (10, 20)], [(1, 100)]),
+]
+
+
+@pytest.mark.parametrize("ranges,expected", MERGE_PARAMETERS)
+def test_merge(ranges, expected):
+    assert BlockRanges.merge(ranges) == expected
+
+
+SUBTRACT_PARAMETERS = [
+    # Nothing recorded
+    (10, 20, [], [(10, 20)]),
+    # Fully recorded
+    (10, 20, [(1, 30)], []),
+    # Gaps within, around, and ranges outside the span
+    (10, 50, [(1, 5), (12, 20), (30, 40), (60, 70)], [(10, 11), (21, 29), (41, 50)]),
+    # Recorded up to the end
+    (10, 50, [(40, 50)], [(10, 39)]),
+]
+
+
+@pytest.mark.parametrize("from_block,to_block,ranges,expected", SUBTRACT_PARAMETERS)
+def test_subtract(from_block, to_block, ranges, expected):
+    assert BlockRanges.subtract(from_block, to_block, ranges) == expected
+
+
+def get_instance(documents, update_error=None):
+    collection = MagicMock()
+    collection.find_one = CoroutineMock(side_effect=documents)
+    collection.update_one = CoroutineMock(side_effect=update_error)
+    database = {COVERAGE_COLLECTION: collection}
+    return Cls(database), collection
+
+
+@pytest.mark.asyncio
+async def test_add_to_missing_document():
+    instance, collection = get_instance([None])
+
+    assert await instance.add("event_id", "0xABC", 10, 20)
+
+    # Should upsert the first version keyed by the lowercase address
+    query, update = collection.update_one.call_args.args
+    assert query == {"_id": "event_id-0xabc", "version": 0}
+    assert update == {
+        "$set": {"event_id": "event_id", "address": "0xabc", "ranges": [[10, 20]]},
+        "$inc": {"version": 1},
+    }
+    assert collection.update_one.call_args.kwargs == {"upsert": True}
+
+
+@pytest.mark.asyncio
+async def test_add_merges_into_document():
+    document = {"_id": "event_id-0xabc", "version": 3, "ranges": [[1, 9], [30, 40]]}
+    instance, collection = get_instance([document])
+
+    assert await instance.add("event_id", "0xabc", 10, 20)
+
+    # Should merge the adjacent range at the read version
+    query, update = collection.update_one.call_args.args
+    assert query["version"] == 3
+    assert update["$set"]["ranges"] == [[1, 20], [30, 40]]
+
+
+@pytest.mark.asyncio
+async def test_add_already_recorded():
+    document = {"_id": "event_id-0xabc", "version": 3, "ranges": [[1, 40]]}
+    instance, collection = get_instance([document])
+
+    # Should not update the ranges already recorded
+    assert await instance.add("event_id", "0xabc", 10, 20)
+    collection.update_one.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_add_retries_on_conflict():
+    before = {"_id": "event_id-0xabc", "version": 1, "ranges": [[1, 5]]}
+    after = {"_id": "event_id-0xabc", "version": 2, "ranges": [[1, 5], [30, 40]]}
+    instance, collection = get_instance(
+        [before, after], [DuplicateKeyError("conflict"), None]
+    )
+
+    assert await instance.add("event_id", "0xabc", 10, 20)
+
+    # Should merge into the ranges written meanwhile
+    query, update = collection.update_one.call_args.args
+    assert query["version"] == 2
+    assert update["$set"]["ranges"] == [[1, 5], [10, 20], [30, 40]]
+
+
+@pytest.mark.asyncio
+async def test_add_gives_up_after_conflicts():
+    instance, collection = get_instance(
+        COVERAGE_MAX_RETRIES * [None], DuplicateKeyError("conflict")
+    )
+
+    assert not await instance.add("event_id", "0xabc", 10, 20)
+    assert collection.update_one.call_count == COVERAGE_MAX_RETRIES
+
+
+@pytest.mark.asyncio
+async def test_get_missing():
+    document = {"_id": "event_id-0xabc", "version": 1, "ranges": [[1, 5], [10, 20]]}
+    instance, collection = get_instance([document, None])
+
+    assert await instance.get_missing("event_id", "0xABC", 1, 25) == [(6, 9), (21, 25)]
+    collection.find_one.assert_called_with({"_id": "event_id-0xabc"})
+
+    # Should miss the whole span when nothing is recorded
+    assert await instance.get_missing("event_id", "0xabc", 1, 25) == [(1, 25)]
@@ -0,0 +1,44 @@
+# Code
+from src.events import EventRecord
+from src.storage.gas import TransactionGasAggregator as Cls
+
+
+def make_record(transaction_hash, log_index):
+    """Helper to create a record"""
+    return EventRecord(
+        "id",
+        transaction_hash,
+        log_index,
+        100,
+        1000,
+        21000,
+        3,
+        4,
+        "USDT",
+        "0x",
+        [],
+        "0x",
+        {},
+    )
+
+
+def test_get_updates():
+    records = [make_record("0x1", 0), make_record("0x1", 1), make_record("0x2", 0)]
+
+    updates = Cls.get_updates(records, "swaps")
+
+    # Should upsert one document per transaction
+    assert [u._filter for u in updates] == [{"_id": "0x1"}, {"_id": "0x2"}]
+    assert all(u._upsert for u in updates)
+
+    # Should set the gas details and tag the category
+    assert updates[0]._doc == {
+        "$set": {
+            "block_number": 100,
+            "timestamp": 1000,
+            "gas_used": "21000",
+            "gas_price_wei": "3",
+            "gas_price_quote": {"currency": "USDT", "value": "4"},
+        },
+        "$addToSet": {"categories": "swaps"},
+    }
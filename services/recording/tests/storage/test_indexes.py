@@ -0,0 +1,260 @@
+# Standard libraries
+from datetime import datetime, timezone
+import os
+
+# 3rd party libraries
+from asynctest import CoroutineMock, MagicMock, patch
+import pytest
+
+# Code
+from src.storage.indexes import (
+    INDEXES_VERSION,
+    MANAGED_INDEXES,
+    QUERY_SHAPES,
+    TIMESERIES_INDEXES,
+    IndexManager as Cls,
+)
+
+# Constants
+MOCKED_EXPLANATION = {
+    "queryPlanner": {
+        "winningPlan": {
+            "stage": "LIMIT",
+            "inputStage": {
+                "stage": "FETCH",
+                "inputStage": {
+                    "stage": "IXSCAN",
+                    "indexName": "event_id_1_block_number_1_log_index_1",
+                },
+            },
+        }
+    },
+    "executionStats": {
+        "totalKeysExamined": 1,
+        "totalDocsExamined": 1,
+        "nReturned": 1,
+    },
+}
+
+
+class MockedCursor:
+    def __init__(self, documents):
+        self.__documents = documents
+
+    async def to_list(self, length):
+        return self.__documents[:length]
+
+
+@patch("src.storage.indexes.MongoClientFactory")
+def get_instance(
+    factory,
+    versions=None,
+    index_information=None,
+    storage_layout="documents",
+    layouts=None,
+):
+    collections = {}
+
+    def list_collections(filter):
+        # The collections are regular ones unless missing or time-series
+        layout = (layouts or {}).get(filter["name"], "collection")
+        if layout is None or filter.get("type", layout) != layout:
+            return MockedCursor([])
+        return MockedCursor([{"name": filter["name"], "type": layout}])
+
+    def get_collection(name):
+        if name not in collections:
+            collection = MagicMock()
+            collection.find_one = CoroutineMock(
+                side_effect=lambda query: (versions or {}).get(query["_id"])
+            )
+            collection.update_one = CoroutineMock()
+            collection.create_indexes = CoroutineMock()
+            collection.drop_index = CoroutineMock()
+            collection.index_information = CoroutineMock(
+                return_value={"_id_": {}, **(index_information or {}).get(name, {})}
+            )
+            collection.find().sort().limit().explain = CoroutineMock(
+                return_value=MOCKED_EXPLANATION
+            )
+            collection.find().limit().explain = CoroutineMock(
+                return_value=MOCKED_EXPLANATION
+            )
+            collection.reset_mock()
+            collections[name] = collection
+        return collections[name]
+
+    factory.get_database().__getitem__.side_effect = get_collection
+    factory.get_database().list_collections = CoroutineMock(
+        side_effect=list_collections
+    )
+    factory.get_database().create_collection = CoroutineMock()
+    factory.get_database().command = CoroutineMock(
+        side_effect=lambda _command, name: {
+            "count": 2,
+            "size": 2048,
+            "avgObjSize": 1024,
+            "storageSize": 4096,
+            "indexSizes": {"_id_": 4096},
+            "totalIndexSize": 4096,
+        }
+    )
+
+    return Cls(MagicMock(), storage_layout), get_collection, factory.get_database()
+
+
+def test_initialization_without_environment_variables():
+    with patch.dict(os.environ, {}, clear=True):
+        # Should raise a value error
+        with pytest.raises(ValueError):
+            Cls(MagicMock())
+
+
+def test_initialization_with_unknown_storage_layout():
+    # Should raise a value error
+    with pytest.raises(ValueError):
+        get_instance(storage_layout="buckets")
+
+
+def test_ensure():
+    instance, get_collection, _database = get_instance(
+        versions={
+            "swap_candles": {
+                "_id": "swap_candles",
+                "version": INDEXES_VERSION,
+                "layout": "documents",
+            }
+        },
+        index_information={
+            "swaps": {
+                "block_hash_1": {},
+                "event_id_1_block_number_1_log_index_1": {},
+            }
+        },
+    )
+
+    instance.ensure_synchronously()
+
+    # Should create the managed indexes of the outdated collections
+    swaps = get_collection("swaps")
+    swaps.create_indexes.assert_awaited_once_with(MANAGED_INDEXES["swaps"])
+    get_collection("swap_candles").create_indexes.assert_not_awaited()
+    get_collection("transaction_gas").create_indexes.assert_not_awaited()
+
+    # Should drop the unmanaged indexes only
+    swaps.drop_index.assert_awaited_once_with("block_hash_1")
+    get_collection("transaction_gas").drop_index.assert_not_awaited()
+
+    # Should record the version of the ensured collections
+    versions = get_collection("index_versions")
+    assert versions.update_one.call_count == 2
+    versions.update_one.assert_any_call(
+        {"_id": "swaps"},
+        {"$set": {"version": INDEXES_VERSION, "layout": "documents"}},
+        upsert=True,
+    )
+
+
+ENSURE_TIMESERIES_PARAMETERS = [
+    # Created as a time-series collection when missing
+    ("timeseries", None, True),
+    # Or already one
+    ("timeseries", "timeseries", False),
+    ("documents", "timeseries", False),
+]
+
+
+@pytest.mark.parametrize("storage_layout,layout,created", ENSURE_TIMESERIES_PARAMETERS)
+def test_ensure_timeseries(storage_layout, layout, created):
+    instance, get_collection, database = get_instance(
+        versions={
+            "swaps": {"_id": "swaps", "version": INDEXES_VERSION, "layout": "documents"}
+        },
+        storage_layout=storage_layout,
+        layouts={"swaps": layout},
+    )
+
+    instance.ensure_synchronously()
+
+    # Should create the collection in the time-series layout only if missing
+    assert database.create_collection.called == created
+
+    # Should re-index the collection for its new layout
+    swaps = get_collection("swaps")
+    swaps.create_indexes.assert_awaited_once_with(TIMESERIES_INDEXES["swaps"])
+    get_collection("index_versions").update_one.assert_any_call(
+        {"_id": "swaps"},
+        {"$set": {"version": INDEXES_VERSION, "layout": "timeseries"}},
+        upsert=True,
+    )
+
+
+def test_explain():
+    instance, get_collection, _database = get_instance()
+
+    summaries = instance.explain_synchronously()
+
+    # Should explain every query shape
+    assert list(summaries) == list(QUERY_SHAPES)
+    assert summaries["swaps-by-blocks"] == {
+        "plan": "LIMIT > FETCH > IXSCAN(event_id_1_block_number_1_log_index_1)",
+        "keys_examined": 1,
+        "documents_examined": 1,
+        "returned": 1,
+    }
+
+    # Should only sort the shapes with a sort
+    get_collection("transaction_gas").find().sort.assert_not_called()
+
+
+def test_explain_timeseries():
+    instance, get_collection, _database = get_instance(layouts={"swaps": "timeseries"})
+
+    instance.explain_synchronously()
+
+    # Should explain the shapes as queried in the time-series layout
+    swaps = get_collection("swaps")
+    swaps.find.assert_any_call(
+        {
+            **QUERY_SHAPES["swaps-prices-by-time"]["filter"],
+            "meta.event_id": "uniswap-v3-pool-swap",
+            "meta.address": "0x88e6a0c2ddd26feeb64f039a2c41296fcb3f5640",
+            "time": {
+                "$gte": datetime(1970, 1, 1, tzinfo=timezone.utc),
+                "$lte": datetime(2106, 2, 7, 6, 28, 16, tzinfo=timezone.utc),
+            },
+        }
+    )
+    swaps.find().sort.assert_any_call([("time", 1)])
+
+    # Should keep the shapes of the other collections as they are
+    get_collection("transaction_gas").find.assert_any_call({"_id": "0x0"})
+
+
+def test_summarize_without_execution_stats():
+    summary = Cls.summarize({"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}})
+
+    # Should summarize the plan alone
+    assert summary == {
+        "plan": "COLLSCAN",
+        "keys_examined": None,
+        "documents_examined": None,
+        "returned": None,
+    }
+
+
+def test_stats():
+    instance, _get_collection, _database = get_instance()
+
+    stats = instance.stats_synchronously()
+
+    # Should report the sizes of every managed collection
+    assert list(stats) == list(MANAGED_INDEXES)
+    assert stats["swaps"] == {
+        "count": 2,
+        "size": 2048,
+        "average_document_size": 1024,
+        "storage_size": 4096,
+        "index_sizes": {"_id_": 4096},
+        "total_index_size": 4096,
+    }
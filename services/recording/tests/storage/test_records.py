@@ -0,0 +1,171 @@
+# 3rd party libraries
+from asynctest import CoroutineMock, MagicMock
+from pymongo.errors import BulkWriteError
+import pytest
+
+# Code
+from src.events import EventRecord
+from src.storage.records import RecordsWriter as Cls
+
+# Constants
+RECORDS = [
+    EventRecord("id", tx, 0, 1, 60, 1, 1, 1, "SGD", "0x", [], "0x", {})
+    for tx in ["0x1", "0x2", "0x3"]
+]
+
+
+def get_collection(insert_error=None, upserted_ids=None):
+    collection = MagicMock()
+    collection.insert_many = CoroutineMock(side_effect=insert_error)
+    collection.bulk_write = CoroutineMock(
+        return_value=MagicMock(upserted_ids=upserted_ids or {})
+    )
+    return collection
+
+
+@pytest.mark.asyncio
+async def test_write_inserts_fresh_records():
+    collection = get_collection()
+
+    # Should insert them all unordered without upserting
+    assert await Cls.write(collection, RECORDS, "insert") == [0, 1, 2]
+    documents = collection.insert_many.call_args.args[0]
+    assert documents[0] == {"_id": "0x1-0", **RECORDS[0].to_document()}
+    assert collection.insert_many.call_args.kwargs == {"ordered": False}
+    collection.bulk_write.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_write_upserts_duplicate_records():
+    # The first and last records were already written, the last since removed
+    error = BulkWriteError(
+        {
+            "writeErrors": [
+                {"index": 0, "code": 11000},
+                {"index": 2, "code": 11000},
+            ],
+            "writeConcernErrors": [],
+        }
+    )
+    collection = get_collection(error, upserted_ids={1: "0x3-0"})
+
+    # Should only upsert the duplicates
+    assert await Cls.write(collection, RECORDS, "insert") == [1, 2]
+    upserts = collection.bulk_write.call_args.args[0]
+    assert [u._filter["_id"] for u in upserts] == ["0x1-0", "0x3-0"]
+    assert upserts[0]._doc == {"$set": RECORDS[0].to_document()}
+
+
+@pytest.mark.asyncio
+async def test_write_inserts_in_order():
+    # The first record was already written, and the ordered insert stops there
+    error = BulkWriteError(
+        {"writeErrors": [{"index": 0, "code": 11000}], "writeConcernErrors": []}
+    )
+    collection = get_collection([error, None])
+
+    # Should resume inserting after the duplicate, then upsert it
+    assert await Cls.write(collection, RECORDS, "insert", ordered=True) == [1, 2]
+    assert collection.insert_many.call_count == 2
+    resumed = collection.insert_many.call_args.args[0]
+    assert [document["_id"] for document in resumed] == ["0x2-0", "0x3-0"]
+    assert collection.insert_many.call_args.kwargs == {"ordered": True}
+    upserts = collection.bulk_write.call_args.args[0]
+    assert [u._filter["_id"] for u in upserts] == ["0x1-0"]
+    assert collection.bulk_write.call_args.kwargs == {"ordered": True}
+
+
+@pytest.mark.asyncio
+async def test_write_inserts_in_order_until_the_last():
+    # Only the last record was already written
+    error = BulkWriteError(
+        {"writeErrors": [{"index": 2, "code": 11000}], "writeConcernErrors": []}
+    )
+    collection = get_collection(error)
+
+    # Should not resume past the last record
+    assert await Cls.write(collection, RECORDS, "insert", ordered=True) == [0, 1]
+    assert collection.insert_many.call_count == 1
+
+
+INSERT_ERRORS = [
+    {"writeErrors": [{"index": 0, "code": 11000}, {"index": 1, "code": 121}]},
+    {"writeErrors": [], "writeConcernErrors": [{"code": 64}]},
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("details", INSERT_ERRORS)
+async def test_write_raises_other_insert_errors(details):
+    collection = get_collection(BulkWriteError(details))
+
+    # Should not upsert over failures other than duplicates
+    with pytest.raises(BulkWriteError):
+        await Cls.write(collection, RECORDS, "insert")
+    collection.bulk_write.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_write_replaces_fresh_records():
+    collection = get_collection()
+
+    # Should insert them all without replacing
+    assert await Cls.write(collection, RECORDS, "replace") == [0, 1, 2]
+    documents = collection.insert_many.call_args.args[0]
+    assert [document["_id"] for document in documents] == ["0x1-0", "0x2-0", "0x3-0"]
+    collection.bulk_write.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_write_replaces_duplicate_records():
+    # The first and last records were already written, the last since removed
+    error = BulkWriteError(
+        {
+            "writeErrors": [
+                {"index": 0, "code": 11000},
+                {"index": 2, "code": 11000},
+            ],
+            "writeConcernErrors": [],
+        }
+    )
+    collection = get_collection(error, upserted_ids={1: "0x3-0"})
+
+    # Should only replace the duplicates whole and return the inserted
+    assert await Cls.write(collection, RECORDS, "replace") == [1, 2]
+    replacements = collection.bulk_write.call_args.args[0]
+    assert [r._filter["_id"] for r in replacements] == ["0x1-0", "0x3-0"]
+    assert replacements[0]._doc == RECORDS[0].to_document()
+    assert replacements[0]._upsert
+
+
+@pytest.mark.asyncio
+async def test_write_upserts_records():
+    collection = get_collection(upserted_ids={2: "0x3-0", 0: "0x1-0"})
+
+    # Should set the fields of them all and return the inserted
+    assert await Cls.write(collection, RECORDS, "upsert") == [0, 2]
+    assert len(collection.bulk_write.call_args.args[0]) == 3
+    collection.insert_many.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_write_with_unknown_mode():
+    # Should raise a value error
+    with pytest.raises(ValueError):
+        await Cls.write(get_collection(), RECORDS, "merge")
+
+
+@pytest.mark.asyncio
+async def test_get_written():
+    collection = get_collection()
+    collection.distinct = CoroutineMock(return_value=["0x2-0"])
+
+    # Should look the keys up through the id index
+    assert await Cls.get_written(collection, RECORDS) == {"0x2-0"}
+    collection.distinct.assert_awaited_once_with(
+        "_id", {"_id": {"$in": ["0x1-0", "0x2-0", "0x3-0"]}}
+    )
+
+    # Should not look anything up without records
+    assert await Cls.get_written(collection, []) == set()
+    assert collection.distinct.await_count == 1
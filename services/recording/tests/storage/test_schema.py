@@ -0,0 +1,105 @@
+# Standard libraries
+from decimal import Decimal
+
+# 3rd party libraries
+from bson import decode, encode
+from bson.decimal128 import Decimal128
+import pytest
+
+# Code
+from src.events import EventRecord
+from src.storage.schema import DocumentSchema as Cls
+
+# Constants
+SWAP_DATA = {
+    "sender": "0xE592427A0AEce92De3Edee1F18E0157C05861564",
+    "recipient": "0xE592427A0AEce92De3Edee1F18E0157C05861564",
+    "symbol_0": "USDC",
+    "symbol_1": "WETH",
+    "amount_0": "-2500000000",
+    "amount_1": "1000000000000000000",
+    "sqrt_price_x96": "1987233908732420372649834920837942",
+    "swap_price_0": str(10**40),
+    "swap_price_1": "1774041920000000000000",
+}
+
+RECORD = EventRecord(
+    "uniswap-v3-pool-swap",
+    "0x" + "ab" * 32,
+    12,
+    15000000,
+    1660000000,
+    150000,
+    30000000000,
+    10**30,
+    "USDT",
+    "0x88e6A0c2dDD26FEEb64F039a2c41296FcB3f5640",
+    ["0x" + "cd" * 32, "0x" + "ef" * 32],
+    "0x" + "01" * 160,
+    SWAP_DATA,
+)
+
+
+def test_encode_compactly():
+    document = Cls.encode(RECORD.to_document(), 2)
+
+    # Should store the hex fields as binary
+    assert document["schema_version"] == 2
+    assert document["transaction_hash"] == b"\xab" * 32
+    assert document["topics"] == [b"\xcd" * 32, b"\xef" * 32]
+    assert document["raw_data"] == b"\x01" * 160
+
+    # Should store the integers in the most compact type they fit exactly
+    assert document["gas_used"] == 150000
+    assert document["gas_price_quote"] == {
+        "currency": "USDT",
+        "value": Decimal128(Decimal(10**30)),
+    }
+    assert document["data"]["amount_0"] == -2500000000
+    assert document["data"]["sqrt_price_x96"] == Decimal128(
+        "1987233908732420372649834920837942"
+    )
+    assert document["data"]["swap_price_0"] == str(10**40)
+
+    # Should keep the other fields as they are
+    assert document["address"] == RECORD.address
+    assert document["data"]["symbol_0"] == "USDC"
+
+    # Should be smaller in BSON
+    assert len(encode(document)) < len(encode(RECORD.to_document()))
+
+
+def test_encode_in_first_version():
+    # Should keep the string form
+    assert Cls.encode(RECORD.to_document(), 1) == RECORD.to_document()
+
+
+def test_encode_with_unknown_version():
+    # Should raise a value error
+    with pytest.raises(ValueError):
+        Cls.encode(RECORD.to_document(), 3)
+
+
+def test_encode_hex_of_partial_bytes():
+    # Should keep the hex strings that are not of whole bytes
+    assert Cls.encode_hex("0x123") == "0x123"
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_decode(version):
+    # Should decode the stored document back into the string form
+    stored = decode(encode(Cls.encode(RECORD.to_document(), version)))
+    assert Cls.decode(stored) == RECORD.to_document()
+
+
+def test_decode_partial_document():
+    stored = Cls.encode(RECORD.to_document(), 2)
+
+    # Should only decode the fields present
+    assert Cls.decode({"block_number": 1}) == {"block_number": 1}
+    assert Cls.decode(
+        {"block_number": 1, "data": {"amount_1": stored["data"]["amount_1"]}}
+    ) == {
+        "block_number": 1,
+        "data": {"amount_1": "1000000000000000000"},
+    }
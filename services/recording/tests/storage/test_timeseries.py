@@ -0,0 +1,116 @@
+# Standard libraries
+from datetime import datetime, timezone
+
+# 3rd party libraries
+from asynctest import CoroutineMock, MagicMock
+import pytest
+
+# Code
+from src.events import EventRecord
+from src.storage.timeseries import TimeSeriesWriter as Cls
+
+# Constants
+RECORDS = [
+    EventRecord("id", tx, 0, 1, timestamp, 1, 1, 1, "SGD", "0xabc", [], "0x", {})
+    for tx, timestamp in [("0x1", 60), ("0x2", 120), ("0x1", 60), ("0x3", 180)]
+]
+
+
+def get_collection(written=()):
+    collection = MagicMock()
+    collection.distinct = CoroutineMock(return_value=list(written))
+    collection.insert_many = CoroutineMock()
+    return collection
+
+
+@pytest.mark.asyncio
+async def test_write():
+    collection = get_collection(written=["0x2-0"])
+
+    # Should only insert the records not written yet, once each
+    assert await Cls.write(collection, RECORDS, 2) == [0, 3]
+    measurements = collection.insert_many.call_args.args[0]
+    assert [m["_id"] for m in measurements] == ["0x1-0", "0x3-0"]
+    assert collection.insert_many.call_args.kwargs == {"ordered": False}
+
+    # Should look the written keys up within the records' time range
+    collection.distinct.assert_awaited_once_with(
+        "_id",
+        {
+            "_id": {"$in": ["0x1-0", "0x2-0", "0x1-0", "0x3-0"]},
+            "time": {
+                "$gte": datetime(1970, 1, 1, 0, 1, tzinfo=timezone.utc),
+                "$lte": datetime(1970, 1, 1, 0, 3, tzinfo=timezone.utc),
+            },
+        },
+    )
+
+    # Should encode the documents into the schema version
+    assert measurements[0]["schema_version"] == 2
+
+
+WRITE_NOTHING_PARAMETERS = [([], []), (RECORDS[:1], ["0x1-0"])]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("records,written", WRITE_NOTHING_PARAMETERS)
+async def test_write_nothing_new(records, written):
+    collection = get_collection(written)
+
+    # Should not insert anything
+    assert await Cls.write(collection, records) == []
+    collection.insert_many.assert_not_awaited()
+
+
+def test_to_measurement():
+    document = RECORDS[0].to_document()
+
+    # Should keep the document's fields along with the time and series
+    assert Cls.to_measurement("0x1-0", document) == {
+        "_id": "0x1-0",
+        "time": datetime(1970, 1, 1, 0, 1, tzinfo=timezone.utc),
+        "meta": {"event_id": "id", "address": "0xabc"},
+        **document,
+    }
+
+
+TO_SERIES_QUERY_PARAMETERS = [
+    # The series and the timestamps of the query
+    (
+        {"event_id": "id", "address": "0xabc", "timestamp": {"$gte": 60, "$lte": 120}},
+        (None, None),
+        {
+            "meta.event_id": "id",
+            "meta.address": "0xabc",
+            "time": {
+                "$gte": datetime(1970, 1, 1, 0, 1, tzinfo=timezone.utc),
+                "$lte": datetime(1970, 1, 1, 0, 2, tzinfo=timezone.utc),
+            },
+        },
+    ),
+    # Or the bounds of the query's blocks, skipping the series not matched exactly
+    (
+        {"event_id": "id", "address": {"$in": ["0xabc"]}},
+        (None, 120),
+        {
+            "meta.event_id": "id",
+            "time": {"$lte": datetime(1970, 1, 1, 0, 2, tzinfo=timezone.utc)},
+        },
+    ),
+    ({"event_id": "id"}, (None, None), {"meta.event_id": "id"}),
+]
+
+
+@pytest.mark.parametrize("query,bounds,conditions", TO_SERIES_QUERY_PARAMETERS)
+def test_to_series_query(query, bounds, conditions):
+    # Should keep the query's conditions along with those of the series and time
+    assert Cls.to_series_query(query, *bounds) == {**query, **conditions}
+
+
+@pytest.mark.asyncio
+async def test_get_written_nothing():
+    collection = get_collection()
+
+    # Should not look anything up
+    assert await Cls.get_written(collection, []) == set()
+    collection.distinct.assert_not_awaited()